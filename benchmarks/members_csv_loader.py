@@ -0,0 +1,88 @@
+"""Benchmark loading members CSVs with load_members_from_csv against the row by row demo loader,
+and reloading them with CSVMembersLoader after a single line changed.
+
+Run with: python -m benchmarks.members_csv_loader [rows ...]
+"""
+
+import csv
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from cofy.modules.members import CSVColumns, CSVMembersLoader, load_members_from_csv
+from demo.members.load_from_csv import example_load_members_from_file
+
+SIZES = (10_000, 100_000, 1_000_000)
+# the row by row loader is only timed up to this size, as it takes minutes beyond it
+BASELINE_MAX_ROWS = 100_000
+CONTRACTS_PER_MEMBER = 3
+
+
+def write_members_csv(path: Path, rows: int) -> None:
+    rng = random.Random(rows)
+    with path.open("w", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(list(CSVColumns))
+        for i in range(rows):
+            member = i // CONTRACTS_PER_MEMBER
+            year = rng.randint(2010, 2025)
+            ended = rng.random() < 0.3
+            writer.writerow(
+                [
+                    f"5414{i:014d}",
+                    f"M{member:07d}",
+                    f"ACT-{member:07d}",
+                    f"A{member:07d}-{i % 2}",
+                    rng.choice(["residential", "non_residential"]),
+                    rng.choice(["electricity", "gas"]),
+                    f"supplier_{i % 5}",
+                    f"Supplier {i % 5}",
+                    f"product_{i % 20}",
+                    f"Product {i % 20}",
+                    f"distributor_{i % 8}",
+                    f"Distributor {i % 8}",
+                    f"{year}-01-01 00:00:00",
+                    f"{year + 1}-01-01 00:00:00" if ended else "",
+                    f"{year}-12-01 00:00:00" if ended else "",
+                    rng.choice(["true", "false"]),
+                ]
+            )
+
+
+def timed(loader, path: Path) -> float:
+    started = time.perf_counter()
+    loader(path)
+    return time.perf_counter() - started
+
+
+def change_one_line(path: Path) -> None:
+    lines = path.read_text().splitlines()
+    middle = len(lines) // 2
+    flipped = {"true": "false", "false": "true"}
+    fields = lines[middle].split(",")
+    fields[-1] = flipped[fields[-1]]
+    lines[middle] = ",".join(fields)
+    path.write_text("\n".join(lines) + "\n")
+
+
+def main(sizes: tuple[int, ...]) -> None:
+    print(f"{'rows':>10} {'columnar (s)':>14} {'row by row (s)':>16} {'incremental (s)':>17}")
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in sizes:
+            path = Path(directory) / f"members_{rows}.csv"
+            write_members_csv(path, rows)
+            columnar = timed(load_members_from_csv, path)
+            baseline = (
+                f"{timed(example_load_members_from_file, path):16.2f}" if rows <= BASELINE_MAX_ROWS else f"{'-':>16}"
+            )
+            loader = CSVMembersLoader()
+            loader(path)
+            change_one_line(path)
+            incremental = timed(loader, path)
+            print(f"{rows:>10} {columnar:14.2f} {baseline} {incremental:17.2f}")
+
+
+if __name__ == "__main__":
+    main(tuple(int(arg) for arg in sys.argv[1:]) or SIZES)
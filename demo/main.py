@@ -10,10 +10,17 @@ from cofy import CofyAPI
 from cofy.api import token_verifier
 from cofy.modules.billing.module import BillingModule
 from cofy.modules.directive import DirectiveModule, DirectiveSource
-from cofy.modules.members import MembersFileSource, MembersModule
+from cofy.modules.members import CSVMembersLoader, MembersFileSource, MembersModule
 from cofy.modules.production import EnergyIDProduction, ProductionModule
-from cofy.modules.tariff import EnergyCostTariffSource, EntsoeDayAheadTariffSource, KiwattFormat, TariffModule
-from demo.members.load_from_csv import example_load_members_from_file
+from cofy.modules.tariff import (
+    EnergyCostComparisonTariffSource,
+    EnergyCostTariffSource,
+    EntsoeDayAheadTariffSource,
+    KiwattFormat,
+    TariffComparisonModule,
+    TariffModule,
+)
+from cofy.modules.timeseries import CachedTimeseriesSource
 
 DATA_DIR = Path(__file__).resolve().parent / "data"
 
@@ -22,9 +29,12 @@ cofy = CofyAPI(
     dependencies=[Depends(token_verifier({environ.get("COFY_API_TOKEN"): {"name": "Demo User"}}))], debug_mode=True
 )
 
+# cached in day blocks, the cache is refreshed as soon as the next day-ahead prices are published
 entsoe = TariffModule(
-    source=EntsoeDayAheadTariffSource(
-        api_key=environ.get("ENTSOE_API_KEY", ""),
+    source=CachedTimeseriesSource(
+        EntsoeDayAheadTariffSource(
+            api_key=environ.get("ENTSOE_API_KEY", ""),
+        )
     ),
     name="entsoe",
 )
@@ -39,7 +49,7 @@ kiwatt = TariffModule(
     source=source,
     name="kiwatt",
     formats=[
-        KiwattFormat(),
+        KiwattFormat(vectorized=True),
     ],
 )
 cofy.register_module(kiwatt)
@@ -71,6 +81,15 @@ Supplier.register(
 )
 cofy.register_module(BillingModule())
 
+## Compare the electricity products of our supplier side by side
+cofy.register_module(
+    TariffComparisonModule(
+        source=EnergyCostComparisonTariffSource.from_supplier("eb", product_keys=["fixed", "variable", "dynamic"]),
+        name="eb",
+        description="Compare the electricity products of Energie Belgie.",
+    )
+)
+
 ## Production app with EnergyID as source
 wind = ProductionModule(
     source=EnergyIDProduction(
@@ -85,7 +104,7 @@ cofy.register_module(wind)
 CSV_PATH = str(DATA_DIR / "members_example.csv")
 cofy.register_module(
     MembersModule(
-        source=MembersFileSource(CSV_PATH, example_load_members_from_file),
+        source=MembersFileSource(CSV_PATH, CSVMembersLoader()),
         name="demo",
     )
 )
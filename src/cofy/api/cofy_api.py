@@ -1,4 +1,8 @@
+import asyncio
+import inspect
 import tempfile
+from collections.abc import AsyncIterator, Callable, Coroutine, Hashable
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
 from pathlib import Path
 from typing import Any
 
@@ -21,7 +25,8 @@ DEFAULT_ARGS: dict[str, Any] = {
 
 class CofyAPI(FastAPI):
     def __init__(self, *, debug_mode: bool = False, debug_dir: Path | None = None, **kwargs):
-        super().__init__(**(DEFAULT_ARGS | kwargs))
+        self._user_lifespan: Callable[[FastAPI], AbstractAsyncContextManager] | None = kwargs.pop("lifespan", None)
+        super().__init__(**(DEFAULT_ARGS | kwargs), lifespan=self._lifespan)
         self._modules: list[Module] = []
         self.include_router(DocsRouter(self.openapi))
         self.add_route("/health", self.health_check, methods=["GET"])
@@ -34,6 +39,27 @@ class CofyAPI(FastAPI):
             self.add_middleware(DebugMiddleware, debug_dir=resolved_debug_dir)
             self.include_router(DebugRouter(debug_dir=resolved_debug_dir), include_in_schema=False)
 
+    @asynccontextmanager
+    async def _lifespan(self, app: FastAPI) -> AsyncIterator[Any]:
+        """Run the lifespan tasks of all registered modules next to the (optional) user provided lifespan.
+
+        With a lifespan set, Starlette no longer runs the startup and shutdown event handlers itself,
+        so they are run here around the tasks, like the default lifespan would.
+        """
+        await _run_handlers(self.router.on_startup)
+        tasks = [asyncio.create_task(task()) for task in self.lifespan_tasks.values()]
+        try:
+            if self._user_lifespan is None:
+                yield None
+            else:
+                async with self._user_lifespan(app) as state:
+                    yield state
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        await _run_handlers(self.router.on_shutdown)
+
     def openapi(self):
         self.openapi_tags = self.tags_metadata
         schema = super().openapi()
@@ -55,6 +81,21 @@ class CofyAPI(FastAPI):
     def tags_metadata(self) -> list[dict[str, Any]]:
         return [module.tag for module in self._modules]
 
+    @property
+    def lifespan_tasks(self) -> dict[Hashable, Callable[[], Coroutine[Any, Any, None]]]:
+        tasks: dict[Hashable, Callable[[], Coroutine[Any, Any, None]]] = {}
+        for module in self._modules:
+            for key, task in module.lifespan_tasks.items():
+                tasks.setdefault(key, task)
+        return tasks
+
     @property
     def modules(self) -> tuple[Module, ...]:
         return tuple(self._modules)
+
+
+async def _run_handlers(handlers: list[Callable[[], Any]]) -> None:
+    for handler in handlers:
+        result = handler()
+        if inspect.isawaitable(result):
+            await result
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Coroutine, Hashable
 from enum import Enum
 from typing import Any
 
@@ -39,6 +40,13 @@ class Module(APIRouter, ABC):
 
         super().add_api_route(path, endpoint, *args, operation_id=operation_id, **kwargs)
 
+    @property
+    def lifespan_tasks(self) -> dict[Hashable, Callable[[], Coroutine[Any, Any, None]]]:
+        """Long running tasks to run in the background while the app is up, e.g. cache prefetching.
+        Tasks are keyed, so that a task shared by multiple modules only runs once.
+        """
+        return {}
+
     @property
     def name(self) -> str:
         """The name of the module instance, e.g. "entsoe_tariff", "openweather", etc.
@@ -2,6 +2,7 @@ from energy_cost import PowerDirection
 from fastapi import HTTPException
 
 from cofy.api.module import Module
+from cofy.modules.tariff import guard_cached_indexes
 
 from .models.billing_request import BillingRequest
 from .models.billing_response import BillingMetadata, BillingResponse
@@ -11,6 +12,11 @@ class BillingModule(Module):
     type: str = "billing"
     type_description: str = "Module that computes energy costs based on meter data and contract information."
 
+    def __init__(self, **kwargs):
+        # contracts are applied on worker threads and share the cached indexes of energy_cost with the tariff sources
+        guard_cached_indexes()
+        super().__init__(**kwargs)
+
     def init_routes(self):
         def calculate_cost(body: BillingRequest) -> BillingResponse:
             try:
@@ -1,6 +1,20 @@
+from .classifier import Classifier
 from .formats.directive import DirectiveFormat
-from .module import DirectiveModule
+from .formats.directive_rle import DirectiveRLEFormat
+from .module import DirectiveModule, DirectiveProfilesModule
 from .sources.directive_source import DirectiveSource
 from .sources.dynamic_boundary_directive_source import DynamicBoundaryDirectiveSource
+from .sources.profile_directive_source import ProfileDirectiveSource
+from .sources.quantile_directive_source import QuantileDirectiveSource
 
-__all__ = ["DirectiveModule", "DirectiveSource", "DirectiveFormat", "DynamicBoundaryDirectiveSource"]
+__all__ = [
+    "Classifier",
+    "DirectiveModule",
+    "DirectiveProfilesModule",
+    "DirectiveSource",
+    "DirectiveFormat",
+    "DirectiveRLEFormat",
+    "DynamicBoundaryDirectiveSource",
+    "ProfileDirectiveSource",
+    "QuantileDirectiveSource",
+]
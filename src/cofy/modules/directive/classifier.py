@@ -0,0 +1,67 @@
+from collections.abc import Sequence
+
+import narwhals as nw
+
+from .formats.directive import DIRECTIVE_STEPS
+
+
+class Classifier:
+    def __init__(
+        self,
+        boundaries: Sequence[float | str],
+        labels: Sequence[str] = DIRECTIVE_STEPS,
+        reverse: bool = False,
+    ):
+        """Maps numeric values to labels by counting the boundaries they exceed.
+
+        A value above the first i boundaries gets label i, so n boundaries need n + 1 labels.
+        The boundaries are compiled once into a single expression, which is evaluated in one vectorized pass.
+
+        Args:
+            boundaries: The thresholds in ascending order. A float is a fixed boundary,
+                a string names a column of the frame holding a boundary per row.
+            labels: The labels from the lowest to the highest level, defaults to the directive steps.
+            reverse: If True, the labels are assigned from high to low (i.e., higher values get lower labels).
+        """
+        if not boundaries:
+            raise ValueError("At least one boundary must be provided.")
+        if len(labels) != len(boundaries) + 1:
+            raise ValueError(
+                f"Expected {len(boundaries) + 1} labels for {len(boundaries)} boundaries, got {len(labels)}."
+            )
+        fixed = [boundary for boundary in boundaries if not isinstance(boundary, str)]
+        if any(low > high for low, high in zip(fixed, fixed[1:], strict=False)):
+            raise ValueError("Boundaries must be in ascending order.")
+
+        self.boundaries = tuple(boundaries)
+        self.labels = tuple(reversed(labels)) if reverse else tuple(labels)
+        self.columns = tuple(boundary for boundary in boundaries if isinstance(boundary, str))
+
+        self._thresholds = [nw.col(b) if isinstance(b, str) else nw.lit(b) for b in self.boundaries]
+        self._levels = list(range(len(self.labels)))
+        self._exprs: dict[str, nw.Expr] = {}
+
+    def level(self, column: str = "value") -> nw.Expr:
+        """Expression for the number of boundaries exceeded by column, missing values get level 0."""
+        return nw.sum_horizontal(*((nw.col(column) > threshold).cast(nw.Int8) for threshold in self._thresholds))
+
+    def expr(self, column: str = "value") -> nw.Expr:
+        """Expression mapping column to its label, compiled once per column."""
+        if column not in self._exprs:
+            labels = list(self.labels)
+            self._exprs[column] = self.level(column).replace_strict(self._levels, labels, return_dtype=nw.String)
+        return self._exprs[column]
+
+    def classify(self, frame: nw.DataFrame, column: str = "value") -> nw.DataFrame:
+        """Replace column by its labels, raises ValueError if the per-row boundaries are not ascending."""
+        self.validate(frame)
+        return frame.with_columns(self.expr(column).alias(column))
+
+    def validate(self, frame: nw.DataFrame) -> None:
+        """Check that the per-row boundaries of frame are in ascending order, including the fixed ones around them."""
+        pairs = list(zip(self._thresholds, self._thresholds[1:], strict=False))
+        if not self.columns or not pairs:
+            return
+        invalid = frame.filter(nw.any_horizontal(*(low > high for low, high in pairs), ignore_nulls=True))
+        if len(invalid) > 0:
+            raise ValueError(f"Boundary columns must be in ascending order ({' ≤ '.join(map(str, self.boundaries))}).")
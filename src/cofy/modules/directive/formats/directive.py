@@ -1,7 +1,8 @@
+from collections.abc import Sequence
 from datetime import datetime
 from typing import Literal, TypeVar
 
-from pydantic import BaseModel
+from pydantic import BaseModel, create_model
 
 from cofy.modules.timeseries import JSONFormat
 
@@ -17,5 +18,9 @@ class DirectiveRecord(BaseModel):
 
 
 class DirectiveFormat(JSONFormat[DirectiveRecord, MetadataType]):
-    def __init__(self, MT: type[MetadataType] | None = None):
-        super().__init__(DT=DirectiveRecord, MT=MT)
+    def __init__(self, MT: type[MetadataType] | None = None, labels: Sequence[str] | None = None):
+        """JSON format for directives, pass labels when the source does not use the default DIRECTIVE_STEPS."""
+        DT = DirectiveRecord
+        if labels is not None:
+            DT = create_model("DirectiveRecord", timestamp=(datetime, ...), value=(Literal[tuple(labels)], ...))
+        super().__init__(DT=DT, MT=MT)
@@ -0,0 +1,61 @@
+import datetime as dt
+from collections.abc import Sequence
+from typing import Literal, TypeVar
+
+import narwhals as nw
+from pydantic import BaseModel, create_model
+
+from cofy.modules.timeseries import ISODuration, JSONFormat, Timeseries
+
+from .directive import DirectiveSteps
+
+MetadataType = TypeVar("MetadataType", bound=BaseModel)
+
+
+class DirectiveSegment(BaseModel):
+    start: dt.datetime
+    end: dt.datetime
+    value: DirectiveSteps
+
+
+class DirectiveRLEFormat(JSONFormat[DirectiveSegment, MetadataType]):
+    """Run-length encoded directives: one segment per run of equal, consecutive values."""
+
+    name = "rle"
+
+    def __init__(self, MT: type[MetadataType] | None = None, labels: Sequence[str] | None = None):
+        DT = DirectiveSegment
+        if labels is not None:
+            DT = create_model(
+                "DirectiveSegment",
+                start=(dt.datetime, ...),
+                end=(dt.datetime, ...),
+                value=(Literal[tuple(labels)], ...),
+            )
+        super().__init__(DT=DT, MT=MT)
+
+    def format(self, timeseries: Timeseries) -> BaseModel:
+        return self.ResponseModel(
+            metadata=self.MT(**timeseries.metadata),
+            data=[self.DT(**segment) for segment in encode_runs(timeseries.frame, timeseries.metadata["resolution"])],
+        )
+
+
+def encode_runs(frame: nw.DataFrame, resolution: ISODuration) -> list[dict]:
+    """Collapse consecutive rows with the same value into {start, end, value} segments.
+
+    A run also ends at a gap in the timestamps, and the end of a run is its last timestamp plus resolution.
+    """
+    frame = frame.sort("timestamp")
+    new_run = nw.col("value") != nw.col("value").shift(1)
+    if isinstance(resolution, dt.timedelta):
+        new_run = new_run | (nw.col("timestamp") - nw.col("timestamp").shift(1) != resolution)
+    frame = frame.with_columns(new_run.fill_null(True).alias("new_run"))
+    frame = frame.with_columns(nw.col("new_run").shift(-1).fill_null(True).alias("last_of_run"))
+
+    starts = frame.filter(nw.col("new_run")).select("timestamp", "value").rows()
+    lasts = frame.filter(nw.col("last_of_run"))["timestamp"].to_list()
+    return [
+        {"start": start, "end": last + resolution, "value": value}
+        for (start, value), last in zip(starts, lasts, strict=True)
+    ]
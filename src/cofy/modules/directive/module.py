@@ -1,6 +1,8 @@
-from cofy.modules.timeseries import TimeseriesFormat, TimeseriesModule, TimeseriesSource
+from cofy.modules.timeseries import JSONFormat, MessagePackFormat, TimeseriesFormat, TimeseriesModule, TimeseriesSource
 
 from .formats.directive import DirectiveFormat
+from .formats.directive_rle import DirectiveRLEFormat
+from .sources.profile_directive_source import ProfileDirectiveSource
 
 
 class DirectiveModule(TimeseriesModule):
@@ -9,6 +11,16 @@ class DirectiveModule(TimeseriesModule):
 
     def __init__(self, source: TimeseriesSource, formats: list[TimeseriesFormat] | None = None, **kwargs):
         if formats is None:
-            formats = [DirectiveFormat()]
+            formats = [DirectiveFormat(), DirectiveRLEFormat(), MessagePackFormat()]
+
+        super().__init__(source=source, formats=formats, **kwargs)
+
+
+class DirectiveProfilesModule(DirectiveModule):
+    type_description: str = "Module providing directives for several boundary profiles as time series."
+
+    def __init__(self, source: ProfileDirectiveSource, formats: list[TimeseriesFormat] | None = None, **kwargs):
+        if formats is None:
+            formats = [JSONFormat(DT=source.record_model), MessagePackFormat()]
 
         super().__init__(source=source, formats=formats, **kwargs)
@@ -1,24 +1,33 @@
 import datetime as dt
+from collections.abc import Callable, Coroutine, Hashable, Sequence
+from typing import Any
 
-import narwhals as nw
-
-from cofy.modules.timeseries import ISODuration, Timeseries, TimeseriesSource
+from cofy.modules.timeseries import ISODuration, RefreshSchedule, Timeseries, TimeseriesSource
 
+from ..classifier import Classifier
 from ..formats.directive import DIRECTIVE_STEPS
 
 
 class DirectiveSource(TimeseriesSource):
-    def __init__(self, source: TimeseriesSource, boundaries: tuple[float, float, float, float], reverse: bool = False):
+    def __init__(
+        self,
+        source: TimeseriesSource,
+        boundaries: Sequence[float],
+        reverse: bool = False,
+        labels: Sequence[str] = DIRECTIVE_STEPS,
+    ):
         """A TimeseriesSource that maps numeric values to directive steps based on provided boundaries.
 
         Args:
             source: The underlying TimeseriesSource to fetch data from.
-            boundaries: A tuple of four float values that define the thresholds for mapping numeric values to directive steps. The values should be in ascending order and correspond to the steps in DIRECTIVE_STEPS
+            boundaries: The thresholds for mapping numeric values to labels, in ascending order. By default four values, one between each of the steps in DIRECTIVE_STEPS.
             reverse: If True, the mapping of values to directive steps will be reversed (i.e., higher values will correspond to more negative steps).
+            labels: The labels from the lowest to the highest level, one more than there are boundaries.
         """
         self.source = source
         self.boundaries = boundaries
         self.reverse = reverse
+        self.classifier = Classifier(boundaries, labels=labels, reverse=reverse)
 
     async def fetch_timeseries(
         self,
@@ -28,17 +37,31 @@ class DirectiveSource(TimeseriesSource):
         **kwargs,
     ) -> Timeseries:
         timeseries = await self.source.fetch_timeseries(start, end, resolution, **kwargs)
+        return self._to_directives(timeseries)
 
-        steps = DIRECTIVE_STEPS if not self.reverse else list(reversed(DIRECTIVE_STEPS))
-
-        expr = nw.lit(steps[0])
-        for boundry, step in list(zip(self.boundaries, steps[1:], strict=True)):
-            expr = nw.when(nw.col("value") > boundry).then(nw.lit(step)).otherwise(expr)
+    async def prefetch(
+        self,
+        start: dt.datetime,
+        end: dt.datetime,
+        resolution: ISODuration,
+        **kwargs,
+    ) -> Timeseries | None:
+        timeseries = await self.source.prefetch(start, end, resolution, **kwargs)
+        return self._to_directives(timeseries) if timeseries is not None else None
 
-        timeseries.frame = timeseries.frame.with_columns(value=expr)
+    def _to_directives(self, timeseries: Timeseries) -> Timeseries:
+        timeseries.frame = self.classifier.classify(timeseries.frame)
         timeseries.metadata["unit"] = "directive"
         return timeseries
 
+    @property
+    def refresh_schedule(self) -> RefreshSchedule | None:
+        return self.source.refresh_schedule
+
+    @property
+    def lifespan_tasks(self) -> dict[Hashable, Callable[[], Coroutine[Any, Any, None]]]:
+        return self.source.lifespan_tasks
+
     @property
     def supported_resolutions(self) -> list[str]:
         return self.source.supported_resolutions
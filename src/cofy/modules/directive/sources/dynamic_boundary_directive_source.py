@@ -1,13 +1,17 @@
 import asyncio
 import datetime as dt
+from collections.abc import Callable, Coroutine, Hashable, Sequence
+from typing import Any
 
 import narwhals as nw
 
-from cofy.modules.timeseries import ISODuration, Timeseries, TimeseriesSource
+from cofy.modules.timeseries import ISODuration, RefreshSchedule, Timeseries, TimeseriesSource
 
+from ..classifier import Classifier
 from ..formats.directive import DIRECTIVE_STEPS
 
 BOUNDARY_COLUMNS = ("b0", "b1", "b2", "b3")
+BOUNDARY_TIMESTAMP = "boundary_timestamp"
 
 
 class DynamicBoundaryDirectiveSource(TimeseriesSource):
@@ -16,20 +20,34 @@ class DynamicBoundaryDirectiveSource(TimeseriesSource):
         signal_source: TimeseriesSource,
         boundary_source: TimeseriesSource,
         reverse: bool = False,
+        boundary_columns: Sequence[str] = BOUNDARY_COLUMNS,
+        labels: Sequence[str] = DIRECTIVE_STEPS,
+        boundary_resolution: ISODuration | None = None,
+        tolerance: dt.timedelta | None = None,
     ):
         """A TimeseriesSource that maps numeric values to directive steps using per-timestamp dynamic boundaries.
 
         Args:
             signal_source: The underlying TimeseriesSource providing the numeric signal values.
             boundary_source: A TimeseriesSource whose dataframe contains a 'timestamp' column and
-                four boundary columns ('b0', 'b1', 'b2', 'b3') in ascending order, defining the
+                the boundary columns (by default 'b0', 'b1', 'b2', 'b3') in ascending order, defining the
                 thresholds between directive steps at each timestamp.
             reverse: If True, the mapping of values to directive steps will be reversed (i.e.,
                 higher values will correspond to more negative steps).
+            boundary_columns: The names of the boundary columns, in ascending order.
+            labels: The labels from the lowest to the highest level, one more than there are boundary columns.
+            boundary_resolution: Optionally fetch the boundaries at this (coarser) resolution, e.g. P1D.
+                Every signal value then gets the last boundaries at or before its timestamp (a backward as-of join)
+                instead of the boundaries with exactly the same timestamp.
+            tolerance: How long boundaries stay valid after their timestamp when boundary_resolution is set,
+                signal values without valid boundaries are dropped. Defaults to boundary_resolution.
         """
         self.signal_source = signal_source
         self.boundary_source = boundary_source
         self.reverse = reverse
+        self.classifier = Classifier(boundary_columns, labels=labels, reverse=reverse)
+        self.boundary_resolution = boundary_resolution
+        self.tolerance = tolerance if tolerance is not None else boundary_resolution
 
     async def fetch_timeseries(
         self,
@@ -40,29 +58,66 @@ class DynamicBoundaryDirectiveSource(TimeseriesSource):
     ) -> Timeseries:
         signal_ts, boundary_ts = await asyncio.gather(
             self.signal_source.fetch_timeseries(start, end, resolution, **kwargs),
-            self.boundary_source.fetch_timeseries(start, end, resolution, **kwargs),
+            self.boundary_source.fetch_timeseries(*self._boundary_window(start, end, resolution), **kwargs),
         )
+        return self._to_directives(signal_ts, boundary_ts)
 
-        invalid = boundary_ts.frame.filter(
-            (nw.col("b0") > nw.col("b1")) | (nw.col("b1") > nw.col("b2")) | (nw.col("b2") > nw.col("b3"))
+    async def prefetch(
+        self,
+        start: dt.datetime,
+        end: dt.datetime,
+        resolution: ISODuration,
+        **kwargs,
+    ) -> Timeseries | None:
+        boundary_window = self._boundary_window(start, end, resolution)
+        signal_ts, boundary_ts = await asyncio.gather(
+            self.signal_source.prefetch(start, end, resolution, **kwargs),
+            self.boundary_source.prefetch(*boundary_window, **kwargs),
         )
-        if len(invalid) > 0:
-            raise ValueError("Boundary columns must be in ascending order (b0 ≤ b1 ≤ b2 ≤ b3). ")
-
-        combined = signal_ts.frame.join(boundary_ts.frame, on="timestamp", how="inner")
-
-        steps = DIRECTIVE_STEPS if not self.reverse else list(reversed(DIRECTIVE_STEPS))
-
-        expr = nw.lit(steps[0])
-        for col_name, step in zip(BOUNDARY_COLUMNS, steps[1:], strict=True):
-            expr = nw.when(nw.col("value") > nw.col(col_name)).then(nw.lit(step)).otherwise(expr)
-
-        combined = combined.with_columns(value=expr).select(["timestamp", "value"])
+        if signal_ts is None:
+            return None
+        if boundary_ts is None:
+            boundary_ts = await self.boundary_source.fetch_timeseries(*boundary_window, **kwargs)
+        return self._to_directives(signal_ts, boundary_ts)
+
+    def _boundary_window(
+        self, start: dt.datetime, end: dt.datetime, resolution: ISODuration
+    ) -> tuple[dt.datetime, dt.datetime, ISODuration]:
+        if self.boundary_resolution is None:
+            return start, end, resolution
+        # reach back far enough to find the boundaries that are still valid at start
+        return start - (self.tolerance or self.boundary_resolution), end, self.boundary_resolution
+
+    def _to_directives(self, signal_ts: Timeseries, boundary_ts: Timeseries) -> Timeseries:
+        self.classifier.validate(boundary_ts.frame)
+
+        if self.boundary_resolution is None:
+            combined = signal_ts.frame.join(boundary_ts.frame, on="timestamp", how="inner")
+        else:
+            combined = self._join_asof(signal_ts.frame, boundary_ts.frame)
+        combined = combined.with_columns(self.classifier.expr().alias("value")).select(["timestamp", "value"])
 
         result = Timeseries(frame=combined, metadata=signal_ts.metadata)
         result.metadata["unit"] = "directive"
         return result
 
+    def _join_asof(self, signal: nw.DataFrame, boundaries: nw.DataFrame) -> nw.DataFrame:
+        boundaries = boundaries.with_columns(nw.col("timestamp").alias(BOUNDARY_TIMESTAMP)).sort("timestamp")
+        combined = signal.sort("timestamp").join_asof(boundaries, on="timestamp", strategy="backward")
+        valid = ~nw.col(BOUNDARY_TIMESTAMP).is_null()
+        if isinstance(self.tolerance, dt.timedelta):
+            valid = valid & (nw.col("timestamp") - nw.col(BOUNDARY_TIMESTAMP) < self.tolerance)
+        return combined.filter(valid)
+
+    @property
+    def refresh_schedule(self) -> RefreshSchedule | None:
+        # the signal drives the directive, boundaries are refreshed along with it
+        return self.signal_source.refresh_schedule
+
+    @property
+    def lifespan_tasks(self) -> dict[Hashable, Callable[[], Coroutine[Any, Any, None]]]:
+        return {**self.signal_source.lifespan_tasks, **self.boundary_source.lifespan_tasks}
+
     @property
     def supported_resolutions(self) -> list[str]:
         # The supported resolutions are the intersection of the signal source and boundary source resolutions
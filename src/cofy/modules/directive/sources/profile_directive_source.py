@@ -0,0 +1,114 @@
+import datetime as dt
+from collections.abc import Callable, Coroutine, Hashable, Sequence
+from typing import Annotated, Any, Literal
+
+from fastapi import Query
+from pydantic import BaseModel, create_model
+
+from cofy.modules.timeseries import ISODuration, RefreshSchedule, Timeseries, TimeseriesSource
+
+from ..classifier import Classifier
+from ..formats.directive import DIRECTIVE_STEPS
+
+
+class ProfileDirectiveSource(TimeseriesSource):
+    def __init__(
+        self,
+        source: TimeseriesSource,
+        profiles: dict[str, Sequence[float]],
+        reverse: bool = False,
+        labels: Sequence[str] = DIRECTIVE_STEPS,
+    ):
+        """A TimeseriesSource that maps one signal to directive steps for several named boundary profiles.
+
+        The signal is fetched once and every profile is evaluated in the same pass. With the profile argument
+        a single profile is returned as value, without it every profile gets its own column.
+
+        Args:
+            source: The underlying TimeseriesSource providing the numeric signal values.
+            profiles: The boundaries per profile, e.g. {"heat_pump": (0, 50, 100, 150), "ev": (20, 60, 90, 120)}.
+            reverse: If True, the mapping of values to directive steps will be reversed (i.e.,
+                higher values will correspond to more negative steps).
+            labels: The labels from the lowest to the highest level, shared by all profiles.
+        """
+        if not profiles:
+            raise ValueError("At least one profile must be provided.")
+        if {"timestamp", "value"} & profiles.keys():
+            raise ValueError("Profiles can not be named timestamp or value.")
+        self.source = source
+        self.reverse = reverse
+        self.labels = tuple(labels)
+        self.classifiers = {
+            name: Classifier(boundaries, labels=labels, reverse=reverse) for name, boundaries in profiles.items()
+        }
+
+    async def fetch_timeseries(
+        self,
+        start: dt.datetime,
+        end: dt.datetime,
+        resolution: ISODuration,
+        profile: str | None = None,
+        **kwargs,
+    ) -> Timeseries:
+        timeseries = await self.source.fetch_timeseries(start, end, resolution, **kwargs)
+        return self._to_directives(timeseries, profile)
+
+    async def prefetch(
+        self,
+        start: dt.datetime,
+        end: dt.datetime,
+        resolution: ISODuration,
+        profile: str | None = None,
+        **kwargs,
+    ) -> Timeseries | None:
+        timeseries = await self.source.prefetch(start, end, resolution, **kwargs)
+        return self._to_directives(timeseries, profile) if timeseries is not None else None
+
+    def _to_directives(self, timeseries: Timeseries, profile: str | None) -> Timeseries:
+        if profile is None:
+            columns = {name: classifier.expr() for name, classifier in self.classifiers.items()}
+        elif profile in self.classifiers:
+            columns = {"value": self.classifiers[profile].expr()}
+        else:
+            raise ValueError(f"Unknown profile {profile}, available profiles are: {', '.join(self.classifiers)}")
+
+        frame = timeseries.frame.with_columns(**columns)
+        timeseries.frame = frame.select(["timestamp", *columns])
+        timeseries.metadata["unit"] = "directive"
+        return timeseries
+
+    @property
+    def record_model(self) -> type[BaseModel]:
+        """Pydantic model of a single row, holding either the value of the selected profile or a field per profile."""
+        step = Literal[self.labels]
+        return create_model(
+            "DirectiveProfilesRecord",
+            timestamp=(dt.datetime, ...),
+            value=(step | None, None),
+            **{name: (step | None, None) for name in self.classifiers},
+        )
+
+    @property
+    def refresh_schedule(self) -> RefreshSchedule | None:
+        return self.source.refresh_schedule
+
+    @property
+    def lifespan_tasks(self) -> dict[Hashable, Callable[[], Coroutine[Any, Any, None]]]:
+        return self.source.lifespan_tasks
+
+    @property
+    def supported_resolutions(self) -> list[str]:
+        return self.source.supported_resolutions
+
+    @property
+    def extra_args(self) -> dict:
+        return {
+            **self.source.extra_args,
+            "profile": Annotated[
+                Literal[tuple(self.classifiers)] | None,
+                Query(
+                    default=None,
+                    description="Only return the directives of this profile, by default all profiles are returned.",
+                ),
+            ],
+        }
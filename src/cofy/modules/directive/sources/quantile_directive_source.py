@@ -0,0 +1,104 @@
+import datetime as dt
+from collections.abc import Callable, Coroutine, Hashable, Sequence
+from typing import Any
+from zoneinfo import ZoneInfo
+
+import narwhals as nw
+
+from cofy.modules.timeseries import ISODuration, RefreshSchedule, Timeseries, TimeseriesSource
+
+from ..classifier import Classifier
+from ..formats.directive import DIRECTIVE_STEPS
+
+DAY_COLUMN = "day"
+
+
+class QuantileDirectiveSource(TimeseriesSource):
+    def __init__(
+        self,
+        source: TimeseriesSource,
+        quantiles: Sequence[float] = (0.2, 0.4, 0.6, 0.8),
+        timezone: str = "UTC",
+        reverse: bool = False,
+        labels: Sequence[str] = DIRECTIVE_STEPS,
+    ):
+        """A TimeseriesSource that maps numeric values to directive steps using quantiles of their own day as boundaries.
+
+        The source is fetched once for the whole local days around the requested window, the boundaries
+        of every day are computed in a single grouped pass, and the result is trimmed to the requested window.
+
+        Args:
+            source: The underlying TimeseriesSource providing the numeric signal values.
+            quantiles: The quantiles of a day that are used as boundaries, in ascending order and between 0 and 1.
+            timezone: The timezone in which the days are split, e.g. "Europe/Brussels".
+            reverse: If True, the mapping of values to directive steps will be reversed (i.e.,
+                higher values will correspond to more negative steps).
+            labels: The labels from the lowest to the highest level, one more than there are quantiles.
+        """
+        if any(q < 0 or q > 1 for q in quantiles):
+            raise ValueError("Quantiles must be between 0 and 1.")
+        if any(low > high for low, high in zip(quantiles, quantiles[1:], strict=False)):
+            raise ValueError("Quantiles must be in ascending order.")
+        self.source = source
+        self.quantiles = tuple(quantiles)
+        self.timezone = timezone
+        self.reverse = reverse
+        self._columns = [f"q{i}" for i in range(len(self.quantiles))]
+        self.classifier = Classifier(self._columns, labels=labels, reverse=reverse)
+
+    async def fetch_timeseries(
+        self,
+        start: dt.datetime,
+        end: dt.datetime,
+        resolution: ISODuration,
+        **kwargs,
+    ) -> Timeseries:
+        timeseries = await self.source.fetch_timeseries(*self._days(start, end), resolution, **kwargs)
+        return self._to_directives(timeseries, start, end)
+
+    async def prefetch(
+        self,
+        start: dt.datetime,
+        end: dt.datetime,
+        resolution: ISODuration,
+        **kwargs,
+    ) -> Timeseries | None:
+        timeseries = await self.source.prefetch(*self._days(start, end), resolution, **kwargs)
+        return self._to_directives(timeseries, start, end) if timeseries is not None else None
+
+    def _days(self, start: dt.datetime, end: dt.datetime) -> tuple[dt.datetime, dt.datetime]:
+        """The local midnights around start and end, so every fetched day is complete."""
+        tz = ZoneInfo(self.timezone)
+        first = start.astimezone(tz).date()
+        last = (end - dt.timedelta.resolution).astimezone(tz).date() + dt.timedelta(days=1)
+        return dt.datetime.combine(first, dt.time(0), tzinfo=tz), dt.datetime.combine(last, dt.time(0), tzinfo=tz)
+
+    def _to_directives(self, timeseries: Timeseries, start: dt.datetime, end: dt.datetime) -> Timeseries:
+        day = nw.col("timestamp").dt.convert_time_zone(self.timezone).dt.replace_time_zone(None).dt.truncate("1d")
+        frame = timeseries.frame.with_columns(day.alias(DAY_COLUMN))
+        frame = frame.with_columns(
+            *(
+                nw.col("value").quantile(q, interpolation="linear").over(DAY_COLUMN).alias(column)
+                for q, column in zip(self.quantiles, self._columns, strict=True)
+            )
+        )
+        frame = frame.filter((nw.col("timestamp") >= start) & (nw.col("timestamp") < end))
+        timeseries.frame = frame.with_columns(self.classifier.expr().alias("value")).select(["timestamp", "value"])
+        timeseries.metadata["unit"] = "directive"
+        return timeseries
+
+    @property
+    def refresh_schedule(self) -> RefreshSchedule | None:
+        return self.source.refresh_schedule
+
+    @property
+    def lifespan_tasks(self) -> dict[Hashable, Callable[[], Coroutine[Any, Any, None]]]:
+        return self.source.lifespan_tasks
+
+    @property
+    def supported_resolutions(self) -> list[str]:
+        return self.source.supported_resolutions
+
+    @property
+    def extra_args(self) -> dict:
+        return self.source.extra_args
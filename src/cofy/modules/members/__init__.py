@@ -1,17 +1,36 @@
-from .model import Address, ConnectionType, Contract, CustomerType, Member, NamedIdentifier, VerifyMemberRequest
+from .csv_loader import CSVColumns, CSVMembersLoader, load_members_from_csv
+from .model import (
+    Address,
+    BatchMembersRequest,
+    ConnectionType,
+    Contract,
+    CustomerType,
+    Member,
+    NamedIdentifier,
+    VerifyMemberRequest,
+)
 from .module import MembersModule
-from .source import MemberSource
+from .source import AsyncMemberSource, MemberSource, SyncMemberSourceAdapter
 from .sources.file_source import MembersFileSource
+from .sources.sqlite_source import MembersSQLiteSource, write_members_database
 
 __all__ = [
     "Address",
+    "AsyncMemberSource",
+    "BatchMembersRequest",
     "Contract",
+    "CSVColumns",
+    "CSVMembersLoader",
     "ConnectionType",
     "CustomerType",
     "Member",
     "MemberSource",
     "MembersFileSource",
     "MembersModule",
+    "MembersSQLiteSource",
     "NamedIdentifier",
+    "SyncMemberSourceAdapter",
     "VerifyMemberRequest",
+    "load_members_from_csv",
+    "write_members_database",
 ]
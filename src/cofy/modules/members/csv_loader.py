@@ -0,0 +1,219 @@
+import logging
+from enum import StrEnum
+from pathlib import Path
+
+import polars as pl
+from pydantic import TypeAdapter
+
+from .model import ConnectionType, Contract, CustomerType, Member, NamedIdentifier
+from .snapshot import paused_gc
+
+LOGGER = logging.getLogger(__name__)
+
+CSV_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+DEFAULT_REGION = NamedIdentifier(id="be_flanders", name="Flanders")
+
+
+class CSVColumns(StrEnum):
+    EAN = "ean"
+    MEMBER_ID = "member_id"
+    ACTIVATION_CODE = "activation_code"
+    ADDRESS_ID = "address_id"
+    CUSTOMER_TYPE = "customer_type"
+    CONNECTION_TYPE = "connection_type"
+    SUPPLIER_ID = "supplier_id"
+    SUPPLIER_NAME = "supplier_name"
+    PRODUCT_ID = "product_id"
+    PRODUCT_NAME = "product_name"
+    DISTRIBUTOR_ID = "distributor_id"
+    DISTRIBUTOR_NAME = "distributor_name"
+    START_DATE = "start_date"
+    END_DATE = "end_date"
+    LAST_INVOICE_DATE = "last_invoice_date"
+    IS_GREEN = "is_green"
+
+
+DATE_COLUMNS = (CSVColumns.START_DATE, CSVColumns.END_DATE, CSVColumns.LAST_INVOICE_DATE)
+TEXT_COLUMNS = (
+    CSVColumns.ADDRESS_ID,
+    CSVColumns.SUPPLIER_ID,
+    CSVColumns.SUPPLIER_NAME,
+    CSVColumns.PRODUCT_ID,
+    CSVColumns.PRODUCT_NAME,
+    CSVColumns.DISTRIBUTOR_ID,
+    CSVColumns.DISTRIBUTOR_NAME,
+)
+ROW_NUMBER = "row_number"
+ROW_HASH = "row_hash"
+
+CONTRACTS = TypeAdapter(list[Contract])
+MEMBERS = TypeAdapter(list[Member])
+
+
+def load_members_from_csv(file_path: Path, region: NamedIdentifier = DEFAULT_REGION) -> dict[str, Member]:
+    """Load members from a CSV file with one contract per row, for use as load_from_file of MembersFileSource.
+
+    The file is read and its dates are parsed column by column. Invalid rows are logged and skipped,
+    after which all contracts and members are validated in one batch each. Identifiers shared by
+    many contracts, like suppliers and products, are only constructed once.
+
+    Args:
+        file_path: The CSV file, with a header holding the CSVColumns.
+        region: The region of every contract.
+    """
+    with paused_gc():
+        return _build_members(_read_rows(file_path), region)
+
+
+class CSVMembersLoader:
+    def __init__(self, region: NamedIdentifier = DEFAULT_REGION):
+        """Loads members like load_members_from_csv, but only builds the members whose rows changed since the last load.
+
+        The rows of every member are hashed, members with the same hash as in the previous load are reused as is.
+        MembersFileSource compares the row hashes of two loads, so it only patches its indexes for what changed.
+
+        Args:
+            region: The region of every contract.
+        """
+        self.region = region
+        self._hashes: dict[str, int] = {}
+        self._members: dict[str, Member] = {}
+
+    @property
+    def snapshot_key(self) -> tuple[str, str]:
+        """Identifies this loader and its region in the snapshots of MembersFileSource."""
+        return "CSVMembersLoader", self.region.model_dump_json()
+
+    @property
+    def row_hashes(self) -> dict[str, int]:
+        """A hash over the rows of every member of the last load."""
+        return self._hashes
+
+    def __call__(self, file_path: Path) -> dict[str, Member]:
+        with paused_gc():
+            frame = _read_rows(file_path)
+            hashes = _member_hashes(frame)
+            changed = [member_id for member_id, row_hash in hashes.items() if self._hashes.get(member_id) != row_hash]
+            built = _build_members(frame.filter(pl.col(CSVColumns.MEMBER_ID).is_in(changed)), self.region)
+        members = {
+            member_id: built[member_id] if member_id in built else self._members[member_id] for member_id in hashes
+        }
+        self._hashes, self._members = hashes, members
+        return members
+
+
+def _read_rows(file_path: Path) -> pl.DataFrame:
+    """The valid rows of the file with parsed columns, invalid rows are logged and left out."""
+    frame = pl.read_csv(file_path, infer_schema=False, columns=list(CSVColumns)).with_row_index(ROW_NUMBER, offset=2)
+    frame = frame.with_columns(
+        *(
+            pl.col(c).str.strptime(pl.Datetime("us"), CSV_DATETIME_FORMAT, strict=False).alias(f"{c}_parsed")
+            for c in DATE_COLUMNS
+        ),
+        (pl.col(CSVColumns.IS_GREEN).str.strip_chars().str.to_lowercase() == "true").fill_null(False),
+        pl.col(*TEXT_COLUMNS).fill_null(""),
+    )
+    checks = {
+        CSVColumns.MEMBER_ID: pl.col(CSVColumns.MEMBER_ID).is_not_null(),
+        CSVColumns.EAN: pl.col(CSVColumns.EAN).is_not_null(),
+        CSVColumns.CUSTOMER_TYPE: pl.col(CSVColumns.CUSTOMER_TYPE).is_in([t.value for t in CustomerType]),
+        CSVColumns.CONNECTION_TYPE: pl.col(CSVColumns.CONNECTION_TYPE).is_in([t.value for t in ConnectionType]),
+        CSVColumns.START_DATE: pl.col(f"{CSVColumns.START_DATE}_parsed").is_not_null(),
+    }
+    for c in (CSVColumns.END_DATE, CSVColumns.LAST_INVOICE_DATE):
+        checks[c] = pl.col(c).is_null() | pl.col(f"{c}_parsed").is_not_null()
+
+    frame = frame.with_columns(check.fill_null(False).alias(f"{c}_valid") for c, check in checks.items())
+    valid = pl.all_horizontal(f"{c}_valid" for c in checks)
+    for row in frame.filter(~valid).iter_rows(named=True):
+        reasons = [
+            f"invalid {c} {row[c]!r}" if row[c] is not None else f"missing {c}" for c in checks if not row[f"{c}_valid"]
+        ]
+        LOGGER.warning("Skipping invalid member row %s in %s: %s", row[ROW_NUMBER], file_path, ", ".join(reasons))
+    return (
+        frame.filter(valid)
+        .drop(*DATE_COLUMNS, *(f"{c}_valid" for c in checks))
+        .rename({f"{c}_parsed": c for c in DATE_COLUMNS})
+    )
+
+
+def _member_hashes(frame: pl.DataFrame) -> dict[str, int]:
+    """A hash over the rows of every member, in order of first appearance."""
+    hashes = (
+        frame.group_by(CSVColumns.MEMBER_ID, maintain_order=True)
+        .agg(pl.struct(*CSVColumns).hash().alias(ROW_HASH))
+        .with_columns(pl.col(ROW_HASH).hash())
+    )
+    return dict(zip(hashes[CSVColumns.MEMBER_ID].to_list(), hashes[ROW_HASH].to_list(), strict=True))
+
+
+def _build_members(frame: pl.DataFrame, region: NamedIdentifier) -> dict[str, Member]:
+    columns = {c: frame[c].to_list() for c in CSVColumns}
+    identifiers: dict[tuple[str, str], NamedIdentifier] = {}
+
+    def identifier(key: str, name: str) -> NamedIdentifier:
+        if (key, name) not in identifiers:
+            identifiers[key, name] = NamedIdentifier(id=key, name=name)
+        return identifiers[key, name]
+
+    def identifiers_of(prefix: str) -> list[NamedIdentifier]:
+        return [
+            identifier(key, name) for key, name in zip(columns[f"{prefix}_id"], columns[f"{prefix}_name"], strict=True)
+        ]
+
+    contracts = CONTRACTS.validate_python(
+        [
+            {
+                "ean": ean,
+                "customer_type": customer_type,
+                "connection_type": connection_type,
+                "supplier": supplier,
+                "product": product,
+                "distributor": distributor,
+                "region": region,
+                "start_date": start_date,
+                "end_date": end_date,
+                "last_invoice_date": last_invoice_date,
+                "is_green": is_green,
+            }
+            for ean, customer_type, connection_type, supplier, product, distributor, start_date, end_date, last_invoice_date, is_green in zip(
+                columns[CSVColumns.EAN],
+                columns[CSVColumns.CUSTOMER_TYPE],
+                columns[CSVColumns.CONNECTION_TYPE],
+                identifiers_of("supplier"),
+                identifiers_of("product"),
+                identifiers_of("distributor"),
+                columns[CSVColumns.START_DATE],
+                columns[CSVColumns.END_DATE],
+                columns[CSVColumns.LAST_INVOICE_DATE],
+                columns[CSVColumns.IS_GREEN],
+                strict=True,
+            )
+        ]
+    )
+
+    activation_codes: dict[str, str | None] = {}
+    addresses: dict[str, dict[str, list[Contract]]] = {}
+    for member_id, activation_code, address_id, contract in zip(
+        columns[CSVColumns.MEMBER_ID],
+        columns[CSVColumns.ACTIVATION_CODE],
+        columns[CSVColumns.ADDRESS_ID],
+        contracts,
+        strict=True,
+    ):
+        if member_id not in activation_codes:
+            activation_codes[member_id] = activation_code
+            addresses[member_id] = {}
+        addresses[member_id].setdefault(address_id, []).append(contract)
+
+    members = MEMBERS.validate_python(
+        [
+            {
+                "id": member_id,
+                "activation_code": activation_code,
+                "addresses": [{"contracts": contracts} for contracts in addresses[member_id].values()],
+            }
+            for member_id, activation_code in activation_codes.items()
+        ]
+    )
+    return {member.id: member for member in members}
@@ -0,0 +1,77 @@
+from collections import OrderedDict
+from collections.abc import Hashable
+from threading import Lock
+
+import energy_cost as ec
+from pydantic import TypeAdapter
+
+from .model import Contract, ECContractResponse, MeterType, _build_contract_history
+
+MAX_ENTRIES = 1024
+CONTRACT_HISTORY = TypeAdapter(list[ECContractResponse])
+
+
+class ContractHistoryCache:
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        """Keeps the serialized contract history per (member, EAN, meter type), least recently used first out.
+
+        An entry is only reused while the source reports the version it was built from, so a reload of the members
+        invalidates it, and while the suppliers of those contracts are still registered as the same objects,
+        so registering a supplier again invalidates it as well. Histories of sources without a version are not cached.
+
+        Args:
+            max_entries: The maximum number of histories to keep.
+        """
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, tuple[Hashable, tuple, bytes]] = OrderedDict()
+        self._lock = Lock()
+
+    def get(
+        self,
+        member_id: str,
+        ean: str,
+        meter_type: MeterType | None,
+        contracts: list[Contract],
+        version: Hashable | None,
+    ) -> bytes:
+        """The JSON encoded contract history for contracts, built and serialized only when not cached.
+
+        The version is that of the source the contracts were read from, see MemberSource.version.
+        """
+        key = (member_id, ean, meter_type)
+        suppliers = _registered_suppliers(contracts)
+        if version is not None:
+            with self._lock:
+                cached = self._entries.get(key)
+                if cached is not None and cached[0] == version and _same(cached[1], suppliers):
+                    self._entries.move_to_end(key)
+                    return cached[2]
+
+        history = _build_contract_history(contracts, meter_type)
+        content = CONTRACT_HISTORY.dump_json(CONTRACT_HISTORY.validate_python([c.model_dump() for c in history]))
+        if version is None:
+            return content
+        with self._lock:
+            self._entries[key] = (version, suppliers, content)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return content
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _registered_suppliers(contracts: list[Contract]) -> tuple:
+    suppliers = []
+    for key in sorted({contract.supplier.id for contract in contracts}):
+        try:
+            suppliers.append(ec.Supplier.get(key))
+        except KeyError:
+            suppliers.append(None)
+    return tuple(suppliers)
+
+
+def _same(left: tuple, right: tuple) -> bool:
+    return len(left) == len(right) and all(a is b for a, b in zip(left, right, strict=True))
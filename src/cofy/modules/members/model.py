@@ -88,3 +88,14 @@ class Member(BaseModel):
 
 class VerifyMemberRequest(BaseModel):
     activation_code: str
+
+
+MAX_BATCH_SIZE = 10_000
+
+
+class BatchMembersRequest(BaseModel):
+    ids: Annotated[list[str], Field(default_factory=list, max_length=MAX_BATCH_SIZE, description="Member IDs")]
+    eans: Annotated[
+        list[str],
+        Field(default_factory=list, max_length=MAX_BATCH_SIZE, description="EANs of which to get the members"),
+    ]
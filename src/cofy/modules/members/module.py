@@ -1,29 +1,36 @@
+from collections.abc import Callable, Coroutine, Hashable
 from typing import Any
 
-from energy_cost import Contract
-from fastapi import HTTPException
+from fastapi import HTTPException, Response
 
 from cofy import Module
 
-from .model import ECContractResponse, MeterType, VerifyMemberRequest
-from .source import MemberSource
+from .history import MAX_ENTRIES, ContractHistoryCache
+from .model import BatchMembersRequest, ECContractResponse, MeterType, VerifyMemberRequest
+from .source import AsyncMemberSource, MemberSource, SyncMemberSourceAdapter
 
 
 class MembersModule(Module):
     type: str = "members"
     type_description: str = "Module for member-related functionalities"
 
-    def __init__(self, *, source: MemberSource, **kwargs):
-        self.source: MemberSource = source
+    def __init__(self, *, source: MemberSource | AsyncMemberSource, history_cache_size: int = MAX_ENTRIES, **kwargs):
+        self.source: MemberSource | AsyncMemberSource = source
+        # the routes await the source, a sync source is adapted so only blocking lookups take a worker thread
+        self.async_source: AsyncMemberSource = (
+            source if isinstance(source, AsyncMemberSource) else SyncMemberSourceAdapter(source)
+        )
+        self.history_cache = ContractHistoryCache(max_entries=history_cache_size)
         super().__init__(**kwargs)
 
     def init_routes(self):
         self.add_api_route(
             "/",
-            self.source.list,
+            self._list_endpoint(),
             methods=["GET"],
             summary="List members",
             response_model=list.__class_getitem__(self.source.response_model),
+            operation_id="list",
         )
         self.add_api_route(
             "/verify",
@@ -33,6 +40,21 @@ class MembersModule(Module):
             response_model=self.source.response_model,
             responses={404: {"description": "Member not found"}},
         )
+        self.add_api_route(
+            "/batch",
+            self.get_batch,
+            methods=["POST"],
+            summary="Get the members with one of the IDs or with a contract for one of the EANs",
+            response_model=list.__class_getitem__(self.source.response_model),
+        )
+        self.add_api_route(
+            "/by-ean/{ean}",
+            self.get_by_ean,
+            methods=["GET"],
+            summary="Get the members with a contract for a specific meter (identified by EAN)",
+            response_model=list.__class_getitem__(self.source.response_model),
+            responses={404: {"description": "No member found"}},
+        )
         self.add_api_route(
             "/{member_id}",
             self.get_by_id,
@@ -50,23 +72,51 @@ class MembersModule(Module):
             responses={404: {"description": "Member or contract not found"}},
         )
 
-    def get_by_id(self, member_id: str) -> Any:
-        member = self.source.get(member_id)
-        if member is None:
+    @property
+    def lifespan_tasks(self) -> dict[Hashable, Callable[[], Coroutine[Any, Any, None]]]:
+        return self.source.lifespan_tasks
+
+    def _list_endpoint(self) -> Callable[..., Response]:
+        """An endpoint taking the query parameters of source.list, responding with the JSON of source.list_json."""
+        signature = self.async_source.list_signature
+
+        async def list_members(**kwargs) -> Response:
+            # passed by name, as declared by the one signature both list and list_json take
+            content = await self.async_source.list_json(**signature.bind(**kwargs).arguments)
+            return Response(content=content, media_type="application/json")
+
+        list_members.__signature__ = signature
+        return list_members
+
+    async def get_by_id(self, member_id: str) -> Response:
+        content = await self.async_source.get_json(member_id)
+        if content is None:
             raise HTTPException(status_code=404, detail="Member not found")
-        return member
+        return Response(content=content, media_type="application/json")
+
+    async def get_by_ean(self, ean: str) -> Any:
+        members = await self.async_source.get_by_ean(ean)
+        if not members:
+            raise HTTPException(status_code=404, detail="No member found for the specified EAN")
+        return members
 
-    def verify(self, body: VerifyMemberRequest) -> Any:
-        member = self.source.verify(body.activation_code)
+    async def get_batch(self, body: BatchMembersRequest) -> Response:
+        content = await self.async_source.get_many_json(body.ids, body.eans)
+        return Response(content=content, media_type="application/json")
+
+    async def verify(self, body: VerifyMemberRequest) -> Any:
+        member = await self.async_source.verify(body.activation_code)
         if member is None:
             raise HTTPException(status_code=404, detail="Member not found")
         return member
 
-    def get_contract_history(self, member_id: str, ean: str, meter_type: MeterType | None = None) -> list[Contract]:
-        member = self.source.get(member_id)
-        if member is None:
+    async def get_contract_history(self, member_id: str, ean: str, meter_type: MeterType | None = None) -> Response:
+        # read before the contracts, so a reload in between can only cause a cache miss, never a stale history
+        version = self.async_source.version
+        contracts = await self.async_source.get_contracts(member_id, ean)
+        if contracts is None:
             raise HTTPException(status_code=404, detail="Member not found")
-        history = member.get_contract_history_for_ean(ean, meter_type)
-        if history is not None:
-            return history
-        raise HTTPException(status_code=404, detail="No contract history found for the specified EAN")
+        if not contracts:
+            raise HTTPException(status_code=404, detail="No contract history found for the specified EAN")
+        content = self.history_cache.get(member_id, ean, meter_type, contracts, version)
+        return Response(content=content, media_type="application/json")
@@ -0,0 +1,44 @@
+import gc
+import os
+import pickle
+from collections.abc import Hashable, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any
+
+SNAPSHOT_VERSION = 2
+
+
+@contextmanager
+def paused_gc() -> Iterator[None]:
+    """Pause the cyclic garbage collector while building many objects at once, so they are not rescanned over and over."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def read_snapshot(path: Path, signature: Hashable) -> Any | None:
+    """The data stored in the snapshot at path, None if there is no snapshot for this signature.
+
+    Snapshots are pickles, so only read them from a location that is as trusted as the source file itself.
+    """
+    if not path.exists():
+        return None
+    with path.open("rb") as file, paused_gc():
+        version, stored_signature, data = pickle.load(file)
+    if version != SNAPSHOT_VERSION or stored_signature != signature:
+        return None
+    return data
+
+
+def write_snapshot(path: Path, signature: Hashable, data: Any) -> None:
+    """Store data with the signature of the file it was built from, replacing the previous snapshot atomically."""
+    # unique per process, so workers writing the same snapshot do not clobber each others temporary file
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with tmp.open("wb") as file:
+        pickle.dump((SNAPSHOT_VERSION, signature, data), file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)
@@ -1,13 +1,95 @@
+import asyncio
 import builtins
+import inspect
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar
+from collections.abc import Callable, Coroutine, Hashable, Iterable, Sequence
+from functools import cached_property
+from typing import Any, Generic, TypeVar
 
-from .model import Member
+from pydantic import TypeAdapter
+
+from .model import Contract, Member
 
 T = TypeVar("T")
+R = TypeVar("R")
+
+
+class BaseMemberSource(Generic[T]):
+    """The parts of MemberSource and AsyncMemberSource that do no I/O, shared by both."""
+
+    # a method of both, a coroutine function for AsyncMemberSource
+    list: Callable[..., Any]
+
+    @property
+    def response_model(self) -> type:
+        """The response model of the source."""
+        return Member
+
+    @property
+    def lifespan_tasks(self) -> dict[Hashable, Callable[[], Coroutine[Any, Any, None]]]:
+        """Long running tasks to run in the background while the app is up, e.g. watching for changes."""
+        return {}
+
+    @property
+    def version(self) -> Hashable | None:
+        """Identifies the current load of the members and changes whenever they may have changed.
+
+        Data derived from the members, like contract histories, is cached per version.
+        None means the source can not tell, so nothing derived from its members is cached.
+        """
+        return None
+
+    @property
+    def list_signature(self) -> inspect.Signature:
+        """The parameters of list, which list_json takes as well, e.g. to declare them as query parameters."""
+        return inspect.signature(self.list)
+
+    @cached_property
+    def _adapter(self) -> TypeAdapter:
+        return TypeAdapter(self.response_model)
+
+    @cached_property
+    def _list_adapter(self) -> TypeAdapter:
+        return TypeAdapter(builtins.list[self.response_model])
+
+    def _next_page(self, page: builtins.list[T], arguments: dict[str, Any]) -> dict[str, Any] | None:
+        """The arguments of list for the page after the one it returned for arguments, None after the last page.
+
+        A source that lists after a cursor is paged by the ID of the last member, one with page numbers by the next
+        number. Any other source lists all its members at once.
+        """
+        parameters = self.list_signature.parameters
+        if not page:
+            return None
+        if "after" in parameters:
+            last: Any = page[-1]
+            return {**arguments, "after": last.id}
+        if "page" in parameters:
+            return {**arguments, "page": arguments.get("page", 1) + 1}
+        return None
 
+    def _dump(self, member: T | None) -> bytes | None:
+        return self._adapter.dump_json(member, by_alias=True) if member is not None else None
+
+    def _dump_list(self, members: builtins.list[T]) -> bytes:
+        return self._list_adapter.dump_json(members, by_alias=True)
+
+
+def _unique(members: Iterable[T | None]) -> builtins.list[T]:
+    """The members without None and without repeating a member, in order of first appearance."""
+    return builtins.list({id(member): member for member in members if member is not None}.values())
+
+
+def _contracts_for_ean(member: Member | None, ean: str) -> builtins.list[Contract] | None:
+    if member is None:
+        return None
+    return [contract for address in member.addresses for contract in address.contracts if contract.ean == ean]
+
+
+class MemberSource(BaseMemberSource[T], ABC):
+    # whether lookups may block, e.g. on a database; if not, they are run on the event loop instead of a thread
+    blocking: bool = True
 
-class MemberSource(ABC, Generic[T]):
     @abstractmethod
     def list(
         self,
@@ -22,7 +104,159 @@ class MemberSource(ABC, Generic[T]):
     def verify(self, activation_code: str) -> T | None:
         """Return member matching the activation code."""
 
+    def list_json(self, *args, **kwargs) -> bytes:
+        """Return the members listed by list as a JSON array of the response model."""
+        return self._dump_list(self.list(*args, **kwargs))
+
+    def get_json(self, member_id: str) -> bytes | None:
+        """Return a single member by ID as JSON of the response model."""
+        return self._dump(self.get(member_id))
+
+    def get_by_ean(self, ean: str) -> builtins.list[T]:
+        """Return the members with a contract for the EAN.
+
+        By default every page of list is scanned, override this with a lookup in an index where there is one.
+        """
+        members = []
+        arguments: dict[str, Any] | None = {}
+        while arguments is not None:
+            page = self.list(**arguments)
+            members.extend(member for member in page if _contracts_for_ean(member, ean))
+            arguments = self._next_page(page, arguments)
+        return members
+
+    def get_many(self, member_ids: Sequence[str], eans: Sequence[str] = ()) -> builtins.list[T]:
+        """Return the members with one of the IDs, followed by those with a contract for one of the EANs.
+
+        Unknown IDs and EANs are skipped and every member is returned once. Looking up EANs relies on get_by_ean.
+        """
+        members = [self.get(member_id) for member_id in member_ids]
+        for ean in eans:
+            members.extend(self.get_by_ean(ean))
+        return _unique(members)
+
+    def get_many_json(self, member_ids: Sequence[str], eans: Sequence[str] = ()) -> bytes:
+        """Return the members of get_many as a JSON array of the response model."""
+        return self._dump_list(self.get_many(member_ids, eans))
+
+    def get_contracts(self, member_id: str, ean: str) -> builtins.list[Contract] | None:
+        """Return the contracts of a member for the EAN, None if the member does not exist."""
+        return _contracts_for_ean(self.get(member_id), ean)
+
+
+class AsyncMemberSource(BaseMemberSource[T], ABC):
+    """A MemberSource whose lookups are coroutines, awaited by MembersModule without taking a worker thread."""
+
+    @abstractmethod
+    async def list(
+        self,
+    ) -> builtins.list[T]:
+        """List all members."""
+
+    @abstractmethod
+    async def get(self, member_id: str) -> T | None:
+        """Return a single member by ID."""
+
+    @abstractmethod
+    async def verify(self, activation_code: str) -> T | None:
+        """Return member matching the activation code."""
+
+    async def list_json(self, *args, **kwargs) -> bytes:
+        """Return the members listed by list as a JSON array of the response model."""
+        return self._dump_list(await self.list(*args, **kwargs))
+
+    async def get_json(self, member_id: str) -> bytes | None:
+        """Return a single member by ID as JSON of the response model."""
+        return self._dump(await self.get(member_id))
+
+    async def get_by_ean(self, ean: str) -> builtins.list[T]:
+        """Return the members with a contract for the EAN.
+
+        By default every page of list is scanned, override this with a lookup in an index where there is one.
+        """
+        members = []
+        arguments: dict[str, Any] | None = {}
+        while arguments is not None:
+            page = await self.list(**arguments)
+            members.extend(member for member in page if _contracts_for_ean(member, ean))
+            arguments = self._next_page(page, arguments)
+        return members
+
+    async def get_many(self, member_ids: Sequence[str], eans: Sequence[str] = ()) -> builtins.list[T]:
+        """Return the members with one of the IDs, followed by those with a contract for one of the EANs.
+
+        Unknown IDs and EANs are skipped and every member is returned once. Looking up EANs relies on get_by_ean.
+        """
+        members = [await self.get(member_id) for member_id in member_ids]
+        for ean in eans:
+            members.extend(await self.get_by_ean(ean))
+        return _unique(members)
+
+    async def get_many_json(self, member_ids: Sequence[str], eans: Sequence[str] = ()) -> bytes:
+        """Return the members of get_many as a JSON array of the response model."""
+        return self._dump_list(await self.get_many(member_ids, eans))
+
+    async def get_contracts(self, member_id: str, ean: str) -> builtins.list[Contract] | None:
+        """Return the contracts of a member for the EAN, None if the member does not exist."""
+        return _contracts_for_ean(await self.get(member_id), ean)
+
+
+class SyncMemberSourceAdapter(AsyncMemberSource[T]):
+    def __init__(self, source: MemberSource[T]):
+        """An AsyncMemberSource forwarding to a MemberSource.
+
+        Lookups of a non-blocking source, like the in-memory MembersFileSource, are called directly on the
+        event loop. Those of a blocking source are run in a worker thread, so they never stall the event loop.
+
+        Args:
+            source: The MemberSource to forward to.
+        """
+        self.source = source
+
+    async def _call(self, method: Callable[..., R], *args, **kwargs) -> R:
+        if self.source.blocking:
+            return await asyncio.to_thread(method, *args, **kwargs)
+        return method(*args, **kwargs)
+
+    async def list(self, *args, **kwargs) -> builtins.list[T]:
+        return await self._call(self.source.list, *args, **kwargs)
+
+    async def list_json(self, *args, **kwargs) -> bytes:
+        return await self._call(self.source.list_json, *args, **kwargs)
+
+    async def get(self, member_id: str) -> T | None:
+        return await self._call(self.source.get, member_id)
+
+    async def get_json(self, member_id: str) -> bytes | None:
+        return await self._call(self.source.get_json, member_id)
+
+    async def verify(self, activation_code: str) -> T | None:
+        return await self._call(self.source.verify, activation_code)
+
+    async def get_by_ean(self, ean: str) -> builtins.list[T]:
+        return await self._call(self.source.get_by_ean, ean)
+
+    async def get_many(self, member_ids: Sequence[str], eans: Sequence[str] = ()) -> builtins.list[T]:
+        return await self._call(self.source.get_many, member_ids, eans)
+
+    async def get_many_json(self, member_ids: Sequence[str], eans: Sequence[str] = ()) -> bytes:
+        return await self._call(self.source.get_many_json, member_ids, eans)
+
+    async def get_contracts(self, member_id: str, ean: str) -> builtins.list[Contract] | None:
+        return await self._call(self.source.get_contracts, member_id, ean)
+
     @property
     def response_model(self) -> type:
-        """The response model of the source."""
-        return Member
+        return self.source.response_model
+
+    @property
+    def list_signature(self) -> inspect.Signature:
+        return self.source.list_signature
+
+    @property
+    def version(self) -> Hashable | None:
+        return self.source.version
+
+    @property
+    def lifespan_tasks(self) -> dict[Hashable, Callable[[], Coroutine[Any, Any, None]]]:
+        return self.source.lifespan_tasks
@@ -1,58 +1,400 @@
+import asyncio
 import builtins
+import copy
+import datetime as dt
 import logging
-from collections.abc import Callable
+import time
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import Callable, Coroutine, Hashable, Iterator, Sequence
+from functools import partial
+from itertools import islice
 from pathlib import Path
 from threading import RLock
-from typing import Annotated
+from typing import Annotated, Any
 
 from fastapi import Query
+from pydantic import TypeAdapter
 
-from ..model import Member
+from ..model import Contract, CustomerType, Member
+from ..snapshot import read_snapshot, write_snapshot
 from ..source import MemberSource
 
 LOGGER = logging.getLogger(__name__)
 
 PAGE_SIZE = 50
+MAX_PAGE_SIZE = 1000
+POLL_INTERVAL = dt.timedelta(seconds=5)
+
+SERIALIZE_MEMBER = partial(TypeAdapter(Member).dump_json, by_alias=True)
+
+# the fields members can be filtered on when listing, with the value of a contract for each
+FILTERS: dict[str, Callable[[Contract], str]] = {
+    "supplier": lambda contract: contract.supplier.id,
+    "product": lambda contract: contract.product.id,
+    "distributor": lambda contract: contract.distributor.id,
+    "customer_type": lambda contract: contract.customer_type,
+}
+
+
+class MembersIndex:
+    def __init__(
+        self,
+        members: dict[str, Member],
+        serialize: Callable[[Member], bytes] = SERIALIZE_MEMBER,
+        json_by_id: dict[str, bytes] | None = None,
+        hashes: dict[str, int] | None = None,
+    ):
+        """The lookup tables over one load of the members file, replaced as a whole on reload.
+
+        Args:
+            members: The loaded members by ID.
+            serialize: Encodes a member as JSON, done once per member so requests can serve the bytes as is.
+            json_by_id: The members already encoded by serialize, e.g. from a snapshot, instead of encoding them again.
+            hashes: A hash of the source rows of every member, as reported by the loader, to detect changes by.
+        """
+        self.serialize = serialize
+        self.hashes = hashes
+        self.members_by_id = members
+        if json_by_id is None:
+            json_by_id = {member_id: serialize(member) for member_id, member in members.items()}
+        self.json_by_id = json_by_id
+        self.sorted_ids = sorted(members.keys())
+        self.members_by_activation_code = {
+            member.activation_code: member for member in members.values() if member.activation_code is not None
+        }
+        self.contracts_by_ean: dict[str, dict[str, builtins.list[Contract]]] = {}
+        for member_id, member in members.items():
+            for ean, contracts in _contracts_by_ean(member).items():
+                self.contracts_by_ean.setdefault(ean, {})[member_id] = contracts
+        # the sorted IDs of the members with a contract matching the value, per filter
+        self.ids_by_filter: dict[str, dict[str, builtins.list[str]]] = {name: {} for name in FILTERS}
+        for member_id in self.sorted_ids:
+            for name, values in _filter_values(members[member_id]).items():
+                for value in values:
+                    self.ids_by_filter[name].setdefault(value, []).append(member_id)
+
+    def updated(
+        self,
+        members: dict[str, Member],
+        json_by_id: dict[str, bytes] | None = None,
+        hashes: dict[str, int] | None = None,
+    ) -> "MembersIndex":
+        """The index for a new load of the members, made by patching a copy of this index with what changed.
+
+        Members are changed when their row hash differs, if both loads have hashes (like CSVMembersLoader reports),
+        and otherwise when they are not the same object. Only the members that were added, changed or removed are
+        encoded and re-indexed, which is what makes a reload cheap. Copying the lookup tables still costs a dict copy
+        per table, in proportion to all members, but is far cheaper than encoding every member again.
+        With json_by_id, the encoded members are taken from it instead of encoding them again.
+        """
+        removed = self.members_by_id.keys() - members.keys()
+        if hashes is not None and self.hashes is not None:
+            previous = self.hashes
+            changed = [member_id for member_id, row_hash in hashes.items() if previous.get(member_id) != row_hash]
+        else:
+            changed = [
+                member_id for member_id, member in members.items() if self.members_by_id.get(member_id) is not member
+            ]
+        if len(removed) + len(changed) > len(members) // 2:
+            return MembersIndex(members, self.serialize, json_by_id, hashes)
+
+        index = copy.copy(self)
+        index.hashes = hashes
+        index.members_by_id = members
+        index.json_by_id = dict(self.json_by_id)
+        for member_id in removed:
+            del index.json_by_id[member_id]
+        index.json_by_id.update(
+            (member_id, json_by_id[member_id] if json_by_id is not None else self.serialize(members[member_id]))
+            for member_id in changed
+        )
+        added = members.keys() - self.members_by_id.keys()
+        if removed or added:
+            index.sorted_ids = list(self.sorted_ids)
+            for member_id in removed:
+                del index.sorted_ids[bisect_left(index.sorted_ids, member_id)]
+            for member_id in added:
+                insort(index.sorted_ids, member_id)
+
+        codes = index.members_by_activation_code = dict(self.members_by_activation_code)
+        eans = index.contracts_by_ean = dict(self.contracts_by_ean)
+        for member_id in [*removed, *changed]:
+            old = self.members_by_id.get(member_id)
+            if old is None:
+                continue
+            if old.activation_code is not None and codes.get(old.activation_code) is old:
+                del codes[old.activation_code]
+            for ean in _contracts_by_ean(old):
+                # copied before patching, the previous index may still be read
+                owners = eans[ean] = {owner: c for owner, c in eans[ean].items() if owner != member_id}
+                if not owners:
+                    del eans[ean]
+        for member_id in changed:
+            member = members[member_id]
+            if member.activation_code is not None:
+                codes[member.activation_code] = member
+            for ean, contracts in _contracts_by_ean(member).items():
+                eans[ean] = {**eans.get(ean, {}), member_id: contracts}
+
+        filters = index.ids_by_filter = {name: dict(ids) for name, ids in self.ids_by_filter.items()}
+        copied: set[tuple[str, str]] = set()
+
+        def ids_of(name: str, value: str) -> builtins.list[str]:
+            # every list is copied once before patching, the previous index may still be read
+            if (name, value) not in copied:
+                copied.add((name, value))
+                filters[name][value] = list(filters[name].get(value, []))
+            return filters[name][value]
+
+        for member_id in [*removed, *changed]:
+            if member_id in self.members_by_id:
+                for name, values in _filter_values(self.members_by_id[member_id]).items():
+                    for value in values:
+                        ids = ids_of(name, value)
+                        del ids[bisect_left(ids, member_id)]
+        for member_id in changed:
+            for name, values in _filter_values(members[member_id]).items():
+                for value in values:
+                    insort(ids_of(name, value), member_id)
+        for name, value in copied:
+            if not filters[name][value]:
+                del filters[name][value]
+        return index
+
+    def select(
+        self,
+        page: int,
+        page_size: int,
+        after: str | None = None,
+        filters: dict[str, str | None] | None = None,
+    ) -> builtins.list[str]:
+        """The IDs of a page of members matching all filters, counting pages from the member after the cursor."""
+        candidates = [self.ids_by_filter[name].get(value, []) for name, value in (filters or {}).items() if value]
+        candidates.sort(key=len)
+        ids = candidates[0] if candidates else self.sorted_ids
+        others = candidates[1:]
+        start = bisect_right(ids, after) if after is not None else 0
+        offset = (page - 1) * page_size
+        if not others:
+            return ids[start + offset : start + offset + page_size]
+        matches = (member_id for member_id in _iter_from(ids, start) if all(_contains(o, member_id) for o in others))
+        return list(islice(matches, offset, offset + page_size))
+
+
+def _iter_from(ids: builtins.list[str], start: int) -> Iterator[str]:
+    return (ids[i] for i in range(start, len(ids)))
+
+
+def _contains(ids: builtins.list[str], member_id: str) -> bool:
+    i = bisect_left(ids, member_id)
+    return i < len(ids) and ids[i] == member_id
+
+
+def _batch_ids(index: MembersIndex, member_ids: Sequence[str], eans: Sequence[str]) -> builtins.list[str]:
+    """The known IDs followed by the members of the EANs, without duplicates."""
+    ids = dict.fromkeys(member_id for member_id in member_ids if member_id in index.members_by_id)
+    for ean in eans:
+        ids.update(dict.fromkeys(sorted(index.contracts_by_ean.get(ean, {}))))
+    return builtins.list(ids)
+
+
+def _loader_key(load_from_file: Callable[[Path], dict[str, Member]]) -> Hashable:
+    """Identifies a loader and its configuration across processes, preferring the snapshot_key it declares."""
+    key = getattr(load_from_file, "snapshot_key", None)
+    if key is not None:
+        return key
+    if isinstance(load_from_file, partial):
+        return (
+            _loader_key(load_from_file.func),
+            repr(load_from_file.args),
+            repr(sorted(load_from_file.keywords.items())),
+        )
+    if not hasattr(load_from_file, "__qualname__"):
+        # a callable object
+        return _qualified_name(type(load_from_file))
+    return _qualified_name(load_from_file)
+
+
+def _qualified_name(value: Any) -> str:
+    return f"{value.__module__}.{value.__qualname__}"
+
+
+def _filter_values(member: Member) -> dict[str, set[str]]:
+    contracts = [contract for address in member.addresses for contract in address.contracts]
+    return {name: {value(contract) for contract in contracts} for name, value in FILTERS.items()}
+
+
+def _contracts_by_ean(member: Member) -> dict[str, list[Contract]]:
+    contracts: dict[str, list[Contract]] = {}
+    for address in member.addresses:
+        for contract in address.contracts:
+            contracts.setdefault(contract.ean, []).append(contract)
+    return contracts
 
 
 class MembersFileSource(MemberSource[Member]):
+    # lookups only read the in-memory index
+    blocking = False
+
     def __init__(
         self,
         file_path: str,
         load_from_file: Callable[[Path], dict[str, Member]],
         page_size: int = PAGE_SIZE,
         logger: logging.Logger = LOGGER,
+        poll_interval: dt.timedelta = POLL_INTERVAL,
+        snapshot_path: str | Path | None = None,
     ):
+        """A MemberSource serving the members loaded from a file.
+
+        The file is loaded once on creation. While the app is up, a background task checks the file
+        every poll interval and reloads it off the request path when it changed, so requests only do dict lookups.
+        Without that task, reads check the file themselves, at most once per poll interval.
+
+        Args:
+            file_path: The file to load the members from.
+            load_from_file: Parses the file into a dict of members by ID.
+            page_size: The number of members per page when listing, unless a request asks for another page size.
+            logger: The logger reporting (failed) reloads.
+            poll_interval: How often the file is checked for changes.
+            snapshot_path: Optional file to keep a pickled snapshot of the loaded and encoded members in, keyed by
+                the signature of the members file and the loader. Workers and restarts load it instead of parsing the file again,
+                so it must be stored somewhere as trusted as the members file itself.
+        """
         self.file_path = Path(file_path)
         self.load_from_file = load_from_file
         self.page_size = page_size
+        self.poll_interval = poll_interval
+        self.logger = logger
+        self.snapshot_path = Path(snapshot_path) if snapshot_path is not None else None
         self._lock = RLock()
         self._file_signature: tuple[int, int] | None = None
-        self._members_by_id: dict[str, Member] = {}
-        self._sorted_ids: list[str] = []
-        self._members_by_activation_code: dict[str, Member] = {}
+        self._version = 0
+        self._watching = False
+        # a snapshot built by another loader or for another response model is not used
+        self._snapshot_key = (_loader_key(load_from_file), _qualified_name(self.response_model))
+        adapter = TypeAdapter(self.response_model)
+        self._serialize = partial(adapter.dump_json, by_alias=True)
+        self._index = MembersIndex({}, self._serialize)
         self._maybe_reload(force=True)
+        self._next_check = time.monotonic() + poll_interval.total_seconds()
 
     @property
     def response_model(self) -> type:
         return Member
 
+    @property
+    def lifespan_tasks(self) -> dict[Hashable, Callable[[], Coroutine[Any, Any, None]]]:
+        # keyed by source, so modules sharing this source only watch it once
+        return {self: self.watch}
+
+    @property
+    def version(self) -> int:
+        """The number of loads of the members file so far."""
+        self._read_index()
+        return self._version
+
     def list(
         self,
         page: Annotated[int, Query(ge=1)] = 1,
+        page_size: Annotated[int | None, Query(ge=1, le=MAX_PAGE_SIZE)] = None,
+        after: Annotated[
+            str | None,
+            Query(description="Cursor: only list the members with an ID after this one, e.g. the last ID of a page."),
+        ] = None,
+        supplier: Annotated[
+            str | None, Query(description="Only list members with a contract of this supplier.")
+        ] = None,
+        product: Annotated[str | None, Query(description="Only list members with a contract for this product.")] = None,
+        distributor: Annotated[
+            str | None, Query(description="Only list members with a contract of this distributor.")
+        ] = None,
+        customer_type: Annotated[
+            CustomerType | None, Query(description="Only list members with a contract of this customer type.")
+        ] = None,
     ) -> builtins.list[Member]:
-        self._maybe_reload()
-        start = (page - 1) * self.page_size
-        end = start + self.page_size
-        return [self._members_by_id[mid] for mid in self._sorted_ids[start:end]]
+        index = self._read_index()
+        ids = self._select(
+            index,
+            page=page,
+            page_size=page_size,
+            after=after,
+            supplier=supplier,
+            product=product,
+            distributor=distributor,
+            customer_type=customer_type,
+        )
+        return [index.members_by_id[mid] for mid in ids]
+
+    def list_json(self, *args, **kwargs) -> bytes:
+        index = self._read_index()
+        return b"[" + b",".join(index.json_by_id[mid] for mid in self._select(index, *args, **kwargs)) + b"]"
+
+    def get_json(self, member_id: str) -> bytes | None:
+        return self._read_index().json_by_id.get(member_id)
+
+    def get_many(self, member_ids: Sequence[str], eans: Sequence[str] = ()) -> builtins.list[Member]:
+        index = self._read_index()
+        return [index.members_by_id[mid] for mid in _batch_ids(index, member_ids, eans)]
+
+    def get_many_json(self, member_ids: Sequence[str], eans: Sequence[str] = ()) -> bytes:
+        index = self._read_index()
+        return b"[" + b",".join(index.json_by_id[mid] for mid in _batch_ids(index, member_ids, eans)) + b"]"
 
     def get(self, member_id: str) -> Member | None:
-        self._maybe_reload()
-        return self._members_by_id.get(member_id)
+        return self._read_index().members_by_id.get(member_id)
 
     def verify(self, activation_code: str) -> Member | None:
-        self._maybe_reload()
-        return self._members_by_activation_code.get(activation_code)
+        return self._read_index().members_by_activation_code.get(activation_code)
+
+    def get_by_ean(self, ean: str) -> builtins.list[Member]:
+        index = self._read_index()
+        return [index.members_by_id[member_id] for member_id in sorted(index.contracts_by_ean.get(ean, {}))]
+
+    def get_contracts(self, member_id: str, ean: str) -> builtins.list[Contract] | None:
+        index = self._read_index()
+        if member_id not in index.members_by_id:
+            return None
+        return index.contracts_by_ean.get(ean, {}).get(member_id, [])
+
+    def _select(
+        self,
+        index: MembersIndex,
+        page: int = 1,
+        page_size: int | None = None,
+        after: str | None = None,
+        supplier: str | None = None,
+        product: str | None = None,
+        distributor: str | None = None,
+        customer_type: CustomerType | None = None,
+    ) -> builtins.list[str]:
+        """The IDs of the members listed by list and list_json, which take the same parameters."""
+        filters = {"supplier": supplier, "product": product, "distributor": distributor, "customer_type": customer_type}
+        return index.select(page, page_size or self.page_size, after, filters)
+
+    async def watch(self) -> None:
+        """Reload the members in a worker thread whenever the file changed, until cancelled."""
+        self._watching = True
+        try:
+            while True:
+                await asyncio.sleep(self.poll_interval.total_seconds())
+                try:
+                    await asyncio.to_thread(self._maybe_reload)
+                except Exception:
+                    self.logger.exception("Failed to check %s for changes", self.file_path)
+        finally:
+            self._watching = False
+
+    def _read_index(self) -> MembersIndex:
+        """The current index, first checking the file for changes if no watch task is running.
+
+        Without the lifespan tasks, e.g. in a plain FastAPI app, reads fall back to reloading on the request path,
+        checking the file at most once per poll interval.
+        """
+        if not self._watching and time.monotonic() >= self._next_check:
+            self._next_check = time.monotonic() + self.poll_interval.total_seconds()
+            self._maybe_reload()
+        return self._index
 
     def _maybe_reload(self, *, force: bool = False) -> None:
         signature = self._get_file_signature()
@@ -68,19 +410,42 @@ class MembersFileSource(MemberSource[Member]):
             if signature is None:
                 return
 
-            try:
-                members = self.load_from_file(self.file_path)
-            except Exception:
-                LOGGER.exception("Failed to reload members from %s", self.file_path)
-                return
+            snapshot = self._read_snapshot(signature)
+            if snapshot is not None:
+                members, json_by_id = snapshot
+                index = self._index.updated(members, json_by_id)
+            else:
+                try:
+                    members = self.load_from_file(self.file_path)
+                except Exception:
+                    self.logger.exception("Failed to reload members from %s", self.file_path)
+                    return
+                index = self._index.updated(members, hashes=getattr(self.load_from_file, "row_hashes", None))
+                self._write_snapshot(signature, (members, index.json_by_id))
 
-            self._members_by_id = members
-            self._sorted_ids = sorted(members.keys())
-            self._members_by_activation_code = {
-                member.activation_code: member for member in members.values() if member.activation_code is not None
-            }
+            # swapped in one assignment, so readers never see a partial update
+            self._index = index
+            # only bumped after the swap, so a reader seeing the new version also sees the new members
+            self._version += 1
             self._file_signature = signature
-            LOGGER.info("Loaded %s members from %s", len(members), self.file_path)
+            self.logger.info("Loaded %s members from %s", len(members), self.file_path)
+
+    def _read_snapshot(self, signature: tuple[int, int]) -> tuple[dict[str, Member], dict[str, bytes]] | None:
+        if self.snapshot_path is None:
+            return None
+        try:
+            return read_snapshot(self.snapshot_path, (signature, self._snapshot_key))
+        except Exception:
+            self.logger.warning("Ignoring unreadable members snapshot %s", self.snapshot_path, exc_info=True)
+            return None
+
+    def _write_snapshot(self, signature: tuple[int, int], snapshot: tuple[dict[str, Member], dict[str, bytes]]) -> None:
+        if self.snapshot_path is None:
+            return
+        try:
+            write_snapshot(self.snapshot_path, (signature, self._snapshot_key), snapshot)
+        except Exception:
+            self.logger.exception("Failed to write members snapshot %s", self.snapshot_path)
 
     def _get_file_signature(self) -> tuple[int, int] | None:
         try:
@@ -0,0 +1,274 @@
+import asyncio
+import builtins
+import json
+import os
+import sqlite3
+from collections.abc import Callable, Coroutine, Hashable, Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+from queue import Empty, LifoQueue
+from threading import Lock
+from typing import Annotated, Any
+
+from fastapi import Query
+from pydantic import TypeAdapter
+
+from ..model import Contract, Member
+from ..source import MemberSource
+from .file_source import MAX_PAGE_SIZE, PAGE_SIZE
+
+POOL_SIZE = 4
+
+SCHEMA = """
+CREATE TABLE members (id TEXT PRIMARY KEY, activation_code TEXT, data BLOB NOT NULL) WITHOUT ROWID;
+CREATE INDEX members_activation_code ON members (activation_code);
+CREATE TABLE member_eans (
+    ean TEXT NOT NULL, member_id TEXT NOT NULL, contracts BLOB NOT NULL, PRIMARY KEY (ean, member_id)
+) WITHOUT ROWID;
+"""
+
+MEMBER = TypeAdapter(Member)
+CONTRACTS = TypeAdapter(builtins.list[Contract])
+
+
+def write_members_database(database_path: str | Path, members: Iterable[Member]) -> None:
+    """Write the members to a new SQLite database for MembersSQLiteSource, replacing the database at path atomically.
+
+    Members are stored as JSON, with the activation code indexed, and so are the contracts of every member per EAN.
+    As members are written one by one, an iterator over a large member base never needs to fit in memory.
+    """
+    path = Path(database_path)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.unlink(missing_ok=True)
+    connection = sqlite3.connect(tmp)
+    try:
+        with connection:
+            connection.executescript(SCHEMA)
+            for member in members:
+                connection.execute(
+                    "INSERT INTO members VALUES (?, ?, ?)",
+                    (member.id, member.activation_code, MEMBER.dump_json(member, by_alias=True)),
+                )
+                contracts_by_ean: dict[str, builtins.list[Contract]] = {}
+                for address in member.addresses:
+                    for contract in address.contracts:
+                        contracts_by_ean.setdefault(contract.ean, []).append(contract)
+                connection.executemany(
+                    "INSERT INTO member_eans VALUES (?, ?, ?)",
+                    [
+                        (ean, member.id, CONTRACTS.dump_json(contracts, by_alias=True))
+                        for ean, contracts in contracts_by_ean.items()
+                    ],
+                )
+    finally:
+        connection.close()
+    os.replace(tmp, path)
+
+
+class MembersSQLiteSource(MemberSource[Member]):
+    def __init__(
+        self,
+        database_path: str | Path,
+        page_size: int = PAGE_SIZE,
+        pool_size: int = POOL_SIZE,
+    ):
+        """A MemberSource reading the members from a SQLite database written by write_members_database.
+
+        Members are looked up through the indexes of the database and only the returned rows are parsed
+        into models, so memory use does not grow with the member base. The JSON endpoints serve the stored
+        JSON as is. Requests share a pool of read-only connections, opened when first needed.
+
+        When write_members_database replaces the database, open connections still read the old file, so they are
+        closed as soon as a request notices the change, and reopened when needed. Close the pool on shutdown with
+        close, or through the lifespan task of the source.
+
+        Args:
+            database_path: The SQLite database with the members.
+            page_size: The number of members per page when listing, unless a request asks for another page size.
+            pool_size: The maximum number of open connections, and so of concurrent queries.
+        """
+        self.database_path = Path(database_path)
+        self.page_size = page_size
+        self.pool_size = pool_size
+        # every opened connection holds a slot in the pool, with the signature of the database file it was opened on,
+        # or None once it was closed and the next request may open a new one in its place
+        self._pool: LifoQueue[tuple[tuple[int, int, int] | None, sqlite3.Connection] | None] = LifoQueue()
+        self._opened = 0
+        self._lock = Lock()
+        # the signature of the database file the last request saw
+        self._signature: tuple[int, int, int] | None = None
+        self._closed = False
+
+    @property
+    def lifespan_tasks(self) -> dict[Hashable, Callable[[], Coroutine[Any, Any, None]]]:
+        # keyed by source, so modules sharing this source only close it once
+        return {self: self.close_on_shutdown}
+
+    @property
+    def version(self) -> tuple[int, int, int] | None:
+        """The signature of the database file, which changes whenever it is replaced."""
+        return self._get_file_signature()
+
+    def list(
+        self,
+        page: Annotated[int, Query(ge=1)] = 1,
+        page_size: Annotated[int | None, Query(ge=1, le=MAX_PAGE_SIZE)] = None,
+        after: Annotated[
+            str | None,
+            Query(description="Cursor: only list the members with an ID after this one, e.g. the last ID of a page."),
+        ] = None,
+    ) -> builtins.list[Member]:
+        return [Member.model_validate_json(data) for data in self._page(page, page_size, after)]
+
+    def list_json(self, page: int = 1, page_size: int | None = None, after: str | None = None) -> bytes:
+        return _json_array(self._page(page, page_size, after))
+
+    def get(self, member_id: str) -> Member | None:
+        data = self.get_json(member_id)
+        return Member.model_validate_json(data) if data is not None else None
+
+    def get_json(self, member_id: str) -> bytes | None:
+        return self._one("SELECT data FROM members WHERE id = ?", (member_id,))
+
+    def verify(self, activation_code: str) -> Member | None:
+        data = self._one("SELECT data FROM members WHERE activation_code = ? LIMIT 1", (activation_code,))
+        return Member.model_validate_json(data) if data is not None else None
+
+    def get_by_ean(self, ean: str) -> builtins.list[Member]:
+        rows = self._all(
+            "SELECT m.data FROM member_eans e JOIN members m ON m.id = e.member_id WHERE e.ean = ? ORDER BY e.member_id",
+            (ean,),
+        )
+        return [Member.model_validate_json(data) for data in rows]
+
+    def get_contracts(self, member_id: str, ean: str) -> builtins.list[Contract] | None:
+        rows = self._rows(
+            "SELECT e.contracts FROM members m LEFT JOIN member_eans e ON e.member_id = m.id AND e.ean = ? "
+            "WHERE m.id = ?",
+            (ean, member_id),
+        )
+        if not rows:
+            return None
+        (contracts,) = rows[0]
+        return CONTRACTS.validate_json(contracts) if contracts is not None else []
+
+    def get_many(self, member_ids: Sequence[str], eans: Sequence[str] = ()) -> builtins.list[Member]:
+        return [Member.model_validate_json(data) for data in self._many(member_ids, eans)]
+
+    def get_many_json(self, member_ids: Sequence[str], eans: Sequence[str] = ()) -> bytes:
+        return _json_array(self._many(member_ids, eans))
+
+    def close(self) -> None:
+        """Close the connections of the pool, those still in use are closed as soon as they are handed back."""
+        self._closed = True
+        while True:
+            try:
+                entry = self._pool.get_nowait()
+            except Empty:
+                return
+            if entry is not None:
+                entry[1].close()
+            with self._lock:
+                self._opened -= 1
+
+    async def close_on_shutdown(self) -> None:
+        """Keep the pooled connections open while the app is up and close them on shutdown, as a lifespan task."""
+        try:
+            await asyncio.Future()
+        finally:
+            self.close()
+
+    def _page(self, page: int, page_size: int | None, after: str | None) -> builtins.list[bytes]:
+        page_size = page_size or self.page_size
+        offset = (page - 1) * page_size
+        if after is None:
+            return self._all("SELECT data FROM members ORDER BY id LIMIT ? OFFSET ?", (page_size, offset))
+        # a separate query, so the cursor seeks in the primary key instead of filtering every row
+        return self._all(
+            "SELECT data FROM members WHERE id > ? ORDER BY id LIMIT ? OFFSET ?", (after, page_size, offset)
+        )
+
+    def _many(self, member_ids: Sequence[str], eans: Sequence[str]) -> builtins.list[bytes]:
+        """The JSON of the known IDs followed by the members of the EANs, without duplicates."""
+        by_id = dict(
+            self._rows(
+                "SELECT id, data FROM members WHERE id IN (SELECT value FROM json_each(?))",
+                (json.dumps(builtins.list(member_ids)),),
+            )
+        )
+        members = {member_id: by_id[member_id] for member_id in member_ids if member_id in by_id}
+        for ean in eans:
+            rows = self._rows(
+                "SELECT m.id, m.data FROM member_eans e JOIN members m ON m.id = e.member_id "
+                "WHERE e.ean = ? ORDER BY e.member_id",
+                (ean,),
+            )
+            members.update((member_id, data) for member_id, data in rows if member_id not in members)
+        return builtins.list(members.values())
+
+    def _one(self, query: str, parameters: tuple) -> bytes | None:
+        rows = self._all(query, parameters)
+        return rows[0] if rows else None
+
+    def _all(self, query: str, parameters: tuple) -> builtins.list[bytes]:
+        return [data for (data,) in self._rows(query, parameters)]
+
+    def _rows(self, query: str, parameters: tuple) -> builtins.list[tuple]:
+        with self._connection() as connection:
+            return connection.execute(query, parameters).fetchall()
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        signature = self._get_file_signature()
+        self._signature = signature
+        entry = self._acquire(signature)
+        try:
+            yield entry[1]
+        finally:
+            self._release(entry)
+
+    def _release(self, entry: tuple[tuple[int, int, int] | None, sqlite3.Connection]) -> None:
+        if self._closed or entry[0] != self._signature:
+            # the pool was closed, or the database was replaced while the connection was in use:
+            # it is closed and its slot is handed back empty
+            entry[1].close()
+            self._pool.put(None)
+        else:
+            self._pool.put(entry)
+
+    def _acquire(
+        self, signature: tuple[int, int, int] | None
+    ) -> tuple[tuple[int, int, int] | None, sqlite3.Connection]:
+        try:
+            entry = self._pool.get_nowait()
+        except Empty:
+            with self._lock:
+                can_open = self._opened < self.pool_size
+                if can_open:
+                    self._opened += 1
+            # wait for another request to hand back its slot
+            entry = None if can_open else self._pool.get()
+        if entry is not None:
+            if entry[0] == signature:
+                return entry
+            # the database was replaced since the connection was opened, it still reads the old file
+            entry[1].close()
+        try:
+            uri = f"{self.database_path.resolve().as_uri()}?mode=ro"
+            # connections move between the worker threads of requests, but are only used by one at a time
+            return signature, sqlite3.connect(uri, uri=True, check_same_thread=False)
+        except Exception:
+            with self._lock:
+                self._opened -= 1
+            raise
+
+    def _get_file_signature(self) -> tuple[int, int, int] | None:
+        try:
+            stat = self.database_path.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def _json_array(items: builtins.list[bytes]) -> bytes:
+    return b"[" + b",".join(items) + b"]"
@@ -1,7 +1,13 @@
 from .module import ProductionModule
+from .sources.energyID_client import EnergyIDClient
+from .sources.energyID_fleet import EnergyIDFleetProduction
 from .sources.energyID_production import EnergyIDProduction
+from .sources.energyID_store import EnergyIDStore
 
 __all__ = [
+    "EnergyIDClient",
+    "EnergyIDFleetProduction",
     "EnergyIDProduction",
+    "EnergyIDStore",
     "ProductionModule",
 ]
@@ -1,6 +1,28 @@
-from cofy.modules.timeseries import TimeseriesModule
+from cofy.modules.timeseries import (
+    CSVFormat,
+    JSONFormat,
+    MessagePackFormat,
+    TimeseriesFormat,
+    TimeseriesModule,
+    TimeseriesSource,
+)
+
+from .sources.energyID_fleet import EnergyIDFleetProduction
 
 
 class ProductionModule(TimeseriesModule):
     type: str = "production"
     type_description: str = "Module providing production data as time series."
+
+    def __init__(
+        self,
+        *,
+        source: TimeseriesSource,
+        formats: list[TimeseriesFormat] | None = None,
+        **kwargs,
+    ):
+        if formats is None and isinstance(source, EnergyIDFleetProduction):
+            # the rows of a fleet carry a field per record when its breakdown is enabled
+            formats = [JSONFormat(DT=source.record_model), CSVFormat(), MessagePackFormat()]
+
+        super().__init__(source=source, formats=formats, **kwargs)
@@ -0,0 +1,117 @@
+import asyncio
+import logging
+from typing import Any
+
+import httpx
+
+LOGGER = logging.getLogger(__name__)
+
+ENERGY_ID_BASE_URL = "https://api.energyid.eu/api/v1"
+RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+
+class EnergyIDClient:
+    def __init__(
+        self,
+        api_key: str,
+        *,
+        base_url: str = ENERGY_ID_BASE_URL,
+        timeout: float | httpx.Timeout = 10.0,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        max_connections: int = 10,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        """An async EnergyID API client with keep-alive connection pooling, timeouts and bounded retries.
+        A single client can be shared between sources, so they share its connection pool.
+
+        Args:
+            api_key: The EnergyID API key.
+            base_url: The base url of the EnergyID API.
+            timeout: The request timeout in seconds, or a httpx.Timeout for finer control.
+            max_retries: How many times a request is retried on connection errors, timeouts and 429/5xx responses.
+            backoff: The delay before the first retry in seconds, doubled on every next retry.
+            max_connections: The maximum number of concurrent connections to the API.
+            transport: Optional httpx transport, e.g. to route requests to a local stand-in of the API.
+        """
+        if not api_key:
+            raise ValueError("API key must be provided")
+        self.base_url = base_url
+        self.headers = {"Authorization": f"apikey {api_key}"}
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self.transport = transport
+        self._client: httpx.AsyncClient | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def _get_client(self) -> httpx.AsyncClient:
+        # connections are bound to the event loop that opened them
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            if self._client is not None:
+                await _close_stale(self._client, self._loop)
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self.headers,
+                timeout=self.timeout,
+                limits=self.limits,
+                transport=self.transport,
+            )
+            self._loop = loop
+        return self._client
+
+    async def get_json(self, path: str, params: dict[str, str] | None = None) -> Any:
+        """GET path and return the decoded JSON body, raises ValueError if the request keeps failing."""
+        return (await self._get(path, params)).json()
+
+    async def get_bytes(self, path: str, params: dict[str, str] | None = None) -> bytes:
+        """GET path and return the raw body, for callers that decode it themselves."""
+        return (await self._get(path, params)).content
+
+    async def _get(self, path: str, params: dict[str, str] | None) -> httpx.Response:
+        client = await self._get_client()
+        attempt = 0
+        while True:
+            try:
+                response = await client.get(path, params=params)
+            except httpx.TransportError as e:
+                if attempt >= self.max_retries:
+                    raise ValueError(f"Failed to fetch data from EnergyID API: {e!r}") from e
+                LOGGER.warning("Request to EnergyID failed (%r), retrying", e)
+            else:
+                if response.status_code == 200:
+                    return response
+                if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                    raise ValueError(
+                        f"Failed to fetch data from EnergyID API: {response.status_code} - {response.text}"
+                    )
+                LOGGER.warning("EnergyID responded with %s, retrying", response.status_code)
+            await asyncio.sleep(self.backoff * 2**attempt)
+            attempt += 1
+
+    async def aclose(self) -> None:
+        """Close the pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._loop = None
+
+    async def close_on_shutdown(self) -> None:
+        """Keep the pooled connections open while the app is up and close them on shutdown, as a lifespan task."""
+        try:
+            await asyncio.Future()
+        finally:
+            await self.aclose()
+
+
+async def _close_stale(client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop | None) -> None:
+    """Close a client opened on another event loop: on that loop while it still runs, else here as well as possible."""
+    if loop is not None and loop.is_running():
+        asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+        return
+    try:
+        await client.aclose()
+    except Exception:
+        LOGGER.debug("Failed to close the EnergyID client of a previous event loop", exc_info=True)
@@ -0,0 +1,109 @@
+import asyncio
+import datetime as dt
+from collections.abc import Callable, Coroutine, Hashable
+from functools import cached_property
+from typing import Any
+
+import polars as pl
+from pydantic import BaseModel, create_model
+
+from cofy.modules.timeseries import ISODuration, Timeseries, TimeseriesSource
+
+from .energyID_client import EnergyIDClient
+from .energyID_production import DEFAULT_TIMEZONE, EnergyIDProduction
+
+
+class EnergyIDFleetProduction(TimeseriesSource):
+    def __init__(
+        self,
+        api_key: str,
+        record_ids: list[str],
+        client: EnergyIDClient | None = None,
+        max_concurrency: int = 5,
+        breakdown: bool = False,
+        cache_ttl: dt.timedelta | None = dt.timedelta(minutes=15),
+        timezone: dt.tzinfo = DEFAULT_TIMEZONE,
+    ) -> None:
+        """A TimeseriesSource providing the summed energy production of several EnergyID records.
+
+        The records are fetched concurrently through one shared client and aligned on their timestamps,
+        a timestamp missing in some records is summed over the records that have it.
+
+        Args:
+            api_key: The EnergyID API key, only used when no client is given.
+            record_ids: The EnergyID records to sum the production of.
+            client: Optional EnergyIDClient, shared by all records.
+            max_concurrency: The maximum number of records fetched at the same time.
+            breakdown: Whether to add the production of every record as a column named after its record id.
+            cache_ttl: How long the day blocks of every record stay fresh, see EnergyIDProduction.
+            timezone: The timezone of the records, in which the API splits their days.
+        """
+        super().__init__()
+        if not record_ids:
+            raise ValueError("At least one record ID must be provided")
+        if len(set(record_ids)) != len(record_ids):
+            raise ValueError("Record IDs must be unique")
+        if max_concurrency < 1:
+            raise ValueError("Max concurrency must be at least 1")
+
+        self.client = client or EnergyIDClient(api_key)
+        self.max_concurrency = max_concurrency
+        self.breakdown = breakdown
+        self.records = {
+            record_id: EnergyIDProduction(
+                api_key, record_id, client=self.client, cache_ttl=cache_ttl, timezone=timezone
+            )
+            for record_id in record_ids
+        }
+
+    async def fetch_timeseries(
+        self,
+        start: dt.datetime,
+        end: dt.datetime,
+        resolution: ISODuration,
+        **kwargs,
+    ) -> Timeseries:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def fetch(record: EnergyIDProduction) -> Timeseries:
+            async with semaphore:
+                return await record.fetch_timeseries(start, end, resolution)
+
+        results = await asyncio.gather(*(fetch(record) for record in self.records.values()))
+
+        units = {timeseries.metadata["unit"] for timeseries in results}
+        if len(units) > 1:
+            raise ValueError(f"Records have different units: {', '.join(sorted(units))}")
+
+        record_ids = list(self.records.keys())
+        frame = pl.concat(
+            [
+                timeseries.frame.to_native().rename({"value": record_id})
+                for record_id, timeseries in zip(record_ids, results, strict=True)
+            ],
+            how="align",
+        )
+        total = pl.when(pl.any_horizontal(pl.col(record_ids).is_not_null())).then(pl.sum_horizontal(record_ids))
+        frame = frame.with_columns(value=total)
+        columns = ["timestamp", "value", *record_ids] if self.breakdown else ["timestamp", "value"]
+        return Timeseries(frame=frame.select(columns), metadata={"unit": units.pop()})
+
+    @cached_property
+    def record_model(self) -> type[BaseModel]:
+        """Pydantic model of a single row, with a field per record when the breakdown is enabled."""
+        breakdown = {record_id: (float | None, None) for record_id in self.records} if self.breakdown else {}
+        return create_model(
+            "FleetProductionRecord",
+            timestamp=(dt.datetime, ...),
+            value=(float | None, None),
+            **breakdown,
+        )
+
+    @property
+    def lifespan_tasks(self) -> dict[Hashable, Callable[[], Coroutine[Any, Any, None]]]:
+        # every record shares the client of the fleet, so it is closed once
+        return {self.client: self.client.close_on_shutdown}
+
+    @property
+    def supported_resolutions(self) -> list[str]:
+        return EnergyIDProduction.SUPPORTED_RESOLUTIONS
@@ -1,40 +1,83 @@
 import asyncio
 import datetime as dt
+import io
+import logging
+from collections.abc import Callable, Coroutine, Hashable
+from typing import Any
+from zoneinfo import ZoneInfo
 
 import polars as pl
-import requests
 from isodate import strftime
-from pydantic import BaseModel
 
-from cofy.modules.timeseries import ISODuration, Timeseries, TimeseriesSource
+from cofy.modules.timeseries import CachedTimeseriesSource, ISODuration, Timeseries, TimeseriesSource
+from cofy.modules.timeseries.sources.cached import to_utc
 
+from .energyID_client import EnergyIDClient
+from .energyID_store import EnergyIDStore
 
-class EnergyIDDataPoint(BaseModel):
-    timestamp: str
-    total: float
+LOGGER = logging.getLogger(__name__)
 
+# EnergyID splits days in the timezone of the record
+DEFAULT_TIMEZONE = ZoneInfo("Europe/Brussels")
+DAY = dt.timedelta(days=1)
 
-class EnergyIDValueEntry(BaseModel):
-    data: list[EnergyIDDataPoint]
-    unit: str = "unknown"
-
-
-class EnergyIDResponse(BaseModel):
-    value: list[EnergyIDValueEntry]
+# only the fields we use are decoded, straight into columns
+RESPONSE_SCHEMA = pl.Schema(
+    {
+        "value": pl.List(
+            pl.Struct(
+                {
+                    "unit": pl.String,
+                    "data": pl.List(pl.Struct({"timestamp": pl.String, "total": pl.Float64})),
+                }
+            )
+        )
+    }
+)
 
 
 class EnergyIDProduction(TimeseriesSource):
     SUPPORTED_RESOLUTIONS: list[str] = ["PT5M", "PT15M", "PT1H", "P1D", "P7D", "P1M", "P1Y"]
 
-    def __init__(self, api_key: str, record_id: str) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        record_id: str,
+        client: EnergyIDClient | None = None,
+        cache_ttl: dt.timedelta | None = dt.timedelta(minutes=15),
+        max_blocks: int = 1024,
+        store: EnergyIDStore | None = None,
+        timezone: dt.tzinfo = DEFAULT_TIMEZONE,
+    ) -> None:
+        """A TimeseriesSource providing the energy production of an EnergyID record.
+
+        The API only accepts whole days, so resolutions up to a day are cached in UTC day blocks per interval
+        by a CachedTimeseriesSource, and the exact requested window is sliced out locally.
+        Coarser resolutions are passed through as is.
+
+        With a store, the record is synced into it in the background while the app is up, and every resolution
+        that can be derived from it is served from the store instead of the API.
+
+        Args:
+            api_key: The EnergyID API key, only used when no client is given.
+            record_id: The EnergyID record to fetch the production of.
+            client: Optional EnergyIDClient, pass one to configure timeouts and retries or to share its connection pool.
+            cache_ttl: How long a cached day block stays fresh, None means blocks never expire.
+            max_blocks: The maximum number of day blocks to keep, the least recently used blocks are evicted first.
+            store: Optional EnergyIDStore to sync the record into.
+            timezone: The timezone of the record, in which the API splits its days.
+        """
         super().__init__()
-        if not api_key:
-            raise ValueError("API key must be provided")
         if not record_id:
             raise ValueError("Record ID must be provided")
 
-        self.headers = {"Authorization": f"apikey {api_key}"}
+        self.client = client or EnergyIDClient(api_key)
         self.record_id = record_id
+        self.store = store
+        self.timezone = timezone
+        self.cache = CachedTimeseriesSource(
+            _EnergyIDWindows(self._fetch_days, timezone), ttl=cache_ttl, block_size=DAY, max_blocks=max_blocks
+        )
 
     async def fetch_timeseries(
         self,
@@ -43,8 +86,6 @@ class EnergyIDProduction(TimeseriesSource):
         resolution: ISODuration,
         **kwargs,
     ) -> Timeseries:
-        start_date = start.date().isoformat()
-        end_date = end.date().isoformat()
         resolution_iso = strftime(resolution, format="P%P")
 
         if resolution_iso not in self.SUPPORTED_RESOLUTIONS:
@@ -53,29 +94,118 @@ class EnergyIDProduction(TimeseriesSource):
                 f"Supported resolutions are: {', '.join(self.SUPPORTED_RESOLUTIONS)}"
             )
 
-        respone = await asyncio.to_thread(
-            requests.get,
-            f"https://api.energyid.eu/api/v1/records/{self.record_id}/data/energyProduction?start={start_date}&end={end_date}&interval={resolution_iso}",
-            headers=self.headers,
-        )
-        if respone.status_code != 200:
-            raise ValueError(f"Failed to fetch data from EnergyID API: {respone.status_code} - {respone.text}")
-
-        parsed = EnergyIDResponse.model_validate(respone.json())
-        entry = parsed.value[0]
-
-        data = [
-            {
-                "timestamp": dt.datetime.fromisoformat(point.timestamp),
-                "value": point.total,
-            }
-            for point in entry.data
-        ]
-        return Timeseries(
-            frame=pl.DataFrame(data),
-            metadata={"unit": entry.unit},
+        if not isinstance(resolution, dt.timedelta) or resolution > DAY:
+            frame, unit = await self._fetch_days(start.date(), end.date(), resolution_iso)
+            return Timeseries(frame=frame.drop("date"), metadata={"unit": unit})
+
+        start, end = to_utc(start), to_utc(end)
+        end = max(start, end)
+        if self.store is not None:
+            stored = self.store.read(start, end, resolution)
+            if stored is not None:
+                return Timeseries(frame=stored, metadata={"unit": self.store.unit})
+        return await self.cache.fetch_timeseries(start, end, resolution)
+
+    def clear(self) -> None:
+        """Drop all cached day blocks."""
+        self.cache.clear()
+
+    async def sync(self) -> None:
+        """Fetch the data since the last stored timestamp into the store."""
+        if self.store is None:
+            raise ValueError("A store must be provided to sync")
+        now = dt.datetime.now(dt.UTC)
+        cursor = self.store.last_timestamp or self.store.since
+        while cursor < now:
+            until = min(cursor + self.store.chunk, now)
+            if cursor == self.store.last_timestamp and self.store.last_date is not None:
+                # the API works in whole local days, so only the day of the last stored point is fetched again
+                first = self.store.last_date
+            else:
+                first = cursor.astimezone(self.timezone).date()
+            frame, unit = await self._fetch_days(
+                first, until.astimezone(self.timezone).date() + DAY, self.store.resolution
+            )
+            frame = frame.filter(pl.col("timestamp") >= cursor).sort("timestamp")
+            last_date = frame["date"][-1] if len(frame) > 0 else None
+            await asyncio.to_thread(self.store.append, frame.drop("date"), unit, last_date)
+            cursor = until
+
+    async def run_sync(self) -> None:
+        """Sync the store every sync interval until cancelled."""
+        while True:
+            try:
+                await self.sync()
+            except Exception:
+                LOGGER.exception("Failed to sync EnergyID record %s", self.record_id)
+            await asyncio.sleep(self.store.sync_interval.total_seconds())
+
+    @property
+    def lifespan_tasks(self) -> dict[Hashable, Callable[[], Coroutine[Any, Any, None]]]:
+        # keyed by client, so sources sharing a client only close it once
+        tasks: dict[Hashable, Callable[[], Coroutine[Any, Any, None]]] = {self.client: self.client.close_on_shutdown}
+        if self.store is not None:
+            # keyed by store, so modules sharing this source only sync it once
+            tasks[self.store] = self.run_sync
+        return tasks
+
+    async def _fetch_days(self, start: dt.date, end: dt.date, interval: str) -> tuple[pl.DataFrame, str]:
+        """Fetch the local days start up to end from the API, each point is tagged with the local date it belongs to."""
+        content = await self.client.get_bytes(
+            f"/records/{self.record_id}/data/energyProduction",
+            params={"start": start.isoformat(), "end": end.isoformat(), "interval": interval},
         )
+        return parse_response(content)
 
     @property
     def supported_resolutions(self) -> list[str]:
         return self.SUPPORTED_RESOLUTIONS
+
+
+def parse_response(content: bytes) -> tuple[pl.DataFrame, str]:
+    """Decode an EnergyID data response into a frame with timestamp, value and the local date of every point."""
+    try:
+        entries = pl.read_json(io.BytesIO(content), schema=RESPONSE_SCHEMA)
+        entry = entries.select(pl.col("value").list.first()).unnest("value")
+        if entry["data"].is_null().all():
+            raise ValueError("Invalid response from EnergyID API: no data entry")
+
+        points = entry.select(pl.col("data").explode()).unnest("data")
+        frame = points.select(
+            timestamp=pl.col("timestamp").str.to_datetime(time_unit="us", time_zone="UTC"),
+            value=pl.col("total"),
+            date=pl.col("timestamp").str.slice(0, 10).str.to_date(),
+        )
+    except pl.exceptions.PolarsError as e:
+        raise ValueError(f"Invalid response from EnergyID API: {e}") from e
+    return frame, entry["unit"][0] or "unknown"
+
+
+class _EnergyIDWindows(TimeseriesSource):
+    def __init__(
+        self,
+        fetch_days: Callable[[dt.date, dt.date, str], Coroutine[Any, Any, tuple[pl.DataFrame, str]]],
+        timezone: dt.tzinfo,
+    ):
+        """The exact UTC windows of an EnergyID record, fetched as the local days they overlap."""
+        self.fetch_days = fetch_days
+        self.timezone = timezone
+
+    async def fetch_timeseries(
+        self,
+        start: dt.datetime,
+        end: dt.datetime,
+        resolution: ISODuration,
+        **kwargs,
+    ) -> Timeseries:
+        end = max(start, end)
+        frame, unit = await self.fetch_days(
+            start.astimezone(self.timezone).date(),
+            (end - dt.timedelta.resolution).astimezone(self.timezone).date() + DAY,
+            strftime(resolution, format="P%P"),
+        )
+        frame = frame.drop("date").sort("timestamp")
+        timestamps = frame["timestamp"]
+        lower = timestamps.search_sorted(start, side="left")
+        upper = timestamps.search_sorted(end, side="left")
+        return Timeseries(frame=frame.slice(lower, upper - lower), metadata={"unit": unit})
@@ -0,0 +1,97 @@
+import datetime as dt
+import os
+from pathlib import Path
+
+import polars as pl
+
+STORE_RESOLUTIONS = {
+    "PT5M": dt.timedelta(minutes=5),
+    "PT15M": dt.timedelta(minutes=15),
+    "PT1H": dt.timedelta(hours=1),
+}
+DEFAULT_UNIT = "unknown"
+
+
+class EnergyIDStore:
+    def __init__(
+        self,
+        since: dt.datetime,
+        resolution: str = "PT15M",
+        sync_interval: dt.timedelta = dt.timedelta(minutes=15),
+        chunk: dt.timedelta = dt.timedelta(days=31),
+        path: str | Path | None = None,
+    ) -> None:
+        """A local copy of the production of an EnergyID record, kept up to date by EnergyIDProduction.sync.
+
+        Args:
+            since: From when to sync while the store is still empty.
+            resolution: The interval that is synced, one of PT5M, PT15M or PT1H.
+                Coarser intraday resolutions that are a multiple of it are aggregated from the store.
+            sync_interval: How long to wait between two syncs.
+            chunk: The maximum window fetched in a single call, e.g. while catching up on a long history.
+            path: Optional parquet file to persist the store in, so a restart only fetches what is new.
+        """
+        if resolution not in STORE_RESOLUTIONS:
+            raise ValueError(
+                f"Resolution {resolution} can not be stored. Supported resolutions are: {', '.join(STORE_RESOLUTIONS)}"
+            )
+        self.since = since if since.tzinfo is not None else since.replace(tzinfo=dt.UTC)
+        self.resolution = resolution
+        self.sync_interval = sync_interval
+        self.chunk = chunk
+        self.path = Path(path) if path is not None else None
+        self.unit = DEFAULT_UNIT
+        self.last_date: dt.date | None = None
+        self.frame = pl.DataFrame(schema={"timestamp": pl.Datetime("us", "UTC"), "value": pl.Float64})
+        if self.path is not None and self.path.exists():
+            self.frame = pl.read_parquet(self.path)
+            metadata = pl.read_parquet_metadata(self.path)
+            self.unit = metadata.get("unit", DEFAULT_UNIT)
+            self.last_date = dt.date.fromisoformat(metadata["last_date"]) if "last_date" in metadata else None
+
+    @property
+    def last_timestamp(self) -> dt.datetime | None:
+        """The last stored timestamp, None while the store is empty."""
+        return self.frame["timestamp"][-1] if len(self.frame) > 0 else None
+
+    def append(self, frame: pl.DataFrame, unit: str, last_date: dt.date | None = None) -> None:
+        """Store a sorted frame of fresh data, replacing everything stored from its first timestamp on.
+
+        The local date of the last point, if known, lets the next sync fetch only from that day on.
+        Writing the file blocks, so call this from a worker thread when the store is persisted.
+        """
+        if len(frame) == 0:
+            return
+        keep = self.frame["timestamp"].search_sorted(frame["timestamp"][0], side="left")
+        # swapped in one assignment, so readers never see a partial update
+        self.frame = pl.concat([self.frame.slice(0, keep), frame.select(self.frame.columns)])
+        self.unit = unit
+        self.last_date = last_date
+        if self.path is not None:
+            metadata = {"unit": unit}
+            if last_date is not None:
+                metadata["last_date"] = last_date.isoformat()
+            tmp = self.path.with_name(f"{self.path.name}.tmp")
+            self.frame.write_parquet(tmp, metadata=metadata)
+            os.replace(tmp, self.path)
+
+    def read(self, start: dt.datetime, end: dt.datetime, resolution: dt.timedelta) -> pl.DataFrame | None:
+        """The stored values between start and end at resolution.
+
+        Points after the last synced timestamp are not known yet, so a window that ends after it gets the stored rows
+        up to that timestamp. None if resolution can not be derived from the store, or if the window starts before
+        the stored data.
+        """
+        stored = STORE_RESOLUTIONS[self.resolution]
+        if resolution >= dt.timedelta(days=1) or resolution % stored:
+            return None
+        timestamps = self.frame["timestamp"]
+        if len(timestamps) == 0 or start < timestamps[0]:
+            return None
+        lower = timestamps.search_sorted(start, side="left")
+        upper = timestamps.search_sorted(max(start, end), side="left")
+        frame = self.frame.slice(lower, upper - lower)
+        if resolution == stored:
+            return frame
+        every = f"{int(resolution.total_seconds())}s"
+        return frame.group_by_dynamic("timestamp", every=every).agg(pl.col("value").sum())
@@ -1,14 +1,19 @@
-from .formats.kiwatt import KiwattFormat, PriceRecordModel, ResponseModel, to_utc_timestring
-from .module import TariffModule
-from .sources.energy_cost import EnergyCostTariffSource
+from .formats.kiwatt import KiwattFormat, PriceRecordModel, ResponseModel, to_utc_timestring, to_utc_timestrings
+from .module import TariffComparisonModule, TariffModule
+from .sources.energy_cost import EnergyCostTariffSource, guard_cached_indexes
+from .sources.energy_cost_comparison import EnergyCostComparisonTariffSource
 from .sources.entsoe_day_ahead import EntsoeDayAheadTariffSource
 
 __all__ = [
     "EntsoeDayAheadTariffSource",
+    "EnergyCostComparisonTariffSource",
     "EnergyCostTariffSource",
     "KiwattFormat",
     "PriceRecordModel",
     "ResponseModel",
+    "TariffComparisonModule",
     "TariffModule",
+    "guard_cached_indexes",
     "to_utc_timestring",
+    "to_utc_timestrings",
 ]
@@ -1,15 +1,36 @@
+import json
 from datetime import UTC, datetime, timedelta
 
+import narwhals as nw
+from fastapi import Response
+from isodate import strftime
 from pydantic import BaseModel, ConfigDict
 
 from cofy.modules.timeseries import ISODuration, Timeseries, TimeseriesFormat
 
+UTC_TIMESTRING_FORMAT = "%Y-%m-%dT%H:%M:%S+00:00"
+
 
 def to_utc_timestring(dt: datetime | str) -> str:
     dt_obj = datetime.fromisoformat(dt) if isinstance(dt, str) else dt
+    if dt_obj.tzinfo is None:
+        # naive timestamps are in the local time of the system, also when given as e.g. a pandas Timestamp
+        dt_obj = datetime.combine(dt_obj.date(), dt_obj.time())
     return dt_obj.astimezone(UTC).replace(microsecond=0).isoformat()
 
 
+def to_utc_timestrings(frame: nw.DataFrame, column: str = "timestamp") -> nw.Series | None:
+    """Vectorized to_utc_timestring for a column of timezone-aware datetimes.
+    Returns None if the column does not hold them, e.g. for naive timestamps, which to_utc_timestring takes to be
+    in the local time of the system, so they are converted row by row instead.
+    """
+    dtype = frame.schema[column]
+    if not isinstance(dtype, nw.Datetime) or dtype.time_zone is None:
+        return None
+    expr = nw.col(column).dt.convert_time_zone("UTC")
+    return frame.select(expr.dt.to_string(UTC_TIMESTRING_FORMAT))[column]
+
+
 class PriceRecordModel(BaseModel):
     startUTC: str = "2025-08-28T22:00:00"
     value: float = 82.10
@@ -31,11 +52,23 @@ class KiwattFormat(TimeseriesFormat):
 
     name = "kiwatt"
 
-    def __init__(self, source: str = "Cofy-API-Demo"):
+    def __init__(self, source: str = "Cofy-API-Demo", vectorized: bool = False):
+        """
+        Args:
+            source: The source name reported in the Kiwatt body.
+            vectorized: If True, timestamps are converted in a single frame operation and the JSON body is
+                emitted directly as a Response, skipping the per-row Pydantic models.
+        """
         super().__init__()
         self.source = source
+        self.vectorized = vectorized
 
     def format(self, timeseries: Timeseries):
+        if self.vectorized:
+            timestrings = to_utc_timestrings(timeseries.frame)
+            if timestrings is not None:
+                return self._format_vectorized(timeseries, timestrings)
+
         return ResponseModel(
             generatedAtUTC=to_utc_timestring(datetime.now(UTC)),
             periodStartUTC=to_utc_timestring(timeseries.metadata["start"]),
@@ -49,6 +82,24 @@ class KiwattFormat(TimeseriesFormat):
             ],
         )
 
+    def _format_vectorized(self, timeseries: Timeseries, timestrings: nw.Series) -> Response:
+        body = {
+            "generatedAtUTC": to_utc_timestring(datetime.now(UTC)),
+            "periodStartUTC": to_utc_timestring(timeseries.metadata["start"]),
+            "periodEndUTC": to_utc_timestring(timeseries.metadata["end"]),
+            "source": self.source,
+            "unit": timeseries.metadata["unit"],
+            "resolution": strftime(timeseries.metadata["resolution"], "P%P"),
+            # NaN is not valid JSON, emit null like the Pydantic path does
+            "prices": [
+                {"startUTC": start, "value": value if value == value else None}
+                for start, value in zip(
+                    timestrings.to_list(), timeseries.frame["value"].cast(nw.Float64).to_list(), strict=True
+                )
+            ],
+        }
+        return Response(content=json.dumps(body, separators=(",", ":")), media_type="application/json")
+
     @property
     def ReturnType(self) -> type:
         return ResponseModel
@@ -1,9 +1,15 @@
 import datetime as dt
 
 from cofy.modules.timeseries import (
+    CSVFormat,
+    JSONFormat,
+    MessagePackFormat,
+    TimeseriesFormat,
     TimeseriesModule,
 )
 
+from .sources.energy_cost_comparison import EnergyCostComparisonTariffSource
+
 
 def floor_datetime(dt_obj: dt.datetime, delta: dt.timedelta) -> dt.datetime:
     """Floor a datetime object to the nearest lower multiple of delta."""
@@ -25,3 +31,19 @@ class TariffModule(TimeseriesModule):
             "limit": 288,
             "resolution": "PT15M",
         }
+
+
+class TariffComparisonModule(TariffModule):
+    type_description: str = "Module comparing several tariffs side by side as time series."
+
+    def __init__(
+        self,
+        *,
+        source: EnergyCostComparisonTariffSource,
+        formats: list[TimeseriesFormat] | None = None,
+        **kwargs,
+    ):
+        if formats is None:
+            formats = [JSONFormat(DT=source.record_model), CSVFormat(), MessagePackFormat()]
+
+        super().__init__(source=source, formats=formats, **kwargs)
@@ -1,20 +1,69 @@
 import asyncio
 import datetime as dt
+import functools
+import threading
 from typing import Annotated
 
 import pandas as pd
 from energy_cost import CostGroup, Tariff
+from energy_cost.index import CachedIndex
 from fastapi import Query
 from isodate import Duration
 
-from cofy.modules.timeseries import ISODuration, Timeseries, TimeseriesSource
+from cofy.modules.timeseries import ISODuration, RefreshSchedule, Timeseries, TimeseriesSource
+
+_INDEX_LOCKS_LOCK = threading.Lock()
+_indexes_guarded = False
+
+
+def index_lock(index: CachedIndex) -> threading.Lock:
+    """The lock that guards the cache of a single CachedIndex, created on first use."""
+    with _INDEX_LOCKS_LOCK:
+        return index.__dict__.setdefault("_cofy_lock", threading.Lock())
+
+
+def guard_cached_indexes() -> None:
+    """Make every CachedIndex of energy_cost hold its own lock while it loads, fetches and saves its cache.
+
+    The cached indexes are not thread safe: tariffs evaluated on parallel threads would fetch the same index once per
+    thread and race on replacing its cache file. Tariffs that depend on different indexes still run in parallel.
+    Calling this more than once has no further effect.
+    """
+    global _indexes_guarded
+    with _INDEX_LOCKS_LOCK:
+        if _indexes_guarded:
+            return
+        unguarded = CachedIndex._get_values
+
+        @functools.wraps(unguarded)
+        def _get_values(self: CachedIndex, start: pd.Timestamp, end: pd.Timestamp, timezone: dt.tzinfo) -> pd.DataFrame:
+            with index_lock(self):
+                return unguarded(self, start, end, timezone)
+
+        CachedIndex._get_values = _get_values
+        _indexes_guarded = True
 
 
 class EnergyCostTariffSource(TimeseriesSource):
-    def __init__(self, yaml_config: str, cost_group: CostGroup | None = None):
+    def __init__(
+        self,
+        yaml_config: str,
+        cost_group: CostGroup | None = None,
+        refresh_schedule: RefreshSchedule | None = None,
+    ):
+        """A TimeseriesSource that computes the values of an energy_cost tariff.
+
+        Args:
+            yaml_config: Path to the energy_cost tariff configuration.
+            cost_group: The cost group to compute, if None it is exposed as a query parameter.
+            refresh_schedule: When the indexes used by the tariff are published, e.g. the schedule of an
+                EntsoeDayAheadTariffSource. If set, the cached indexes are warmed by computing the tariff.
+        """
         super().__init__()
+        guard_cached_indexes()
         self.tariff = Tariff.from_yaml(yaml_config)
         self.cost_group = cost_group
+        self._refresh_schedule = refresh_schedule
 
     async def fetch_timeseries(
         self,
@@ -44,6 +93,22 @@ class EnergyCostTariffSource(TimeseriesSource):
         df["timestamp"] = pd.to_datetime(df["timestamp"])
         return Timeseries(frame=df, metadata={"unit": "EUR/MWh"})
 
+    async def prefetch(
+        self,
+        start: dt.datetime,
+        end: dt.datetime,
+        resolution: ISODuration = dt.timedelta(minutes=15),
+        **kwargs,
+    ) -> Timeseries | None:
+        if self._refresh_schedule is None:
+            return None
+        # computing the tariff fills the caches of the energy_cost indexes it depends on
+        return await self.fetch_timeseries(start, end, resolution, **kwargs)
+
+    @property
+    def refresh_schedule(self) -> RefreshSchedule | None:
+        return self._refresh_schedule
+
     @property
     def supported_resolutions(self) -> list[str]:
         return ["PT5M", "PT15M", "PT1H", "P1D", "P7D"]
@@ -0,0 +1,115 @@
+import asyncio
+import datetime as dt
+from functools import cached_property
+from typing import Annotated
+
+import pandas as pd
+from energy_cost import CostGroup, Supplier, Tariff
+from fastapi import Query
+from isodate import Duration
+from pydantic import BaseModel, create_model
+
+from cofy.modules.timeseries import ISODuration, Timeseries, TimeseriesSource
+
+from .energy_cost import guard_cached_indexes
+
+
+class EnergyCostComparisonTariffSource(TimeseriesSource):
+    def __init__(self, tariffs: dict[str, Tariff], cost_group: CostGroup | None = None):
+        """A TimeseriesSource that evaluates several tariffs over the same window and returns them side by side.
+
+        Args:
+            tariffs: The tariffs to compare, keyed by the column name they get in the resulting frame.
+            cost_group: The cost group to evaluate, if None it is exposed as a query parameter.
+        """
+        super().__init__()
+        guard_cached_indexes()
+        if not tariffs:
+            raise ValueError("At least one tariff must be provided.")
+        self.tariffs = tariffs
+        self.cost_group = cost_group
+
+    @classmethod
+    def from_supplier(
+        cls,
+        supplier_key: str,
+        product_keys: list[str] | None = None,
+        cost_group: CostGroup | None = None,
+    ) -> "EnergyCostComparisonTariffSource":
+        """Compare the products of a registered energy_cost Supplier, optionally restricted to product_keys."""
+        products = Supplier.get(supplier_key).products
+        if product_keys is None:
+            product_keys = list(products.keys())
+        missing = [key for key in product_keys if key not in products]
+        if missing:
+            raise ValueError(f"Supplier {supplier_key} has no products: {', '.join(missing)}")
+        return cls({key: products[key] for key in product_keys}, cost_group=cost_group)
+
+    async def fetch_timeseries(
+        self,
+        start: dt.datetime,
+        end: dt.datetime,
+        resolution: ISODuration = dt.timedelta(minutes=15),
+        cost_group: CostGroup | None = None,
+        **kwargs,
+    ) -> Timeseries:
+        if isinstance(resolution, Duration):
+            raise ValueError(
+                "Resolution only support time components, not years or months, as they cannot be converted to a fixed number of seconds."
+            )
+        cost_group = cost_group or self.cost_group
+        if cost_group is None:
+            raise ValueError("Cost group must be provided.")
+
+        # every tariff is evaluated on its own worker thread, indexes are shared through the energy_cost registry and
+        # each index is only fetched once, under its own lock
+        frames = await asyncio.gather(
+            *(
+                asyncio.to_thread(
+                    tariff.get_values,
+                    start=start,
+                    end=end,
+                    output_resolution=resolution,
+                    cost_group=cost_group,
+                )
+                for tariff in self.tariffs.values()
+            )
+        )
+
+        columns = {
+            key: frame.set_index(pd.to_datetime(frame["timestamp"]))["total"]
+            for key, frame in zip(self.tariffs.keys(), frames, strict=True)
+            if frame is not None
+        }
+        if not columns:
+            raise ValueError("No tariff data available for the given parameters.")
+
+        df = pd.concat(columns, axis=1).reindex(columns=list(self.tariffs.keys()))
+        df = df.rename_axis("timestamp").reset_index()
+        return Timeseries(frame=df, metadata={"unit": "EUR/MWh"})
+
+    @cached_property
+    def record_model(self) -> type[BaseModel]:
+        """Pydantic model of a single row of the wide frame, with one value field per compared tariff."""
+        return create_model(
+            "TariffComparisonRecord",
+            timestamp=(dt.datetime, ...),
+            **{key: (float | None, None) for key in self.tariffs},
+        )
+
+    @property
+    def supported_resolutions(self) -> list[str]:
+        return ["PT5M", "PT15M", "PT1H", "P1D", "P7D"]
+
+    @property
+    def extra_args(self) -> dict:
+        result = {}
+        if self.cost_group is None:
+            result["cost_group"] = Annotated[
+                CostGroup,
+                Query(
+                    default=CostGroup.CONSUMPTION,
+                ),
+            ]
+
+        return result
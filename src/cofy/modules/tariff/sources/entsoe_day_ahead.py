@@ -1,6 +1,7 @@
 import asyncio
 import datetime as dt
 from typing import Annotated, cast
+from zoneinfo import ZoneInfo
 
 import pandas as pd
 from entsoe import EntsoePandasClient
@@ -8,7 +9,12 @@ from entsoe.exceptions import NoMatchingDataError
 from fastapi.params import Query
 from pydantic import Field
 
-from cofy.modules.timeseries import ISODuration, Timeseries, TimeseriesSource
+from cofy.modules.timeseries import ISODuration, RefreshSchedule, Timeseries, TimeseriesSource
+
+DEFAULT_COUNTRY_CODE = "BE"
+# Results of the SDAC day-ahead auction are published around 12:45 CET
+PUBLICATION_TIME = dt.time(13, 0)
+PUBLICATION_TIMEZONE = ZoneInfo("Europe/Brussels")
 
 
 class EntsoeDayAheadTariffSource(TimeseriesSource):
@@ -19,6 +25,12 @@ class EntsoeDayAheadTariffSource(TimeseriesSource):
 
         self.country_code = country_code
         self.client = EntsoePandasClient(api_key=api_key)
+        self._refresh_schedule = RefreshSchedule(
+            publish_time=PUBLICATION_TIME,
+            timezone=PUBLICATION_TIMEZONE,
+            resolution=dt.timedelta(minutes=15),
+            kwargs={} if country_code is not None else {"country_code": DEFAULT_COUNTRY_CODE},
+        )
 
     async def fetch_timeseries(
         self,
@@ -51,6 +63,10 @@ class EntsoeDayAheadTariffSource(TimeseriesSource):
         df["timestamp"] = pd.to_datetime(df["timestamp"])
         return Timeseries(frame=df, metadata={"unit": "EUR/MWh"})
 
+    @property
+    def refresh_schedule(self) -> RefreshSchedule:
+        return self._refresh_schedule
+
     @property
     def supported_resolutions(self) -> list[str]:
         return ["PT15M"]
@@ -63,6 +79,6 @@ class EntsoeDayAheadTariffSource(TimeseriesSource):
         return {
             "country_code": Annotated[
                 str,
-                Field(Query(default="BE", description="Country code for ENTSOE")),
+                Field(Query(default=DEFAULT_COUNTRY_CODE, description="Country code for ENTSOE")),
             ]
         }
@@ -1,16 +1,23 @@
 from .format import TimeseriesFormat
 from .formats.csv import CSVFormat
 from .formats.json import DefaultDataType, DefaultMetadataType, JSONFormat
+from .formats.msgpack import MessagePackFormat
 from .model import ISODuration, Timeseries
 from .module import TimeseriesModule
+from .scheduler import PrefetchScheduler, RefreshSchedule
 from .source import TimeseriesSource
+from .sources.cached import CachedTimeseriesSource
 
 __all__ = [
+    "CachedTimeseriesSource",
     "CSVFormat",
     "DefaultDataType",
     "DefaultMetadataType",
     "ISODuration",
     "JSONFormat",
+    "MessagePackFormat",
+    "PrefetchScheduler",
+    "RefreshSchedule",
     "Timeseries",
     "TimeseriesFormat",
     "TimeseriesModule",
@@ -1,5 +1,6 @@
 import datetime as dt
-from typing import Annotated
+from collections.abc import Callable, Coroutine, Hashable
+from typing import Annotated, Any
 
 from fastapi import Depends, Query, Request
 from fastapi.exceptions import RequestValidationError
@@ -11,7 +12,9 @@ from cofy import Module
 from .format import TimeseriesFormat
 from .formats.csv import CSVFormat
 from .formats.json import JSONFormat
+from .formats.msgpack import MessagePackFormat
 from .model import ISODuration
+from .scheduler import PrefetchScheduler
 from .source import TimeseriesSource
 
 
@@ -38,6 +41,7 @@ class TimeseriesModule(Module):
             else [
                 JSONFormat(),
                 CSVFormat(),
+                MessagePackFormat(),
             ]
         )
         self._extra_args = extra_args or source.extra_args
@@ -51,6 +55,17 @@ class TimeseriesModule(Module):
         for i, format in enumerate(self.formats):
             self.create_format_endpoint(format, default=(i == 0))
 
+    @property
+    def lifespan_tasks(self) -> dict[Hashable, Callable[[], Coroutine[Any, Any, None]]]:
+        tasks = dict(self.source.lifespan_tasks)
+        schedule = self.source.refresh_schedule
+        # a source that does not override prefetch has no cache to warm
+        if schedule is not None and type(self.source).prefetch is not TimeseriesSource.prefetch:
+            # keyed by source and schedule, so modules wrapping the same source only prefetch it once,
+            # while sources sharing a schedule (e.g. a tariff on ENTSO-E prices) are each prefetched
+            tasks[self.source, schedule] = PrefetchScheduler(self.source, schedule).run
+        return tasks
+
     @property
     def DynamicParameters(self):
         return create_model("DynamicParameters", **self._extra_args)
@@ -0,0 +1,108 @@
+import asyncio
+import datetime as dt
+import logging
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+
+import narwhals as nw
+
+from .model import Timeseries
+
+if TYPE_CHECKING:
+    from .source import TimeseriesSource
+
+LOGGER = logging.getLogger(__name__)
+
+
+class RefreshSchedule:
+    """Describes when the upstream data of a source is published.
+
+    Every day at `publish_time` (in `timezone`) data for the next `horizon_days` local days becomes available.
+    Until it has appeared, the source is polled every `poll_interval`.
+    """
+
+    def __init__(
+        self,
+        publish_time: dt.time,
+        timezone: dt.tzinfo,
+        resolution: dt.timedelta,
+        poll_interval: dt.timedelta = dt.timedelta(minutes=5),
+        horizon_days: int = 1,
+        kwargs: dict | None = None,
+    ):
+        self.publish_time = publish_time
+        self.timezone = timezone
+        self.resolution = resolution
+        self.poll_interval = poll_interval
+        self.horizon_days = horizon_days
+        self.kwargs = kwargs or {}
+
+    def _local_midnight(self, now: dt.datetime, days: int = 0) -> dt.datetime:
+        date = now.astimezone(self.timezone).date() + dt.timedelta(days=days)
+        return dt.datetime.combine(date, dt.time(0), tzinfo=self.timezone)
+
+    def publication(self, now: dt.datetime) -> dt.datetime:
+        """The publication moment of the current local day."""
+        date = now.astimezone(self.timezone).date()
+        return dt.datetime.combine(date, self.publish_time, tzinfo=self.timezone)
+
+    def next_publication(self, now: dt.datetime) -> dt.datetime:
+        """The first publication moment strictly after now."""
+        publication = self.publication(now)
+        if now < publication:
+            return publication
+        return dt.datetime.combine(publication.date() + dt.timedelta(days=1), self.publish_time, tzinfo=self.timezone)
+
+    def window(self, now: dt.datetime) -> tuple[dt.datetime, dt.datetime]:
+        """The window that should be warm at now: today, plus the published horizon once the publication passed."""
+        days = 1 + (self.horizon_days if now >= self.publication(now) else 0)
+        return self._local_midnight(now), self._local_midnight(now, days)
+
+
+class PrefetchScheduler:
+    def __init__(
+        self,
+        source: "TimeseriesSource",
+        schedule: RefreshSchedule,
+        now: Callable[[], dt.datetime] = lambda: dt.datetime.now(dt.UTC),
+    ):
+        """Keeps the caches of a source warm according to its refresh schedule.
+
+        Args:
+            source: The source to prefetch, see TimeseriesSource.prefetch.
+            schedule: When to prefetch, usually source.refresh_schedule.
+            now: Clock used to plan the next run, can be overridden for testing.
+        """
+        self.source = source
+        self.schedule = schedule
+        self.now = now
+
+    async def run(self) -> None:
+        """Prefetch until cancelled, or until the source reports it has nothing to warm."""
+        while (delay := await self.tick()) is not None:
+            await asyncio.sleep(delay.total_seconds())
+
+    async def tick(self) -> dt.timedelta | None:
+        """Prefetch the current window once and return how long to wait before the next tick."""
+        now = self.now()
+        start, end = self.schedule.window(now)
+        try:
+            timeseries = await self.source.prefetch(start, end, self.schedule.resolution, **self.schedule.kwargs)
+        except Exception:
+            LOGGER.exception("Failed to prefetch %s between %s and %s", type(self.source).__name__, start, end)
+            return self.schedule.poll_interval
+
+        if timeseries is None:
+            LOGGER.info("%s has nothing to prefetch, stopping its scheduler", type(self.source).__name__)
+            return None
+
+        if now >= self.schedule.publication(now) and not self._is_complete(timeseries, end):
+            LOGGER.debug("Data until %s is not published yet, polling again in %s", end, self.schedule.poll_interval)
+            return self.schedule.poll_interval
+        return self.schedule.next_publication(now) - now
+
+    def _is_complete(self, timeseries: Timeseries, end: dt.datetime) -> bool:
+        if len(timeseries.frame) == 0:
+            return False
+        last = timeseries.frame.select(nw.col("timestamp").max()).item()
+        return last >= end - self.schedule.resolution
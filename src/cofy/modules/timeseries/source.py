@@ -1,7 +1,10 @@
 import datetime as dt
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Coroutine, Hashable
+from typing import Any
 
 from .model import ISODuration, Timeseries
+from .scheduler import RefreshSchedule
 
 
 class TimeseriesSource(ABC):
@@ -15,6 +18,26 @@ class TimeseriesSource(ABC):
     ) -> Timeseries:
         """Fetch timeseries data between start and end datetimes with the given resolution."""
 
+    async def prefetch(
+        self,
+        start: dt.datetime,
+        end: dt.datetime,
+        resolution: ISODuration,
+        **kwargs,
+    ) -> Timeseries | None:
+        """Refresh any cached data between start and end and return it. Returns None if the source has no cache to warm."""
+        return None
+
+    @property
+    def refresh_schedule(self) -> RefreshSchedule | None:
+        """Optionally declare when the upstream data of this source is published, so its caches can be kept warm."""
+        return None
+
+    @property
+    def lifespan_tasks(self) -> dict[Hashable, Callable[[], Coroutine[Any, Any, None]]]:
+        """Optionally declare long running tasks the source needs while the app is up, e.g. syncing a local store."""
+        return {}
+
     @property
     def supported_resolutions(self) -> list[str]:
         """Optionally specify supported resolutions for this source, e.g. ["PT15M", "P1D"]. If empty, all resolutions are supported."""
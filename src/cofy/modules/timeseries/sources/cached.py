@@ -0,0 +1,162 @@
+import datetime as dt
+from collections import OrderedDict
+from collections.abc import Callable, Coroutine, Hashable
+from typing import Any
+
+import narwhals as nw
+
+from ..model import ISODuration, Timeseries
+from ..scheduler import RefreshSchedule
+from ..source import TimeseriesSource
+
+EPOCH = dt.datetime(1970, 1, 1, tzinfo=dt.UTC)
+
+
+def to_utc(value: dt.datetime) -> dt.datetime:
+    return value.astimezone(dt.UTC) if value.tzinfo is not None else value.replace(tzinfo=dt.UTC)
+
+
+def slice_frame(frame: nw.DataFrame, start: dt.datetime, end: dt.datetime) -> nw.DataFrame:
+    """Return the rows of frame with start <= timestamp < end."""
+    if len(frame) == 0:
+        return frame
+    return frame.filter((nw.col("timestamp") >= start) & (nw.col("timestamp") < end))
+
+
+class CachedTimeseriesSource(TimeseriesSource):
+    def __init__(
+        self,
+        source: TimeseriesSource,
+        ttl: dt.timedelta | None = dt.timedelta(hours=1),
+        block_size: dt.timedelta = dt.timedelta(days=1),
+        max_blocks: int = 1024,
+    ):
+        """A TimeseriesSource that caches the data of another source in fixed, UTC aligned blocks.
+
+        Requests are served from the cached blocks and only the missing or expired blocks are fetched upstream,
+        contiguous blocks in a single call. The requested window is sliced out locally.
+
+        Args:
+            source: The underlying TimeseriesSource to fetch data from.
+            ttl: How long a block stays fresh, None means blocks never expire.
+            block_size: The size of a cached block, resolutions that do not divide it bypass the cache.
+            max_blocks: The maximum number of blocks to keep, the least recently used blocks are evicted first.
+        """
+        self.source = source
+        self.ttl = ttl
+        self.block_size = block_size
+        self.max_blocks = max_blocks
+        self._blocks: OrderedDict[tuple[Hashable, dt.datetime], tuple[dt.datetime, Timeseries]] = OrderedDict()
+
+    async def fetch_timeseries(
+        self,
+        start: dt.datetime,
+        end: dt.datetime,
+        resolution: ISODuration,
+        **kwargs,
+    ) -> Timeseries:
+        key = self._cache_key(resolution, kwargs)
+        if key is None or start >= end:
+            return await self.source.fetch_timeseries(start, end, resolution, **kwargs)
+        return await self._fetch(key, start, end, resolution, kwargs, refresh=False)
+
+    async def prefetch(
+        self,
+        start: dt.datetime,
+        end: dt.datetime,
+        resolution: ISODuration,
+        **kwargs,
+    ) -> Timeseries | None:
+        key = self._cache_key(resolution, kwargs)
+        if key is None or start >= end:
+            return None
+        return await self._fetch(key, start, end, resolution, kwargs, refresh=True)
+
+    def clear(self) -> None:
+        """Drop all cached blocks."""
+        self._blocks.clear()
+
+    async def _fetch(
+        self,
+        key: Hashable,
+        start: dt.datetime,
+        end: dt.datetime,
+        resolution: ISODuration,
+        kwargs: dict,
+        refresh: bool,
+    ) -> Timeseries:
+        now = dt.datetime.now(dt.UTC)
+        block_starts = self._block_starts(to_utc(start), to_utc(end))
+
+        blocks: dict[dt.datetime, Timeseries] = {}
+        missing: list[dt.datetime] = []
+        for block_start in block_starts:
+            cached = self._blocks.get((key, block_start))
+            if refresh or cached is None or (self.ttl is not None and now - cached[0] >= self.ttl):
+                missing.append(block_start)
+            else:
+                self._blocks.move_to_end((key, block_start))
+                blocks[block_start] = cached[1]
+
+        for run in self._contiguous_runs(missing):
+            run_end = run[-1] + self.block_size
+            timeseries = await self.source.fetch_timeseries(run[0], run_end, resolution, **kwargs)
+            for block_start in run:
+                block = Timeseries(
+                    frame=slice_frame(timeseries.frame, block_start, block_start + self.block_size),
+                    metadata=dict(timeseries.metadata),
+                )
+                blocks[block_start] = block
+                self._blocks[(key, block_start)] = (now, block)
+                self._blocks.move_to_end((key, block_start))
+
+        while len(self._blocks) > self.max_blocks:
+            self._blocks.popitem(last=False)
+
+        ordered = [blocks[block_start] for block_start in block_starts]
+        frames = [block.frame for block in ordered if len(block.frame) > 0]
+        frame = nw.concat(frames, how="vertical") if len(frames) > 1 else frames[0] if frames else ordered[0].frame
+        return Timeseries(frame=slice_frame(frame, start, end), metadata=dict(ordered[0].metadata))
+
+    def _cache_key(self, resolution: ISODuration, kwargs: dict) -> Hashable | None:
+        if not isinstance(resolution, dt.timedelta) or self.block_size % resolution:
+            return None
+        key = (resolution, tuple(sorted(kwargs.items())))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def _block_starts(self, start: dt.datetime, end: dt.datetime) -> list[dt.datetime]:
+        block_start = EPOCH + ((start - EPOCH) // self.block_size) * self.block_size
+        starts = []
+        while block_start < end:
+            starts.append(block_start)
+            block_start += self.block_size
+        return starts
+
+    def _contiguous_runs(self, block_starts: list[dt.datetime]) -> list[list[dt.datetime]]:
+        runs: list[list[dt.datetime]] = []
+        for block_start in block_starts:
+            if runs and runs[-1][-1] + self.block_size == block_start:
+                runs[-1].append(block_start)
+            else:
+                runs.append([block_start])
+        return runs
+
+    @property
+    def refresh_schedule(self) -> RefreshSchedule | None:
+        return self.source.refresh_schedule
+
+    @property
+    def lifespan_tasks(self) -> dict[Hashable, Callable[[], Coroutine[Any, Any, None]]]:
+        return self.source.lifespan_tasks
+
+    @property
+    def supported_resolutions(self) -> list[str]:
+        return self.source.supported_resolutions
+
+    @property
+    def extra_args(self) -> dict:
+        return self.source.extra_args
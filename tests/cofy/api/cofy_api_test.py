@@ -1,4 +1,9 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.testclient import TestClient
 
 from cofy import CofyAPI
@@ -120,3 +125,84 @@ class TestCofyAPIModuleRegistration:
         response = client.get(f"/api/v1{self.module.prefix}/hello")
         assert response.status_code == 200
         assert response.text == '"Hello from DummyModule test_module"'
+
+
+class LifespanModule(DummyModule):
+    def __init__(self, name: str, events: list[str], key: str):
+        self.events = events
+        self.key = key
+        super().__init__(name)
+
+    @property
+    def lifespan_tasks(self):
+        async def task():
+            self.events.append(f"start:{self.name}")
+            try:
+                await asyncio.Event().wait()
+            finally:
+                self.events.append(f"stop:{self.name}")
+
+        return {self.key: task}
+
+
+class TestCofyAPILifespan:
+    def test_lifespan_tasks_run_while_app_is_up(self):
+        events: list[str] = []
+        cofy = CofyAPI()
+        cofy.register_module(LifespanModule("a", events, key="a"))
+
+        with TestClient(cofy) as client:
+            client.get("/health")
+            assert events == ["start:a"]
+        assert events == ["start:a", "stop:a"]
+
+    def test_shared_lifespan_tasks_run_once(self):
+        events: list[str] = []
+        cofy = CofyAPI()
+        cofy.register_module(LifespanModule("a", events, key="shared"))
+        cofy.register_module(LifespanModule("b", events, key="shared"))
+
+        assert len(cofy.lifespan_tasks) == 1
+        with TestClient(cofy) as client:
+            client.get("/health")
+        assert events == ["start:a", "stop:a"]
+
+    def test_user_lifespan_is_preserved(self):
+        events: list[str] = []
+
+        @asynccontextmanager
+        async def lifespan(app):
+            events.append("user:start")
+            yield {"answer": 42}
+            events.append("user:stop")
+
+        cofy = CofyAPI(lifespan=lifespan)
+        cofy.add_route("/state", lambda request: JSONResponse({"answer": request.state.answer}))
+
+        with TestClient(cofy) as client:
+            assert client.get("/state").json() == {"answer": 42}
+        assert events == ["user:start", "user:stop"]
+
+    @pytest.mark.filterwarnings("ignore:\\s*on_event is deprecated:DeprecationWarning")
+    def test_event_handlers_still_run(self):
+        events: list[str] = []
+        cofy = CofyAPI(on_shutdown=[lambda: events.append("shutdown:argument")])
+        cofy.register_module(LifespanModule("a", events, key="a"))
+
+        @cofy.on_event("startup")
+        async def startup():
+            events.append("startup")
+
+        @cofy.on_event("shutdown")
+        def shutdown():
+            events.append("shutdown")
+
+        with TestClient(cofy) as client:
+            client.get("/health")
+            assert events == ["startup", "start:a"]
+        assert events == ["startup", "start:a", "stop:a", "shutdown:argument", "shutdown"]
+
+    def test_modules_without_lifespan_tasks(self):
+        cofy = CofyAPI()
+        cofy.register_module(DummyModule("plain"))
+        assert cofy.lifespan_tasks == {}
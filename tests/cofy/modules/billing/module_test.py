@@ -78,6 +78,12 @@ class TestBillingModuleMetadata:
     def test_has_type_description(self):
         assert self.module.type_description
 
+    def test_guards_cached_indexes(self):
+        # contracts share the cached indexes of energy_cost with the tariff sources, under the same per index locks
+        with patch("cofy.modules.billing.module.guard_cached_indexes") as guard:
+            BillingModule()
+        guard.assert_called_once_with()
+
 
 # ── POST endpoint ─────────────────────────────────────────────────────────
 
@@ -0,0 +1,76 @@
+import narwhals as nw
+import pandas as pd
+import polars as pl
+import pytest
+
+from cofy.modules.directive import Classifier
+
+VALUES = [-5.0, 0.0, 5.0, 12.0, None, 100.0]
+
+
+@pytest.mark.parametrize("backend", [pd.DataFrame, pl.DataFrame])
+def test_classify_fixed_boundaries(backend):
+    classifier = Classifier([0, 10], labels=["low", "mid", "high"])
+    frame = nw.from_native(backend({"value": VALUES}))
+
+    result = classifier.classify(frame)
+
+    assert result["value"].to_list() == ["low", "low", "mid", "high", "low", "high"]
+
+
+def test_classify_reversed():
+    classifier = Classifier([0, 10], labels=["low", "mid", "high"], reverse=True)
+    frame = nw.from_native(pl.DataFrame({"value": VALUES}))
+
+    assert classifier.classify(frame)["value"].to_list() == ["high", "high", "mid", "low", "high", "low"]
+
+
+def test_classify_defaults_to_directive_steps():
+    classifier = Classifier([0, 10, 20, 30])
+    frame = nw.from_native(pl.DataFrame({"price": [-1.0, 5.0, 15.0, 25.0, 35.0]}))
+
+    assert classifier.classify(frame, "price")["price"].to_list() == ["--", "-", "0", "+", "++"]
+
+
+@pytest.mark.parametrize("backend", [pd.DataFrame, pl.DataFrame])
+def test_classify_per_row_and_fixed_boundaries(backend):
+    classifier = Classifier([0, "b", 50], labels=["a", "b", "c", "d"])
+    frame = nw.from_native(backend({"value": [-1.0, 5.0, 15.0, 60.0], "b": [10.0, 10.0, 10.0, 20.0]}))
+
+    result = classifier.classify(frame)
+
+    assert result["value"].to_list() == ["a", "b", "c", "d"]
+    assert result["b"].to_list() == [10.0, 10.0, 10.0, 20.0]
+
+
+def test_classify_rejects_descending_row_boundaries():
+    classifier = Classifier(["b0", "b1"], labels=["a", "b", "c"])
+    frame = nw.from_native(pl.DataFrame({"value": [1.0, 2.0], "b0": [0.0, 5.0], "b1": [1.0, 4.0]}))
+
+    with pytest.raises(ValueError, match=r"ascending order \(b0 ≤ b1\)"):
+        classifier.classify(frame)
+
+
+def test_single_row_boundary_needs_no_validation():
+    classifier = Classifier(["b"], labels=["a", "b"])
+    frame = nw.from_native(pl.DataFrame({"value": [1.0, 2.0], "b": [1.5, 1.5]}))
+
+    assert classifier.classify(frame)["value"].to_list() == ["a", "b"]
+
+
+def test_expression_is_compiled_once():
+    classifier = Classifier([0, 10, 20, 30])
+    assert classifier.expr() is classifier.expr()
+
+
+@pytest.mark.parametrize(
+    ("boundaries", "labels", "message"),
+    [
+        ([], ["a"], "At least one boundary"),
+        ([0, 10], ["a", "b"], "Expected 3 labels for 2 boundaries, got 2"),
+        ([10, 0], ["a", "b", "c"], "ascending order"),
+    ],
+)
+def test_invalid_configuration(boundaries, labels, message):
+    with pytest.raises(ValueError, match=message):
+        Classifier(boundaries, labels=labels)
@@ -0,0 +1,79 @@
+import datetime as dt
+
+import pandas as pd
+import polars as pl
+import pytest
+from isodate import Duration
+
+from cofy.modules.directive import DirectiveRLEFormat
+from cofy.modules.timeseries import Timeseries
+
+START = dt.datetime(2026, 1, 1, tzinfo=dt.UTC)
+QUARTER = dt.timedelta(minutes=15)
+
+
+def _timeseries(backend, values, resolution=QUARTER, skip=()):
+    rows = [(START + i * QUARTER, value) for i, value in enumerate(values) if i not in skip]
+    frame = backend({"timestamp": [row[0] for row in rows], "value": [row[1] for row in rows]})
+    return Timeseries(frame=frame, metadata={"resolution": resolution, "start": START, "unit": "directive"})
+
+
+@pytest.mark.parametrize("backend", [pd.DataFrame, pl.DataFrame])
+def test_consecutive_values_are_collapsed(backend):
+    timeseries = _timeseries(backend, ["0", "0", "0", "+", "+", "0", "--", "--"])
+
+    result = DirectiveRLEFormat().format(timeseries)
+
+    assert [(s.start, s.end, s.value) for s in result.data] == [
+        (START, START + 3 * QUARTER, "0"),
+        (START + 3 * QUARTER, START + 5 * QUARTER, "+"),
+        (START + 5 * QUARTER, START + 6 * QUARTER, "0"),
+        (START + 6 * QUARTER, START + 8 * QUARTER, "--"),
+    ]
+    assert result.metadata.format == "json"
+
+
+def test_runs_end_at_gaps():
+    timeseries = _timeseries(pl.DataFrame, ["+", "+", "+", "+"], skip={2})
+
+    result = DirectiveRLEFormat().format(timeseries)
+
+    assert [(s.start, s.end) for s in result.data] == [
+        (START, START + 2 * QUARTER),
+        (START + 3 * QUARTER, START + 4 * QUARTER),
+    ]
+
+
+def test_unsorted_frames_are_sorted_first():
+    frame = pl.DataFrame({"timestamp": [START + QUARTER, START], "value": ["-", "-"]})
+    timeseries = Timeseries(frame=frame, metadata={"resolution": QUARTER})
+
+    result = DirectiveRLEFormat().format(timeseries)
+
+    assert [(s.start, s.end, s.value) for s in result.data] == [(START, START + 2 * QUARTER, "-")]
+
+
+def test_calendar_resolutions_use_calendar_ends():
+    frame = pl.DataFrame({"timestamp": [START, dt.datetime(2026, 2, 1, tzinfo=dt.UTC)], "value": ["0", "0"]})
+    timeseries = Timeseries(frame=frame, metadata={"resolution": Duration(months=1)})
+
+    result = DirectiveRLEFormat().format(timeseries)
+
+    assert [(s.start, s.end) for s in result.data] == [(START, dt.datetime(2026, 3, 1, tzinfo=dt.UTC))]
+
+
+def test_empty_frame_has_no_segments():
+    frame = pl.DataFrame(
+        {"timestamp": [], "value": []}, schema={"timestamp": pl.Datetime("us", "UTC"), "value": pl.String}
+    )
+    result = DirectiveRLEFormat().format(Timeseries(frame=frame, metadata={"resolution": QUARTER}))
+    assert result.data == []
+
+
+def test_custom_labels():
+    timeseries = _timeseries(pl.DataFrame, ["off", "on", "on"])
+
+    result = DirectiveRLEFormat(labels=("off", "on")).format(timeseries)
+
+    assert [s.value for s in result.data] == ["off", "on"]
+    assert DirectiveRLEFormat().name == "rle"
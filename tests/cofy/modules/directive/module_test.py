@@ -3,7 +3,15 @@ import datetime as dt
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
-from cofy.modules.directive import DirectiveFormat, DirectiveModule, DirectiveSource
+from cofy.modules.directive import (
+    DirectiveFormat,
+    DirectiveModule,
+    DirectiveProfilesModule,
+    DirectiveRLEFormat,
+    DirectiveSource,
+    ProfileDirectiveSource,
+)
+from cofy.modules.timeseries import MessagePackFormat
 
 from ..timeseries.dummy_source import DummyTimeseriesSource
 
@@ -15,8 +23,10 @@ def test_directivemodule_type_property():
 
 def test_formats_default():
     module = DirectiveModule(source=DirectiveSource(DummyTimeseriesSource(), boundaries=(5, 15, 25, 35)))
-    assert len(module.formats) == 1
+    assert len(module.formats) == 3
     assert isinstance(module.formats[0], DirectiveFormat)
+    assert isinstance(module.formats[1], DirectiveRLEFormat)
+    assert isinstance(module.formats[2], MessagePackFormat)
 
 
 def test_api_endpoint_returns_directives():
@@ -43,3 +53,47 @@ def test_api_endpoint_returns_directives():
     assert payload["metadata"]["format"] == "json"
     assert payload["metadata"]["resolution"] == "PT1H"
     assert [entry["value"] for entry in payload["data"]] == ["--", "-", "0"]
+
+
+def test_profiles_module_selects_profiles_by_query():
+    start = dt.datetime(2026, 1, 1, 0, 0, tzinfo=dt.UTC)
+    end = dt.datetime(2026, 1, 1, 3, 0, tzinfo=dt.UTC)
+    module = DirectiveProfilesModule(
+        source=ProfileDirectiveSource(DummyTimeseriesSource(), {"heat_pump": (0, 10, 20, 30), "ev": (15, 25, 35, 45)}),
+    )
+
+    app = FastAPI()
+    app.include_router(module)
+    client = TestClient(app)
+    params = {"start": start.isoformat(), "end": end.isoformat()}
+
+    payload = client.get(module.prefix, params=params).json()
+    assert [(entry["heat_pump"], entry["ev"], entry["value"]) for entry in payload["data"]] == [
+        ("--", "--", None),
+        ("-", "--", None),
+        ("0", "-", None),
+    ]
+
+    payload = client.get(module.prefix, params={**params, "profile": "ev"}).json()
+    assert [entry["value"] for entry in payload["data"]] == ["--", "--", "-"]
+
+    assert client.get(module.prefix, params={**params, "profile": "boiler"}).status_code == 422
+
+
+def test_api_rle_endpoint_returns_segments():
+    start = dt.datetime(2026, 1, 1, 0, 0, tzinfo=dt.UTC)
+    module = DirectiveModule(source=DirectiveSource(DummyTimeseriesSource(), boundaries=(15, 25, 35, 45)))
+
+    app = FastAPI()
+    app.include_router(module)
+    client = TestClient(app)
+
+    # DummyTimeseriesSource: values 0, 10, 20, 30
+    response = client.get(f"{module.prefix}.rle", params={"start": start.isoformat(), "limit": 4})
+
+    assert response.status_code == 200
+    assert response.json()["data"] == [
+        {"start": "2026-01-01T00:00:00Z", "end": "2026-01-01T02:00:00Z", "value": "--"},
+        {"start": "2026-01-01T02:00:00Z", "end": "2026-01-01T03:00:00Z", "value": "-"},
+        {"start": "2026-01-01T03:00:00Z", "end": "2026-01-01T04:00:00Z", "value": "0"},
+    ]
@@ -2,7 +2,9 @@ import datetime as dt
 
 import pytest
 
-from cofy.modules.directive import DirectiveSource
+from cofy.modules.directive import DirectiveFormat, DirectiveSource
+from cofy.modules.tariff import EntsoeDayAheadTariffSource
+from cofy.modules.timeseries import CachedTimeseriesSource
 
 from ...timeseries.dummy_source import DummyTimeseriesSource
 
@@ -47,3 +49,53 @@ def test_supported_resolutions_and_extra_args_are_forwarded():
 
     assert source.supported_resolutions == wrapped.supported_resolutions
     assert source.extra_args == wrapped.extra_args
+
+
+@pytest.mark.asyncio
+async def test_prefetch_is_forwarded_and_mapped():
+    source = DirectiveSource(CachedTimeseriesSource(DummyTimeseriesSource()), boundaries=(0, 10, 20, 40))
+
+    result = await source.prefetch(
+        dt.datetime(2026, 1, 1, 0, 0, tzinfo=dt.UTC),
+        dt.datetime(2026, 1, 1, 3, 0, tzinfo=dt.UTC),
+        dt.timedelta(hours=1),
+    )
+
+    assert result is not None
+    assert [row["value"] for row in result.to_arr()] == ["--", "-", "0"]
+
+
+@pytest.mark.asyncio
+async def test_prefetch_without_cache_returns_none():
+    source = DirectiveSource(DummyTimeseriesSource(), boundaries=(0, 10, 20, 40))
+
+    result = await source.prefetch(
+        dt.datetime(2026, 1, 1, 0, 0, tzinfo=dt.UTC),
+        dt.datetime(2026, 1, 1, 3, 0, tzinfo=dt.UTC),
+        dt.timedelta(hours=1),
+    )
+
+    assert result is None
+
+
+def test_refresh_schedule_is_forwarded():
+    wrapped = EntsoeDayAheadTariffSource(api_key="key")
+    source = DirectiveSource(CachedTimeseriesSource(wrapped), boundaries=(5, 15, 25, 35))
+
+    assert source.refresh_schedule is wrapped.refresh_schedule
+    assert source.lifespan_tasks == {}
+
+
+@pytest.mark.asyncio
+async def test_fetch_timeseries_with_custom_levels():
+    source = DirectiveSource(DummyTimeseriesSource(), boundaries=(15,), labels=("off", "on"))
+
+    result = await source.fetch_timeseries(
+        dt.datetime(2026, 1, 1, 0, 0, tzinfo=dt.UTC),
+        dt.datetime(2026, 1, 1, 5, 0, tzinfo=dt.UTC),
+        dt.timedelta(hours=1),
+    )
+
+    assert [row["value"] for row in result.to_arr()] == ["off", "off", "on", "on", "on"]
+    formatted = DirectiveFormat(labels=source.classifier.labels).format(result)
+    assert [record.value for record in formatted.data] == ["off", "off", "on", "on", "on"]
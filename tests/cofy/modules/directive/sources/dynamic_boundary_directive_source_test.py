@@ -2,9 +2,10 @@ import datetime as dt
 
 import pandas as pd
 import pytest
+from isodate import Duration
 
 from cofy.modules.directive import DynamicBoundaryDirectiveSource
-from cofy.modules.timeseries import ISODuration, Timeseries, TimeseriesSource
+from cofy.modules.timeseries import CachedTimeseriesSource, ISODuration, RefreshSchedule, Timeseries, TimeseriesSource
 
 from ...timeseries.dummy_source import DummyTimeseriesSource
 
@@ -95,6 +96,23 @@ async def test_fetch_timeseries_reversed():
     assert [row["value"] for row in result.to_arr()] == ["++", "+", "0", "-", "--"]
 
 
+@pytest.mark.asyncio
+async def test_fetch_timeseries_with_custom_boundary_columns():
+    # DummyTimeseriesSource: values 0, 10, 20
+    boundary_source = DummyBoundarySource(boundaries=[(5, 15, 25, 35)] * 3)
+    source = DynamicBoundaryDirectiveSource(
+        DummyTimeseriesSource(), boundary_source, boundary_columns=("b1",), labels=("off", "on")
+    )
+
+    result = await source.fetch_timeseries(
+        dt.datetime(2026, 1, 1, 0, 0, tzinfo=dt.UTC),
+        dt.datetime(2026, 1, 1, 3, 0, tzinfo=dt.UTC),
+        dt.timedelta(hours=1),
+    )
+
+    assert [row["value"] for row in result.to_arr()] == ["off", "off", "on"]
+
+
 @pytest.mark.asyncio
 async def test_raises_value_error_when_boundaries_are_not_ascending():
     boundary_source = DummyBoundarySource(
@@ -210,3 +228,159 @@ def test_extra_args_boundary_only():
     source = DynamicBoundaryDirectiveSource(signal, boundary)
 
     assert source.extra_args == {"b": float}
+
+
+@pytest.mark.asyncio
+async def test_prefetch_warms_signal_and_fetches_uncached_boundaries():
+    boundary_source = DummyBoundarySource(boundaries=[(5, 15, 25, 35)] * 3)
+    source = DynamicBoundaryDirectiveSource(CachedTimeseriesSource(DummyTimeseriesSource()), boundary_source)
+
+    result = await source.prefetch(
+        dt.datetime(2026, 1, 1, 0, 0, tzinfo=dt.UTC),
+        dt.datetime(2026, 1, 1, 3, 0, tzinfo=dt.UTC),
+        dt.timedelta(hours=1),
+    )
+
+    assert result is not None
+    assert [row["value"] for row in result.to_arr()] == ["--", "-", "0"]
+
+
+@pytest.mark.asyncio
+async def test_prefetch_without_signal_cache_returns_none():
+    source = DynamicBoundaryDirectiveSource(DummyTimeseriesSource(), DummyBoundarySource(boundaries=[]))
+
+    result = await source.prefetch(
+        dt.datetime(2026, 1, 1, 0, 0, tzinfo=dt.UTC),
+        dt.datetime(2026, 1, 1, 3, 0, tzinfo=dt.UTC),
+        dt.timedelta(hours=1),
+    )
+
+    assert result is None
+
+
+def test_refresh_schedule_follows_signal_source():
+    schedule = RefreshSchedule(dt.time(13), dt.UTC, dt.timedelta(hours=1))
+
+    class ScheduledSource(ConfigurableSource):
+        @property
+        def refresh_schedule(self):
+            return schedule
+
+    source = DynamicBoundaryDirectiveSource(ScheduledSource(), ConfigurableSource())
+
+    assert source.refresh_schedule is schedule
+
+
+def test_lifespan_tasks_of_both_sources_are_merged():
+    class SyncingSource(ConfigurableSource):
+        def __init__(self, key):
+            super().__init__()
+            self.key = key
+
+        @property
+        def lifespan_tasks(self):
+            return {self.key: self.sync}
+
+        async def sync(self):
+            pass
+
+    signal, boundary = SyncingSource("signal"), SyncingSource("boundary")
+    source = DynamicBoundaryDirectiveSource(signal, boundary)
+
+    assert source.lifespan_tasks == {"signal": signal.sync, "boundary": boundary.sync}
+
+
+class DailyBoundarySource(TimeseriesSource):
+    """Returns one row of boundaries per day in the window, shifted up by 100 every day, and records its calls."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def fetch_timeseries(self, start, end, resolution, **kwargs):
+        self.calls.append((start, end, resolution))
+        days = pd.date_range(start, end, freq="D", inclusive="left")
+        data = [
+            {"timestamp": day, "b0": 5 + 100 * i, "b1": 15 + 100 * i, "b2": 25 + 100 * i, "b3": 35 + 100 * i}
+            for i, day in enumerate(days)
+        ]
+        return Timeseries(frame=pd.DataFrame(data), metadata={})
+
+
+@pytest.mark.asyncio
+async def test_coarse_boundaries_are_joined_backward():
+    boundary_source = DailyBoundarySource()
+    source = DynamicBoundaryDirectiveSource(
+        DummyTimeseriesSource(), boundary_source, boundary_resolution=dt.timedelta(days=1)
+    )
+    start = dt.datetime(2026, 1, 2, 22, 0, tzinfo=dt.UTC)
+
+    # DummyTimeseriesSource: values 0, 10, 20, 30 at 22:00, 23:00, 00:00 and 01:00
+    result = await source.fetch_timeseries(start, start + dt.timedelta(hours=4), dt.timedelta(hours=1))
+
+    # the boundaries of the first of January are 5..35, those of the second are shifted by 100
+    assert [row["value"] for row in result.to_arr()] == ["--", "--", "--", "--"]
+    assert [row["timestamp"] for row in result.to_arr()] == [start + dt.timedelta(hours=h) for h in range(4)]
+    assert result.frame.columns == ["timestamp", "value"]
+    assert boundary_source.calls == [
+        (start - dt.timedelta(days=1), start + dt.timedelta(hours=4), dt.timedelta(days=1)),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_coarse_boundaries_apply_within_tolerance():
+    class NewYearOnly(DailyBoundarySource):
+        async def fetch_timeseries(self, start, end, resolution, **kwargs):
+            new_year = dt.datetime(2026, 1, 1, tzinfo=dt.UTC)
+            return await super().fetch_timeseries(new_year, new_year + dt.timedelta(days=1), resolution)
+
+    start = dt.datetime(2026, 1, 1, 22, 0, tzinfo=dt.UTC)
+    source = DynamicBoundaryDirectiveSource(
+        DummyTimeseriesSource(), NewYearOnly(), boundary_resolution=dt.timedelta(days=1)
+    )
+    result = await source.fetch_timeseries(start, start + dt.timedelta(hours=4), dt.timedelta(hours=1))
+
+    # the boundaries of new year are no longer valid from midnight on
+    assert [row["value"] for row in result.to_arr()] == ["--", "-"]
+
+    source.tolerance = dt.timedelta(days=2)
+    result = await source.fetch_timeseries(start, start + dt.timedelta(hours=4), dt.timedelta(hours=1))
+    assert [row["value"] for row in result.to_arr()] == ["--", "-", "0", "+"]
+
+
+@pytest.mark.asyncio
+async def test_calendar_boundary_resolution_has_no_tolerance():
+    class MonthlyBoundarySource(TimeseriesSource):
+        def __init__(self):
+            self.calls = []
+
+        async def fetch_timeseries(self, start, end, resolution, **kwargs):
+            self.calls.append((start, end, resolution))
+            data = [{"timestamp": pd.Timestamp("2025-12-01", tz="UTC"), "b0": 5, "b1": 15, "b2": 25, "b3": 35}]
+            return Timeseries(frame=pd.DataFrame(data), metadata={})
+
+    boundary_source = MonthlyBoundarySource()
+    source = DynamicBoundaryDirectiveSource(
+        DummyTimeseriesSource(), boundary_source, boundary_resolution=Duration(months=1)
+    )
+    start = dt.datetime(2026, 1, 15, tzinfo=dt.UTC)
+
+    result = await source.fetch_timeseries(start, start + dt.timedelta(hours=2), dt.timedelta(hours=1))
+
+    assert [row["value"] for row in result.to_arr()] == ["--", "-"]
+    assert boundary_source.calls[0][0] == dt.datetime(2025, 12, 15, tzinfo=dt.UTC)
+
+
+@pytest.mark.asyncio
+async def test_prefetch_uses_the_boundary_window():
+    boundary_source = DailyBoundarySource()
+    source = DynamicBoundaryDirectiveSource(
+        CachedTimeseriesSource(DummyTimeseriesSource()), boundary_source, boundary_resolution=dt.timedelta(days=1)
+    )
+    start = dt.datetime(2026, 1, 2, tzinfo=dt.UTC)
+
+    result = await source.prefetch(start, start + dt.timedelta(hours=2), dt.timedelta(hours=1))
+
+    assert [row["value"] for row in result.to_arr()] == ["--", "--"]
+    assert boundary_source.calls == [
+        (start - dt.timedelta(days=1), start + dt.timedelta(hours=2), dt.timedelta(days=1))
+    ]
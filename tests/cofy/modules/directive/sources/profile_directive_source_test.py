@@ -0,0 +1,81 @@
+import datetime as dt
+
+import pytest
+
+from cofy.modules.directive import ProfileDirectiveSource
+from cofy.modules.timeseries import CachedTimeseriesSource
+
+from ...timeseries.dummy_source import DummyTimeseriesSource
+
+START = dt.datetime(2026, 1, 1, 0, 0, tzinfo=dt.UTC)
+END = dt.datetime(2026, 1, 1, 5, 0, tzinfo=dt.UTC)
+HOUR = dt.timedelta(hours=1)
+PROFILES = {"heat_pump": (0, 10, 20, 30), "ev": (5, 15, 25, 35)}
+
+
+class CountingSource(DummyTimeseriesSource):
+    def __init__(self):
+        self.calls = 0
+
+    async def fetch_timeseries(self, start, end, resolution=HOUR, **kwargs):
+        self.calls += 1
+        return await super().fetch_timeseries(start, end, resolution, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_all_profiles_are_evaluated_from_one_fetch():
+    upstream = CountingSource()
+    source = ProfileDirectiveSource(upstream, PROFILES)
+
+    # DummyTimeseriesSource: values 0, 10, 20, 30, 40
+    result = await source.fetch_timeseries(START, END, HOUR)
+
+    assert result.frame.columns == ["timestamp", "heat_pump", "ev"]
+    assert result.frame["heat_pump"].to_list() == ["--", "-", "0", "+", "++"]
+    assert result.frame["ev"].to_list() == ["--", "-", "0", "+", "++"]
+    assert result.metadata["unit"] == "directive"
+    assert upstream.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_a_single_profile_is_returned_as_value():
+    source = ProfileDirectiveSource(DummyTimeseriesSource(), {"battery": (15,)}, labels=("charge", "discharge"))
+
+    result = await source.fetch_timeseries(START, END, HOUR, profile="battery")
+
+    assert result.frame.columns == ["timestamp", "value"]
+    assert result.frame["value"].to_list() == ["charge", "charge", "discharge", "discharge", "discharge"]
+
+
+@pytest.mark.asyncio
+async def test_unknown_profile_is_rejected():
+    source = ProfileDirectiveSource(DummyTimeseriesSource(), PROFILES)
+    with pytest.raises(ValueError, match="Unknown profile boiler, available profiles are: heat_pump, ev"):
+        await source.fetch_timeseries(START, END, HOUR, profile="boiler")
+
+
+@pytest.mark.asyncio
+async def test_prefetch_is_forwarded_and_mapped():
+    source = ProfileDirectiveSource(CachedTimeseriesSource(DummyTimeseriesSource()), PROFILES, reverse=True)
+
+    result = await source.prefetch(START, START + 2 * HOUR, HOUR, profile="ev")
+    assert result.frame["value"].to_list() == ["++", "+"]
+
+    assert await ProfileDirectiveSource(DummyTimeseriesSource(), PROFILES).prefetch(START, END, HOUR) is None
+
+
+def test_properties_are_forwarded():
+    wrapped = DummyTimeseriesSource()
+    source = ProfileDirectiveSource(wrapped, PROFILES)
+
+    assert source.refresh_schedule is None
+    assert source.lifespan_tasks == {}
+    assert source.supported_resolutions == wrapped.supported_resolutions
+    assert set(source.extra_args) == {*wrapped.extra_args, "profile"}
+    assert set(source.record_model.model_fields) == {"timestamp", "value", "heat_pump", "ev"}
+
+
+@pytest.mark.parametrize(("profiles", "message"), [({}, "At least one profile"), ({"value": (1,)}, "can not be named")])
+def test_invalid_profiles(profiles, message):
+    with pytest.raises(ValueError, match=message):
+        ProfileDirectiveSource(DummyTimeseriesSource(), profiles)
@@ -0,0 +1,88 @@
+import datetime as dt
+
+import pytest
+
+from cofy.modules.directive import QuantileDirectiveSource
+from cofy.modules.timeseries import CachedTimeseriesSource
+
+from ...timeseries.dummy_source import DummyTimeseriesSource
+
+HOUR = dt.timedelta(hours=1)
+
+
+class RecordingSource(DummyTimeseriesSource):
+    def __init__(self):
+        self.calls = []
+
+    async def fetch_timeseries(self, start, end, resolution=HOUR, **kwargs):
+        self.calls.append((start, end))
+        return await super().fetch_timeseries(start, end, resolution, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_fetch_timeseries_uses_quantiles_of_the_whole_day():
+    upstream = RecordingSource()
+    source = QuantileDirectiveSource(upstream)
+    start = dt.datetime(2026, 1, 1, 4, 0, tzinfo=dt.UTC)
+
+    # the day holds the values 0, 10, ..., 230, so its quantiles are 46, 92, 138 and 184
+    result = await source.fetch_timeseries(start, start + 4 * HOUR, HOUR)
+
+    assert [row["timestamp"] for row in result.to_arr()] == [start + i * HOUR for i in range(4)]
+    assert [row["value"] for row in result.to_arr()] == ["--", "-", "-", "-"]
+    assert result.metadata["unit"] == "directive"
+    assert upstream.calls == [(dt.datetime(2026, 1, 1, tzinfo=dt.UTC), dt.datetime(2026, 1, 2, tzinfo=dt.UTC))]
+
+
+@pytest.mark.asyncio
+async def test_every_day_gets_its_own_boundaries():
+    source = QuantileDirectiveSource(DummyTimeseriesSource(), quantiles=(0.5,), labels=("low", "high"))
+    start = dt.datetime(2026, 1, 1, 11, 0, tzinfo=dt.UTC)
+
+    result = await source.fetch_timeseries(start, start + dt.timedelta(days=1) + 2 * HOUR, HOUR)
+    values = [row["value"] for row in result.to_arr()]
+
+    # the median splits both days at noon
+    assert values[:2] == ["low", "high"]
+    assert values[-2:] == ["low", "high"]
+
+
+@pytest.mark.asyncio
+async def test_days_are_split_in_the_given_timezone():
+    upstream = RecordingSource()
+    source = QuantileDirectiveSource(upstream, timezone="Europe/Brussels", reverse=True)
+    start = dt.datetime(2026, 1, 1, 12, 0, tzinfo=dt.UTC)
+
+    result = await source.fetch_timeseries(start, start + HOUR, HOUR)
+
+    assert upstream.calls[0][0] == dt.datetime(2025, 12, 31, 23, 0, tzinfo=dt.UTC)
+    assert upstream.calls[0][1] == dt.datetime(2026, 1, 1, 23, 0, tzinfo=dt.UTC)
+    # 13:00 local is the 14th hour of the day, between its 0.4 and 0.6 quantile
+    assert [row["value"] for row in result.to_arr()] == ["0"]
+
+
+@pytest.mark.asyncio
+async def test_prefetch_is_forwarded_and_mapped():
+    source = QuantileDirectiveSource(CachedTimeseriesSource(DummyTimeseriesSource()))
+    start = dt.datetime(2026, 1, 1, 22, 0, tzinfo=dt.UTC)
+
+    result = await source.prefetch(start, start + HOUR, HOUR)
+    assert [row["value"] for row in result.to_arr()] == ["++"]
+
+    assert await QuantileDirectiveSource(DummyTimeseriesSource()).prefetch(start, start + HOUR, HOUR) is None
+
+
+def test_properties_are_forwarded():
+    wrapped = DummyTimeseriesSource()
+    source = QuantileDirectiveSource(wrapped)
+
+    assert source.refresh_schedule is None
+    assert source.lifespan_tasks == {}
+    assert source.supported_resolutions == wrapped.supported_resolutions
+    assert source.extra_args == wrapped.extra_args
+
+
+@pytest.mark.parametrize(("quantiles", "message"), [((0.5, 1.5), "between 0 and 1"), ((0.6, 0.4), "ascending")])
+def test_invalid_quantiles(quantiles, message):
+    with pytest.raises(ValueError, match=message):
+        QuantileDirectiveSource(DummyTimeseriesSource(), quantiles=quantiles, labels=("a", "b", "c"))
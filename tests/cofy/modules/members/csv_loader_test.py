@@ -0,0 +1,160 @@
+import datetime as dt
+import gc
+import logging
+
+import pytest
+
+from cofy.modules.members import (
+    ConnectionType,
+    CSVColumns,
+    CSVMembersLoader,
+    CustomerType,
+    NamedIdentifier,
+    load_members_from_csv,
+)
+
+HEADER = ",".join(CSVColumns)
+
+
+def _write(tmp_path, *rows: str):
+    path = tmp_path / "members.csv"
+    path.write_text("\n".join([HEADER, *rows]) + "\n", encoding="utf-8-sig")
+    return path
+
+
+def _row(
+    ean="541400000001",
+    member_id="M001",
+    activation_code="ACT-M001",
+    address_id="A001",
+    customer_type="residential",
+    connection_type="electricity",
+    start_date="2020-01-01 00:00:00",
+    end_date="",
+    last_invoice_date="",
+    is_green="false",
+):
+    return ",".join(
+        [
+            ean,
+            member_id,
+            activation_code,
+            address_id,
+            customer_type,
+            connection_type,
+            "eb",
+            "Energie Belgie",
+            "fixed",
+            "Fixed",
+            "fluvius_west",
+            "Fluvius West",
+            start_date,
+            end_date,
+            last_invoice_date,
+            is_green,
+        ]
+    )
+
+
+def test_loads_members_with_contracts_grouped_by_address(tmp_path):
+    path = _write(
+        tmp_path,
+        _row(ean="E1", end_date="2021-01-01 00:00:00", last_invoice_date="2020-12-01 00:00:00", is_green=" TRUE"),
+        _row(ean="E2", connection_type="gas"),
+        _row(ean="E3", address_id="A002"),
+        _row(ean="E4", member_id="M002", activation_code="", customer_type="non_residential"),
+    )
+
+    members = load_members_from_csv(path)
+
+    assert list(members) == ["M001", "M002"]
+    first = members["M001"]
+    assert first.activation_code == "ACT-M001"
+    assert [[c.ean for c in address.contracts] for address in first.addresses] == [["E1", "E2"], ["E3"]]
+
+    contract = first.addresses[0].contracts[0]
+    assert contract.customer_type == CustomerType.RESIDENTIAL
+    assert contract.connection_type == ConnectionType.ELECTRICITY
+    assert contract.supplier == NamedIdentifier(id="eb", name="Energie Belgie")
+    assert contract.region == NamedIdentifier(id="be_flanders", name="Flanders")
+    assert contract.start_date == dt.datetime(2020, 1, 1)
+    assert contract.end_date == dt.datetime(2021, 1, 1)
+    assert contract.last_invoice_date == dt.datetime(2020, 12, 1)
+    assert contract.is_green is True
+    assert first.addresses[0].contracts[1].connection_type == ConnectionType.GAS
+    assert first.addresses[0].contracts[1].end_date is None
+
+    second = members["M002"]
+    assert second.activation_code is None
+    assert second.addresses[0].contracts[0].customer_type == CustomerType.NON_RESIDENTIAL
+
+
+def test_shares_identifiers_between_contracts(tmp_path):
+    members = load_members_from_csv(_write(tmp_path, _row(ean="E1"), _row(ean="E2", member_id="M002")))
+
+    first = members["M001"].addresses[0].contracts[0]
+    second = members["M002"].addresses[0].contracts[0]
+    assert first.supplier is second.supplier
+    assert first.product is second.product
+
+
+def test_uses_the_given_region(tmp_path):
+    region = NamedIdentifier(id="be_wallonia", name="Wallonia")
+    members = load_members_from_csv(_write(tmp_path, _row()), region=region)
+
+    assert members["M001"].addresses[0].contracts[0].region == region
+
+
+def test_skips_invalid_rows(tmp_path, caplog):
+    path = _write(
+        tmp_path,
+        _row(ean="E1"),
+        _row(ean="E2", customer_type="unknown"),
+        _row(ean="E3", start_date="yesterday"),
+        _row(ean="E4", end_date="2021-13-01 00:00:00"),
+        _row(ean="E5", member_id=""),
+        _row(ean=""),
+    )
+
+    with caplog.at_level(logging.WARNING):
+        members = load_members_from_csv(path)
+
+    assert [c.ean for c in members["M001"].addresses[0].contracts] == ["E1"]
+    for row_number, reason in [
+        (3, "invalid customer_type 'unknown'"),
+        (4, "invalid start_date 'yesterday'"),
+        (5, "invalid end_date '2021-13-01 00:00:00'"),
+        (6, "missing member_id"),
+        (7, "missing ean"),
+    ]:
+        assert f"Skipping invalid member row {row_number} in {path}: {reason}\n" in caplog.text
+
+
+@pytest.mark.parametrize("enabled", [True, False])
+def test_restores_garbage_collector(tmp_path, enabled):
+    path = _write(tmp_path, _row())
+    was_enabled = gc.isenabled()
+    try:
+        gc.enable() if enabled else gc.disable()
+        load_members_from_csv(path)
+        assert gc.isenabled() is enabled
+    finally:
+        gc.enable() if was_enabled else gc.disable()
+
+
+def test_csv_members_loader_only_rebuilds_changed_members(tmp_path):
+    loader = CSVMembersLoader()
+    path = _write(tmp_path, _row(ean="E1"), _row(ean="E2", member_id="M002"), _row(ean="E3", member_id="M003"))
+    first = loader(path)
+
+    path = _write(tmp_path, _row(ean="E1"), _row(ean="E2", member_id="M002", is_green="true"), _row(ean="E4"))
+    second = loader(path)
+
+    assert list(second) == ["M001", "M002"]
+    assert second == load_members_from_csv(path)
+    assert second["M001"] is not first["M001"]
+    assert second["M002"] is not first["M002"]
+    assert second["M002"].addresses[0].contracts[0].is_green is True
+
+    assert loader(path)["M002"] is second["M002"]
+    assert loader.row_hashes.keys() == {"M001", "M002"}
@@ -0,0 +1,118 @@
+import datetime as dt
+import json
+
+import energy_cost as ec
+import pytest
+from energy_cost import Tariff
+
+from cofy.modules.members import ConnectionType, Contract, CustomerType, NamedIdentifier
+from cofy.modules.members import history as history_module
+from cofy.modules.members.history import ContractHistoryCache, _registered_suppliers
+from cofy.modules.members.model import MeterType
+
+SUPPLIER_KEY = "history_test_supplier"
+PRODUCT_KEY = "history_test_product"
+
+
+def _contracts(supplier_key: str = SUPPLIER_KEY) -> list[Contract]:
+    return [
+        Contract(
+            ean="EAN1",
+            customer_type=CustomerType.RESIDENTIAL,
+            connection_type=ConnectionType.ELECTRICITY,
+            supplier=NamedIdentifier(name="Supplier", id=supplier_key),
+            product=NamedIdentifier(name="Product", id=PRODUCT_KEY),
+            distributor=NamedIdentifier(name="Fluvius Imewo", id="fluvius_imewo"),
+            region=NamedIdentifier(name="Flanders", id="be_flanders"),
+            start_date=dt.datetime(2024, 1, 1, tzinfo=dt.UTC),
+            end_date=None,
+            last_invoice_date=None,
+            is_green=False,
+        )
+    ]
+
+
+@pytest.fixture(autouse=True)
+def supplier():
+    ec.Supplier.register(SUPPLIER_KEY, ec.Supplier(products={PRODUCT_KEY: Tariff(root=[])}))
+
+
+@pytest.fixture
+def builds(monkeypatch):
+    calls = []
+    build = history_module._build_contract_history
+
+    def counting_build(contracts, meter_type=None):
+        calls.append((contracts, meter_type))
+        return build(contracts, meter_type)
+
+    monkeypatch.setattr(history_module, "_build_contract_history", counting_build)
+    return calls
+
+
+def test_serializes_history(builds):
+    content = ContractHistoryCache().get("M1", "EAN1", None, _contracts(), 1)
+
+    history = json.loads(content)
+    assert len(history) == 1
+    assert history[0]["supplier_key"] == SUPPLIER_KEY
+    assert history[0]["product_key"] == PRODUCT_KEY
+    assert history[0]["start"] == "2024-01-01T00:00:00Z"
+
+
+def test_reuses_history_for_the_same_version(builds):
+    cache = ContractHistoryCache()
+
+    first = cache.get("M1", "EAN1", None, _contracts(), 1)
+    # sources may hand out new contract lists for every lookup
+    assert cache.get("M1", "EAN1", None, _contracts(), 1) is first
+    assert len(builds) == 1
+
+    cache.get("M1", "EAN1", MeterType.DAY_NIGHT_07, _contracts(), 1)
+    assert len(builds) == 2
+
+
+def test_rebuilds_after_reload_or_supplier_change(builds):
+    cache = ContractHistoryCache()
+    cache.get("M1", "EAN1", None, _contracts(), 1)
+
+    # a reload changes the version
+    cache.get("M1", "EAN1", None, _contracts(), 2)
+    assert len(builds) == 2
+
+    ec.Supplier.register(SUPPLIER_KEY, ec.Supplier(products={PRODUCT_KEY: Tariff(root=[])}))
+    cache.get("M1", "EAN1", None, _contracts(), 2)
+    assert len(builds) == 3
+
+
+def test_does_not_cache_without_version(builds):
+    cache = ContractHistoryCache()
+    first = cache.get("M1", "EAN1", None, _contracts(), None)
+
+    assert cache.get("M1", "EAN1", None, _contracts(), None) == first
+    assert len(builds) == 2
+    assert len(cache._entries) == 0
+
+
+def test_evicts_least_recently_used(builds):
+    cache = ContractHistoryCache(max_entries=2)
+    contracts = _contracts()
+    cache.get("M1", "EAN1", None, contracts, 1)
+    cache.get("M2", "EAN1", None, contracts, 1)
+    cache.get("M1", "EAN1", None, contracts, 1)
+    cache.get("M3", "EAN1", None, contracts, 1)
+    assert len(builds) == 3
+
+    cache.get("M1", "EAN1", None, contracts, 1)
+    assert len(builds) == 3
+    cache.get("M2", "EAN1", None, contracts, 1)
+    assert len(builds) == 4
+
+    cache.clear()
+    cache.get("M1", "EAN1", None, contracts, 1)
+    assert len(builds) == 5
+
+
+def test_registered_suppliers_of_unknown_supplier():
+    assert _registered_suppliers(_contracts("unknown_supplier")) == (None,)
+    assert _registered_suppliers(_contracts())[0] is ec.Supplier.get(SUPPLIER_KEY)
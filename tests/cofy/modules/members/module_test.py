@@ -2,15 +2,18 @@ import builtins
 import datetime as dt
 
 import energy_cost as ec
+import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
 from cofy.modules.members import (
     Address,
+    AsyncMemberSource,
     ConnectionType,
     Contract,
     CustomerType,
     Member,
+    MembersFileSource,
     MembersModule,
     MemberSource,
     NamedIdentifier,
@@ -124,6 +127,138 @@ def test_members_module_get_by_id():
     assert response.status_code == 404
 
 
+def test_members_module_forwards_source_lifespan_tasks(tmp_path):
+    assert MembersModule(source=DummyMemberSource(), name="dummy").lifespan_tasks == {}
+
+    file_path = tmp_path / "members.csv"
+    file_path.write_text("")
+    source = MembersFileSource(str(file_path), lambda path: {})
+    assert MembersModule(source=source, name="file").lifespan_tasks == {source: source.watch}
+
+
+def test_members_module_get_by_ean_scans_members_by_default():
+    app = FastAPI()
+    module = MembersModule(source=DummyMemberSource(), name="dummy")
+    app.include_router(module)
+    client = TestClient(app)
+
+    response = client.get(module.prefix + "/by-ean/EAN123")
+    assert response.status_code == 200
+    assert [member["id"] for member in response.json()] == ["1"]
+    assert client.get(module.prefix + "/by-ean/unknown").status_code == 404
+
+
+def test_members_module_batch():
+    app = FastAPI()
+    module = MembersModule(source=DummyMemberSource(), name="dummy")
+    app.include_router(module)
+    client = TestClient(app)
+
+    response = client.post(module.prefix + "/batch", json={"ids": ["2", "1", "unknown", "1"]})
+    assert response.status_code == 200
+    assert [member["id"] for member in response.json()] == ["2", "1"]
+
+    response = client.post(module.prefix + "/batch", json={"ids": ["2"], "eans": ["EAN123", "unknown"]})
+    assert response.status_code == 200
+    assert [member["id"] for member in response.json()] == ["2", "1"]
+
+
+class DummyAsyncMemberSource(AsyncMemberSource[Member]):
+    def __init__(self):
+        self.source = DummyMemberSource()
+
+    async def list(self, email: str | None = None) -> builtins.list[Member]:
+        return self.source.list(email)
+
+    async def get(self, member_id: str) -> Member | None:
+        return self.source.get(member_id)
+
+    async def verify(self, activation_code: str) -> Member | None:
+        return self.source.verify(activation_code)
+
+
+def test_members_module_awaits_async_source():
+    app = FastAPI()
+    source = DummyAsyncMemberSource()
+    module = MembersModule(source=source, name="dummy")
+    app.include_router(module)
+    client = TestClient(app)
+
+    assert module.async_source is source
+    assert [member["id"] for member in client.get(module.prefix, params={"email": "x"}).json()] == ["1", "2"]
+    assert client.get(module.prefix + "/2").json()["id"] == "2"
+    assert client.post(module.prefix + "/verify", json={"activation_code": "code-b"}).json()["id"] == "2"
+    assert client.get(module.prefix + "/1/contracts/EAN123").status_code == 200
+    assert [member["id"] for member in client.get(module.prefix + "/by-ean/EAN123").json()] == ["1"]
+
+
+class TestFileSource:
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path):
+        file_path = tmp_path / "members.csv"
+        file_path.write_text("")
+        members = {member.id: member for member in DummyMemberSource().members}
+        source = MembersFileSource(str(file_path), lambda path: members)
+        app = FastAPI()
+        module = MembersModule(source=source, name="file")
+        app.include_router(module)
+        self.client = TestClient(app)
+        self.prefix = module.prefix
+
+    def test_list_and_get_serve_member_json(self):
+        response = self.client.get(self.prefix, params={"page": 1})
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        assert [member["id"] for member in response.json()] == ["1", "2"]
+        assert self.client.get(self.prefix, params={"page": 2}).json() == []
+        assert self.client.get(self.prefix, params={"page": 0}).status_code == 422
+        assert self.client.get(self.prefix, params={"page_size": 1001}).status_code == 422
+        response = self.client.get(self.prefix, params={"page_size": 1, "supplier": _SUPPLIER_KEY})
+        assert [member["id"] for member in response.json()] == ["1"]
+        assert self.client.get(self.prefix, params={"after": "1", "supplier": _SUPPLIER_KEY}).json() == []
+
+        response = self.client.get(self.prefix + "/1")
+        assert response.status_code == 200
+        assert response.json() == DummyMemberSource().members[0].model_dump(mode="json", by_alias=True)
+
+    def test_list_keeps_query_parameters_in_openapi(self):
+        operation = self.client.app.openapi()["paths"][self.prefix + "/"]["get"]
+        assert operation["operationId"] == "members:file:list"
+        assert [parameter["name"] for parameter in operation["parameters"]] == [
+            "page",
+            "page_size",
+            "after",
+            "supplier",
+            "product",
+            "distributor",
+            "customer_type",
+        ]
+
+    def test_batch(self):
+        response = self.client.post(self.prefix + "/batch", json={"ids": ["2", "unknown", "2"], "eans": ["EAN123"]})
+        assert response.status_code == 200
+        assert [member["id"] for member in response.json()] == ["2", "1"]
+
+        assert self.client.post(self.prefix + "/batch", json={}).json() == []
+        assert self.client.post(self.prefix + "/batch", json={"ids": ["1"] * 10_001}).status_code == 422
+
+    def test_get_by_ean(self):
+        response = self.client.get(self.prefix + "/by-ean/EAN123")
+        assert response.status_code == 200
+        assert [member["id"] for member in response.json()] == ["1"]
+
+        response = self.client.get(self.prefix + "/by-ean/UNKNOWN_EAN")
+        assert response.status_code == 404
+
+    def test_contract_history_uses_ean_index(self):
+        response = self.client.get(self.prefix + "/1/contracts/EAN123")
+        assert response.status_code == 200
+        assert len(response.json()) == 2
+
+        assert self.client.get(self.prefix + "/2/contracts/EAN123").status_code == 404
+        assert self.client.get(self.prefix + "/nonexistent/contracts/EAN123").status_code == 404
+
+
 def test_removed_activation_get_endpoints_return_404():
     app = FastAPI()
     module = MembersModule(source=DummyMemberSource(), name="dummy")
@@ -149,6 +284,24 @@ class TestGetContractHistory:
         response = self.client.get(self.prefix + "/1/contracts/EAN123")
         assert response.status_code == 200
 
+    def test_history_is_cached_per_source_version(self, monkeypatch):
+        source = DummyMemberSource()
+        module = MembersModule(source=source, name="versioned")
+        app = FastAPI()
+        app.include_router(module)
+        client = TestClient(app)
+        history = module.prefix + "/1/contracts/EAN123"
+
+        # the dummy source has no version, so nothing is cached
+        client.get(history)
+        assert len(module.history_cache._entries) == 0
+
+        monkeypatch.setattr(DummyMemberSource, "version", 1, raising=False)
+        first = client.get(history).content
+        assert len(module.history_cache._entries) == 1
+        assert module.history_cache._entries[("1", "EAN123", None)][0] == 1
+        assert client.get(history).content == first
+
     def test_response_is_list(self):
         response = self.client.get(self.prefix + "/1/contracts/EAN123")
         body = response.json()
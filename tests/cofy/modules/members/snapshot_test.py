@@ -0,0 +1,39 @@
+import gc
+import pickle
+
+from cofy.modules.members.snapshot import SNAPSHOT_VERSION, paused_gc, read_snapshot, write_snapshot
+
+
+def test_write_and_read_snapshot(tmp_path):
+    path = tmp_path / "members.snapshot"
+    write_snapshot(path, (1, 2), {"M001": "member"})
+
+    assert read_snapshot(path, (1, 2)) == {"M001": "member"}
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_read_snapshot_requires_matching_signature_and_version(tmp_path):
+    path = tmp_path / "members.snapshot"
+    assert read_snapshot(path, (1, 2)) is None
+
+    write_snapshot(path, (1, 2), {})
+    assert read_snapshot(path, (1, 3)) is None
+
+    path.write_bytes(pickle.dumps((SNAPSHOT_VERSION + 1, (1, 2), {})))
+    assert read_snapshot(path, (1, 2)) is None
+
+
+def test_paused_gc_restores_previous_state():
+    was_enabled = gc.isenabled()
+    try:
+        gc.enable()
+        with paused_gc():
+            assert not gc.isenabled()
+        assert gc.isenabled()
+
+        gc.disable()
+        with paused_gc():
+            assert not gc.isenabled()
+        assert not gc.isenabled()
+    finally:
+        gc.enable() if was_enabled else gc.disable()
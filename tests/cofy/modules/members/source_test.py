@@ -1,4 +1,16 @@
-from cofy.modules.members import Member, MemberSource
+import json
+import threading
+
+import pytest
+
+from cofy.modules.members import (
+    Address,
+    AsyncMemberSource,
+    Contract,
+    Member,
+    MemberSource,
+    SyncMemberSourceAdapter,
+)
 
 
 class DummyMemberSource(MemberSource[Member]):
@@ -14,3 +26,146 @@ class DummyMemberSource(MemberSource[Member]):
 
 def test_member_source_default_response_model_is_member():
     assert DummyMemberSource().response_model is Member
+
+
+def test_member_source_default_json_serializes_response_model():
+    class SingleMemberSource(DummyMemberSource):
+        def list(self, email: str | None = None) -> list[Member]:
+            return [Member(id="M001")]
+
+        def get(self, member_id: str) -> Member | None:
+            return Member(id=member_id) if member_id == "M001" else None
+
+    source = SingleMemberSource()
+
+    assert json.loads(source.list_json()) == [Member(id="M001").model_dump(mode="json", by_alias=True)]
+    assert json.loads(source.get_json("M001"))["id"] == "M001"
+    assert source.get_json("unknown") is None
+
+
+MEMBERS = {"M001": Member(id="M001"), "M002": Member(id="M002")}
+
+
+def test_member_source_default_get_many():
+    class EANMemberSource(DummyMemberSource):
+        def get(self, member_id: str) -> Member | None:
+            return MEMBERS.get(member_id)
+
+        def get_by_ean(self, ean: str) -> list[Member]:
+            return [MEMBERS["M002"]] if ean == "E1" else []
+
+    source = EANMemberSource()
+
+    assert source.get_many(["M002", "unknown", "M001", "M002"], ["E1", "E2"]) == [MEMBERS["M002"], MEMBERS["M001"]]
+    assert json.loads(source.get_many_json(["M001"])) == [MEMBERS["M001"].model_dump(mode="json", by_alias=True)]
+
+
+def test_member_source_default_get_by_ean_scans_the_members():
+    member = Member.model_construct(
+        id="M003", addresses=[Address.model_construct(contracts=[Contract.model_construct(ean="E1")])]
+    )
+
+    class ContractMemberSource(DummyMemberSource):
+        def list(self, email: str | None = None) -> list[Member]:
+            return [MEMBERS["M001"], member]
+
+    source = ContractMemberSource()
+
+    assert source.get_by_ean("E1") == [member]
+    assert source.get_by_ean("E2") == []
+
+
+def _with_ean(member_id: str, ean: str) -> Member:
+    return Member.model_construct(
+        id=member_id, addresses=[Address.model_construct(contracts=[Contract.model_construct(ean=ean)])]
+    )
+
+
+PAGED = [_with_ean(f"M{i}", "E1" if i % 2 else "E2") for i in range(5)]
+
+
+def test_member_source_default_get_by_ean_follows_the_cursor():
+    class CursorMemberSource(DummyMemberSource):
+        def __init__(self):
+            self.calls = []
+
+        def list(self, page: int = 1, after: str | None = None) -> list[Member]:
+            self.calls.append(after)
+            members = [member for member in PAGED if after is None or member.id > after]
+            return members[(page - 1) * 2 : page * 2]
+
+    source = CursorMemberSource()
+
+    assert source.get_by_ean("E1") == [PAGED[1], PAGED[3]]
+    assert source.calls == [None, "M1", "M3", "M4"]
+
+
+@pytest.mark.asyncio
+async def test_async_member_source_default_get_by_ean_follows_page_numbers():
+    class PagedMemberSource(DummyAsyncMemberSource):
+        async def list(self, page: int = 1) -> list[Member]:
+            return PAGED[(page - 1) * 2 : page * 2]
+
+    assert await PagedMemberSource().get_by_ean("E2") == [PAGED[0], PAGED[2], PAGED[4]]
+
+
+class DummyAsyncMemberSource(AsyncMemberSource[Member]):
+    async def list(self) -> list[Member]:
+        return list(MEMBERS.values())
+
+    async def get(self, member_id: str) -> Member | None:
+        return MEMBERS.get(member_id)
+
+    async def verify(self, activation_code: str) -> Member | None:
+        return None
+
+
+@pytest.mark.asyncio
+async def test_async_member_source_defaults():
+    source = DummyAsyncMemberSource()
+
+    assert source.response_model is Member
+    assert source.lifespan_tasks == {}
+    assert list(source.list_signature.parameters) == []
+    assert [member["id"] for member in json.loads(await source.list_json())] == ["M001", "M002"]
+    assert json.loads(await source.get_json("M001"))["id"] == "M001"
+    assert await source.get_json("unknown") is None
+    assert await source.get_many(["M002", "unknown", "M002"]) == [MEMBERS["M002"]]
+    assert json.loads(await source.get_many_json(["M001"])) == [MEMBERS["M001"].model_dump(mode="json")]
+    assert await source.get_contracts("M001", "E1") == []
+    assert await source.get_contracts("unknown", "E1") is None
+    assert await source.get_by_ean("E1") == []
+    assert await source.get_many([], ["E1"]) == []
+
+
+class ThreadRecordingSource(DummyMemberSource):
+    def __init__(self, blocking: bool):
+        self.blocking = blocking
+        self.threads = []
+
+    def get(self, member_id: str) -> Member | None:
+        self.threads.append(threading.get_ident())
+        return MEMBERS.get(member_id)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("blocking", [True, False])
+async def test_sync_member_source_adapter_forwards(blocking):
+    sync_source = ThreadRecordingSource(blocking)
+    source = SyncMemberSourceAdapter(sync_source)
+
+    assert await source.get("M001") == MEMBERS["M001"]
+    called_on_event_loop = sync_source.threads == [threading.get_ident()]
+    assert called_on_event_loop is not blocking
+    assert await source.list() == []
+    assert await source.list_json() == b"[]"
+    assert json.loads(await source.get_json("M002"))["id"] == "M002"
+    assert await source.verify("code") is None
+    assert await source.get_many(["M002"]) == [MEMBERS["M002"]]
+    assert json.loads(await source.get_many_json(["M001"]))[0]["id"] == "M001"
+    assert await source.get_contracts("M001", "E1") == []
+    assert await source.get_by_ean("E1") == []
+    assert source.response_model is Member
+    assert source.lifespan_tasks == {}
+    # the adapter declares the parameters of the source it forwards to
+    assert list(source.list_signature.parameters) == ["email"]
@@ -1,7 +1,28 @@
+import asyncio
+import datetime as dt
+import json
+import logging
 import os
+import time
+from functools import partial
 from pathlib import Path
 
-from cofy.modules.members import Member, MembersFileSource
+import pytest
+
+from cofy.modules.members import (
+    Address,
+    ConnectionType,
+    Contract,
+    CSVColumns,
+    CSVMembersLoader,
+    CustomerType,
+    Member,
+    MembersFileSource,
+    NamedIdentifier,
+    load_members_from_csv,
+)
+from cofy.modules.members.snapshot import write_snapshot
+from cofy.modules.members.sources.file_source import MembersIndex
 
 
 def _make_loader(members: dict[str, Member]):
@@ -102,18 +123,21 @@ def test_members_file_source_reloads_when_file_changes(tmp_path):
         call_count += 1
         return {"M001": m1} if call_count == 1 else {"M001": m1, "M002": m2}
 
-    source = MembersFileSource(str(file_path), counting_loader)
+    source = MembersFileSource(str(file_path), counting_loader, poll_interval=dt.timedelta(0))
     assert call_count == 1
     assert len(source.list()) == 1
+    assert source.version == 1
 
     # Listing again without a file change should NOT trigger a reload
     source.list()
     assert call_count == 1
+    assert source.version == 1
 
     # Changing the file should trigger a reload on the next list()
     _write(file_path, "v2")
     assert len(source.list()) == 2
     assert call_count == 2
+    assert source.version == 2
 
 
 def test_members_file_source_response_model_is_member(tmp_path):
@@ -149,7 +173,7 @@ def test_members_file_source_preserves_state_when_loader_raises(tmp_path):
             raise ValueError("parse error")
         return {"M001": m1}
 
-    source = MembersFileSource(str(file_path), flaky_loader)
+    source = MembersFileSource(str(file_path), flaky_loader, poll_interval=dt.timedelta(0))
     assert source.list() == [m1]
 
     # Trigger a reload with a failing loader — previous state should be retained
@@ -172,7 +196,7 @@ def test_members_file_source_no_double_reload_under_lock(tmp_path):
         call_count += 1
         return {"M001": m1}
 
-    source = MembersFileSource(str(file_path), counting_loader)
+    source = MembersFileSource(str(file_path), counting_loader, poll_interval=dt.timedelta(0))
     assert call_count == 1
 
     # Change the file so the outer signature check fails (reload looks needed)
@@ -196,3 +220,471 @@ def test_members_file_source_no_double_reload_under_lock(tmp_path):
     source._get_file_signature = patched_get_sig  # ty: ignore[invalid-assignment]
     source.list()
     assert call_count == 1  # loader was not called a second time
+
+
+def test_members_file_source_checks_on_read_once_per_poll_interval(tmp_path, monkeypatch):
+    file_path = tmp_path / "members.txt"
+    _write(file_path, "v1")
+
+    m1 = Member(id="M001")
+    m2 = Member(id="M002")
+    source = MembersFileSource(
+        str(file_path),
+        lambda path: {"M001": m1} if path.read_text() == "v1" else {"M001": m1, "M002": m2},
+        poll_interval=dt.timedelta(seconds=5),
+    )
+
+    # within the poll interval, reads do not check the file
+    _write(file_path, "v2")
+    assert source.list() == [m1]
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 5)
+    assert source.list() == [m1, m2]
+    assert source.version == 2
+
+
+@pytest.mark.asyncio
+async def test_members_file_source_reads_leave_checks_to_the_watch_task(tmp_path):
+    file_path = tmp_path / "members.txt"
+    _write(file_path, "v1")
+
+    m1 = Member(id="M001")
+    m2 = Member(id="M002")
+    source = MembersFileSource(
+        str(file_path),
+        lambda path: {"M001": m1} if path.read_text() == "v1" else {"M001": m1, "M002": m2},
+        poll_interval=dt.timedelta(seconds=5),
+    )
+    source._next_check = 0
+
+    task = asyncio.create_task(source.watch())
+    await asyncio.sleep(0)
+    try:
+        _write(file_path, "v2")
+        assert source.list() == [m1]
+    finally:
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    # once the task stopped, reads check the file again
+    assert source.list() == [m1, m2]
+
+
+@pytest.mark.asyncio
+async def test_members_file_source_watch_reloads_in_background(tmp_path):
+    file_path = tmp_path / "members.txt"
+    _write(file_path, "v1")
+
+    m1 = Member(id="M001")
+    m2 = Member(id="M002")
+    source = MembersFileSource(
+        str(file_path),
+        lambda path: {"M001": m1} if path.read_text() == "v1" else {"M001": m1, "M002": m2},
+        poll_interval=dt.timedelta(milliseconds=10),
+    )
+    assert source.lifespan_tasks == {source: source.watch}
+
+    task = asyncio.create_task(source.watch())
+    try:
+        _write(file_path, "v2")
+        for _ in range(100):
+            if source.get("M002") is not None:
+                break
+            await asyncio.sleep(0.01)
+        assert source.list() == [m1, m2]
+    finally:
+        task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_members_file_source_watch_survives_errors(tmp_path, caplog):
+    file_path = tmp_path / "members.txt"
+    _write(file_path)
+    source = MembersFileSource(str(file_path), _make_loader({}), poll_interval=dt.timedelta(milliseconds=10))
+
+    checks = 0
+
+    def failing_get_sig():
+        nonlocal checks
+        checks += 1
+        raise PermissionError("denied")
+
+    source._get_file_signature = failing_get_sig  # ty: ignore[invalid-assignment]
+    task = asyncio.create_task(source.watch())
+    with caplog.at_level(logging.ERROR):
+        while checks < 2:
+            await asyncio.sleep(0.01)
+    task.cancel()
+    assert "Failed to check" in caplog.text
+
+
+def test_members_file_source_loads_from_snapshot(tmp_path):
+    file_path = tmp_path / "members.txt"
+    snapshot_path = tmp_path / "members.snapshot"
+    _write(file_path, "v1")
+
+    calls = 0
+
+    def counting_loader(path: Path) -> dict[str, Member]:
+        nonlocal calls
+        calls += 1
+        return {"M001": Member(id="M001", activation_code=f"ACT-{calls}")}
+
+    MembersFileSource(str(file_path), counting_loader, snapshot_path=snapshot_path)
+    assert calls == 1
+    assert snapshot_path.exists()
+
+    # a second worker loads the snapshot instead of parsing the file
+    source = MembersFileSource(
+        str(file_path), counting_loader, poll_interval=dt.timedelta(0), snapshot_path=snapshot_path
+    )
+    assert calls == 1
+    assert source.verify("ACT-1") == Member(id="M001", activation_code="ACT-1")
+
+    # the snapshot is stale once the file changes
+    _write(file_path, "v2")
+    assert source.verify("ACT-2") is not None
+    assert calls == 2
+    assert MembersFileSource(str(file_path), counting_loader, snapshot_path=snapshot_path).verify("ACT-2") is not None
+    assert calls == 2
+
+
+def test_members_file_source_snapshot_holds_the_json(tmp_path):
+    file_path = tmp_path / "members.txt"
+    snapshot_path = tmp_path / "members.snapshot"
+    _write(file_path)
+    source = MembersFileSource(str(file_path), _make_loader({"M001": Member(id="M001")}), snapshot_path=snapshot_path)
+    members = {"M001": Member(id="M001", activation_code="ACT-1")}
+    write_snapshot(
+        snapshot_path,
+        (source._get_file_signature(), source._snapshot_key),
+        (members, {"M001": b'{"id":"from snapshot"}'}),
+    )
+
+    source = MembersFileSource(str(file_path), _make_loader({}), snapshot_path=snapshot_path)
+    assert source.get("M001") == members["M001"]
+    # the members are not encoded again
+    assert source.get_json("M001") == b'{"id":"from snapshot"}'
+
+
+def test_members_file_source_snapshot_is_keyed_by_loader(tmp_path):
+    file_path = tmp_path / "members.csv"
+    snapshot_path = tmp_path / "members.snapshot"
+    file_path.write_text(
+        "member_id,activation_code,address_id,ean,customer_type,connection_type,supplier_id,supplier_name,"
+        "product_id,product_name,distributor_id,distributor_name,start_date,end_date,last_invoice_date,is_green\n"
+        "M001,ACT-1,A1,E1,residential,electricity,s,S,p,P,d,D,2024-01-01 00:00:00,,,true\n"
+    )
+    flanders = MembersFileSource(str(file_path), CSVMembersLoader(), snapshot_path=snapshot_path)
+    wallonia = NamedIdentifier(id="be_wallonia", name="Wallonia")
+
+    # another loader, or the same loader with another region, does not reuse the snapshot
+    for loader in [
+        CSVMembersLoader(region=wallonia),
+        partial(load_members_from_csv, region=wallonia),
+    ]:
+        source = MembersFileSource(str(file_path), loader, snapshot_path=snapshot_path)
+        assert source._snapshot_key != flanders._snapshot_key
+        assert source.get("M001").addresses[0].contracts[0].region == wallonia
+
+    assert MembersFileSource(str(file_path), CSVMembersLoader(), snapshot_path=snapshot_path)._snapshot_key == (
+        flanders._snapshot_key
+    )
+
+
+def test_members_file_source_ignores_unreadable_snapshot(tmp_path, caplog):
+    file_path = tmp_path / "members.txt"
+    snapshot_path = tmp_path / "members.snapshot"
+    _write(file_path)
+    snapshot_path.write_bytes(b"not a pickle")
+
+    with caplog.at_level(logging.WARNING):
+        source = MembersFileSource(
+            str(file_path), _make_loader({"M001": Member(id="M001")}), snapshot_path=snapshot_path
+        )
+
+    assert source.get("M001") is not None
+    assert "Ignoring unreadable members snapshot" in caplog.text
+
+
+def test_members_file_source_logs_failing_snapshot_write(tmp_path, caplog):
+    file_path = tmp_path / "members.txt"
+    _write(file_path)
+
+    with caplog.at_level(logging.ERROR):
+        source = MembersFileSource(
+            str(file_path), _make_loader({"M001": Member(id="M001")}), snapshot_path=tmp_path / "missing" / "snapshot"
+        )
+
+    assert source.get("M001") is not None
+    assert "Failed to write members snapshot" in caplog.text
+
+
+def test_members_index_patches_changes():
+    previous = {
+        "M001": Member(id="M001", activation_code="ACT-1"),
+        "M002": Member(id="M002", activation_code="ACT-2"),
+        "M003": Member(id="M003", activation_code="ACT-3"),
+        **{f"M1{i:02}": Member(id=f"M1{i:02}") for i in range(10)},
+    }
+    index = MembersIndex(previous)
+
+    members = dict(previous)
+    del members["M003"]
+    members["M001"] = Member(id="M001", activation_code="ACT-3")
+    members["M000"] = Member(id="M000", activation_code="ACT-0")
+    updated = index.updated(members)
+
+    assert updated.members_by_id is members
+    assert updated.sorted_ids == ["M000", "M001", "M002", *(f"M1{i:02}" for i in range(10))]
+    assert updated.members_by_activation_code == {
+        "ACT-0": members["M000"],
+        "ACT-2": previous["M002"],
+        "ACT-3": members["M001"],
+    }
+    # the previous index is left as is for readers still using it
+    assert index.sorted_ids == ["M001", "M002", "M003", *(f"M1{i:02}" for i in range(10))]
+    assert index.members_by_activation_code["ACT-1"] is previous["M001"]
+
+
+def test_members_index_reuses_sorted_ids_without_additions_or_removals():
+    members = {f"M{i}": Member(id=f"M{i}") for i in range(4)}
+    index = MembersIndex(members)
+
+    updated = index.updated({**members, "M0": Member(id="M0", activation_code="ACT-0")})
+
+    assert updated.sorted_ids is index.sorted_ids
+    assert updated.members_by_activation_code["ACT-0"].id == "M0"
+
+
+def test_members_index_rebuilds_on_large_changes():
+    index = MembersIndex({"M001": Member(id="M001")})
+
+    updated = index.updated({"M002": Member(id="M002", activation_code="ACT-2")})
+
+    assert updated.sorted_ids == ["M002"]
+    assert list(updated.members_by_activation_code) == ["ACT-2"]
+
+
+def _contract(
+    ean: str,
+    supplier: str = "S1",
+    product: str = "P1",
+    distributor: str = "D1",
+    customer_type: CustomerType = CustomerType.RESIDENTIAL,
+) -> Contract:
+    return Contract(
+        ean=ean,
+        customer_type=customer_type,
+        connection_type=ConnectionType.ELECTRICITY,
+        supplier=NamedIdentifier(id=supplier, name=supplier),
+        product=NamedIdentifier(id=product, name=product),
+        distributor=NamedIdentifier(id=distributor, name=distributor),
+        region=NamedIdentifier(id="be_flanders", name="Flanders"),
+        start_date=dt.datetime(2024, 1, 1, tzinfo=dt.UTC),
+        end_date=None,
+        last_invoice_date=None,
+        is_green=False,
+    )
+
+
+def _member_with_eans(member_id: str, *eans: str) -> Member:
+    return Member(id=member_id, addresses=[Address(contracts=[_contract(ean) for ean in eans])])
+
+
+def test_members_file_source_indexes_eans(tmp_path):
+    file_path = tmp_path / "members.txt"
+    _write(file_path)
+    members = {"M002": _member_with_eans("M002", "E1", "E2", "E1"), "M001": _member_with_eans("M001", "E1")}
+    source = MembersFileSource(str(file_path), _make_loader(members))
+
+    assert source.get_by_ean("E1") == [members["M001"], members["M002"]]
+    assert source.get_by_ean("E2") == [members["M002"]]
+    assert source.get_by_ean("unknown") == []
+    assert [c.ean for c in source.get_contracts("M002", "E1")] == ["E1", "E1"]
+    assert source.get_contracts("M001", "E2") == []
+    assert source.get_contracts("unknown", "E1") is None
+
+
+def test_members_index_patches_eans():
+    previous = {
+        "M001": _member_with_eans("M001", "E1", "E2"),
+        "M002": _member_with_eans("M002", "E3"),
+        **{f"M1{i:02}": Member(id=f"M1{i:02}") for i in range(10)},
+    }
+    index = MembersIndex(previous)
+
+    members = dict(previous)
+    del members["M002"]
+    members["M001"] = _member_with_eans("M001", "E1")
+    members["M003"] = _member_with_eans("M003", "E1", "E2")
+    updated = index.updated(members)
+
+    assert updated.members_by_id is members
+    assert updated.contracts_by_ean.keys() == {"E1", "E2"}
+    assert updated.contracts_by_ean["E1"].keys() == {"M001", "M003"}
+    assert updated.contracts_by_ean["E2"].keys() == {"M003"}
+    # the previous index is left as is for readers still using it
+    assert index.contracts_by_ean["E2"].keys() == {"M001"}
+    assert index.contracts_by_ean["E3"].keys() == {"M002"}
+
+
+def test_members_index_patches_json():
+    previous = {f"M{i:02}": Member(id=f"M{i:02}") for i in range(10)}
+    index = MembersIndex(previous)
+
+    members = dict(previous)
+    del members["M09"]
+    members["M00"] = Member(id="M00", activation_code="ACT-0")
+    updated = index.updated(members)
+
+    assert updated.json_by_id.keys() == members.keys()
+    assert json.loads(updated.json_by_id["M00"])["activation_code"] == "ACT-0"
+    assert updated.json_by_id["M01"] is index.json_by_id["M01"]
+    assert json.loads(index.json_by_id["M00"])["activation_code"] is None
+
+
+def test_members_index_detects_changes_by_row_hash():
+    previous = {f"M{i:02}": Member(id=f"M{i:02}") for i in range(10)}
+    encoded = []
+
+    def serialize(member: Member) -> bytes:
+        encoded.append(member.id)
+        return member.model_dump_json().encode()
+
+    index = MembersIndex(previous, serialize, hashes={member_id: 0 for member_id in previous})
+    encoded.clear()
+
+    # equal members that are new objects, only M03 has other rows
+    members = {member_id: member.model_copy() for member_id, member in previous.items()}
+    members["M03"] = Member(id="M03", activation_code="ACT-3")
+    updated = index.updated(members, hashes={**index.hashes, "M03": 1})
+
+    assert encoded == ["M03"]
+    assert updated.hashes["M03"] == 1
+    assert updated.members_by_activation_code == {"ACT-3": members["M03"]}
+
+    # without hashes on both sides, members are compared by identity
+    encoded.clear()
+    index.updated(members)
+    assert len(encoded) == len(members)
+
+
+def test_members_file_source_patches_csv_reloads_by_row_hash(tmp_path):
+    header = ",".join(CSVColumns)
+    file_path = tmp_path / "members.csv"
+    _write(file_path, header)
+    loader = CSVMembersLoader()
+    source = MembersFileSource(str(file_path), loader, poll_interval=dt.timedelta(0))
+    assert source._index.hashes is loader.row_hashes
+
+    _write(file_path, header + "\n")
+    source.list()
+    assert source._index.hashes is loader.row_hashes
+
+
+def test_members_file_source_serves_json(tmp_path):
+    file_path = tmp_path / "members.txt"
+    _write(file_path)
+    members = {f"M{i:03}": Member(id=f"M{i:03}") for i in range(3)}
+    source = MembersFileSource(str(file_path), _make_loader(members), page_size=2)
+
+    assert [member["id"] for member in json.loads(source.list_json(page=1))] == ["M000", "M001"]
+    assert [member["id"] for member in json.loads(source.list_json(page=2))] == ["M002"]
+    assert json.loads(source.list_json(page=3)) == []
+    assert json.loads(source.get_json("M001")) == members["M001"].model_dump(mode="json", by_alias=True)
+    assert source.get_json("unknown") is None
+
+
+def _member_with_contracts(member_id: str, *contracts: Contract) -> Member:
+    return Member(id=member_id, addresses=[Address(contracts=list(contracts))])
+
+
+def test_members_file_source_lists_after_cursor(tmp_path):
+    file_path = tmp_path / "members.txt"
+    _write(file_path)
+    members = {f"M{i:03d}": Member(id=f"M{i:03d}") for i in range(1, 6)}
+    source = MembersFileSource(str(file_path), _make_loader(members), page_size=2)
+
+    assert [m.id for m in source.list(after="M002")] == ["M003", "M004"]
+    assert [m.id for m in source.list(after="M0025")] == ["M003", "M004"]
+    assert [m.id for m in source.list(after="M002", page=2)] == ["M005"]
+    assert [m.id for m in source.list(after="M002", page_size=5)] == ["M003", "M004", "M005"]
+    assert source.list(after="M005") == []
+    assert source.list_json(after="M003", page_size=1) == source.get_json("M004").join((b"[", b"]"))
+
+
+def test_members_file_source_filters(tmp_path):
+    file_path = tmp_path / "members.txt"
+    _write(file_path)
+    members = {
+        "M001": _member_with_contracts("M001", _contract("E1", supplier="S1"), _contract("E2", supplier="S2")),
+        "M002": _member_with_contracts("M002", _contract("E3", supplier="S2", product="P2")),
+        "M003": _member_with_contracts(
+            "M003", _contract("E4", supplier="S2", distributor="D2", customer_type=CustomerType.NON_RESIDENTIAL)
+        ),
+        "M004": Member(id="M004"),
+    }
+    source = MembersFileSource(str(file_path), _make_loader(members), page_size=2)
+
+    assert [m.id for m in source.list(supplier="S1")] == ["M001"]
+    assert [m.id for m in source.list(supplier="S2", page_size=5)] == ["M001", "M002", "M003"]
+    assert [m.id for m in source.list(supplier="S2", page=2)] == ["M003"]
+    assert [m.id for m in source.list(supplier="S2", after="M001")] == ["M002", "M003"]
+    assert [m.id for m in source.list(supplier="S2", product="P1")] == ["M001", "M003"]
+    assert [m.id for m in source.list(supplier="S2", product="P1", page=2)] == []
+    assert [m.id for m in source.list(product="P1", distributor="D2")] == ["M003"]
+    assert [m.id for m in source.list(customer_type=CustomerType.RESIDENTIAL)] == ["M001", "M002"]
+    assert source.list(supplier="unknown") == []
+    assert json.loads(source.list_json(supplier="S2", product="P2")) == [json.loads(source.get_json("M002"))]
+
+    # list_json takes the same parameters as list and selects the same members
+    for params in [
+        {"supplier": "S2", "product": "P1", "page_size": 1, "page": 2},
+        {"distributor": "D2", "after": "M001"},
+        {"customer_type": CustomerType.RESIDENTIAL},
+    ]:
+        listed = [member.model_dump(mode="json", by_alias=True) for member in source.list(**params)]
+        assert json.loads(source.list_json(**params)) == listed
+
+
+def test_members_index_patches_filters():
+    previous = {
+        "M001": _member_with_contracts("M001", _contract("E1", supplier="S1")),
+        "M002": _member_with_contracts("M002", _contract("E2", supplier="S2")),
+        **{f"M1{i:02}": Member(id=f"M1{i:02}") for i in range(10)},
+    }
+    index = MembersIndex(previous)
+
+    members = dict(previous)
+    del members["M002"]
+    members["M001"] = _member_with_contracts("M001", _contract("E1", supplier="S3"))
+    members["M000"] = _member_with_contracts("M000", _contract("E1", supplier="S3"))
+    updated = index.updated(members)
+
+    assert updated.ids_by_filter["supplier"] == {"S3": ["M000", "M001"]}
+    assert updated.ids_by_filter["product"] == {"P1": ["M000", "M001"]}
+    # the previous index is left as is for readers still using it
+    assert index.ids_by_filter["supplier"] == {"S1": ["M001"], "S2": ["M002"]}
+    assert index.ids_by_filter["product"] == {"P1": ["M001", "M002"]}
+
+
+def test_members_file_source_get_many(tmp_path):
+    file_path = tmp_path / "members.txt"
+    _write(file_path)
+    members = {
+        "M001": _member_with_eans("M001", "E1"),
+        "M002": _member_with_eans("M002", "E1", "E2"),
+        "M003": Member(id="M003"),
+    }
+    source = MembersFileSource(str(file_path), _make_loader(members))
+
+    assert source.get_many(["M003", "unknown", "M003"]) == [members["M003"]]
+    assert source.get_many(["M002"], ["E1", "unknown"]) == [members["M002"], members["M001"]]
+    assert source.get_many([]) == []
+    assert json.loads(source.get_many_json(["M003"], ["E2"])) == [
+        json.loads(source.get_json("M003")),
+        json.loads(source.get_json("M002")),
+    ]
@@ -0,0 +1,179 @@
+import asyncio
+import datetime as dt
+import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from cofy.modules.members import (
+    Address,
+    ConnectionType,
+    Contract,
+    CustomerType,
+    Member,
+    MembersSQLiteSource,
+    NamedIdentifier,
+    write_members_database,
+)
+
+
+def _contract(ean: str) -> Contract:
+    identifier = NamedIdentifier(id="x", name="x")
+    return Contract(
+        ean=ean,
+        customer_type=CustomerType.RESIDENTIAL,
+        connection_type=ConnectionType.ELECTRICITY,
+        supplier=identifier,
+        product=identifier,
+        distributor=identifier,
+        region=identifier,
+        start_date=dt.datetime(2024, 1, 1, tzinfo=dt.UTC),
+        end_date=None,
+        last_invoice_date=None,
+        is_green=False,
+    )
+
+
+MEMBERS = [
+    Member(id="M003"),
+    Member(id="M001", activation_code="ACT-1", addresses=[Address(contracts=[_contract("E1"), _contract("E2")])]),
+    Member(id="M002", activation_code="ACT-2", addresses=[Address(contracts=[_contract("E1"), _contract("E1")])]),
+]
+
+
+@pytest.fixture
+def source(tmp_path):
+    database_path = tmp_path / "members.sqlite"
+    write_members_database(database_path, iter(MEMBERS))
+    source = MembersSQLiteSource(database_path, page_size=2, pool_size=2)
+    yield source
+    source.close()
+
+
+def _ids(members: list[Member]) -> list[str]:
+    return [member.id for member in members]
+
+
+def test_lists_members_by_id(source):
+    assert _ids(source.list()) == ["M001", "M002"]
+    assert _ids(source.list(page=2)) == ["M003"]
+    assert _ids(source.list(page_size=3)) == ["M001", "M002", "M003"]
+    assert _ids(source.list(after="M001")) == ["M002", "M003"]
+    assert _ids(source.list(after="M001", page=2)) == []
+    assert json.loads(source.list_json(after="M002")) == [MEMBERS[0].model_dump(mode="json")]
+
+
+def test_get_and_verify(source):
+    assert source.get("M001") == MEMBERS[1]
+    assert source.get("unknown") is None
+    assert json.loads(source.get_json("M002")) == MEMBERS[2].model_dump(mode="json")
+    assert source.get_json("unknown") is None
+    assert source.verify("ACT-2") == MEMBERS[2]
+    assert source.verify("unknown") is None
+
+
+def test_looks_up_eans(source):
+    assert _ids(source.get_by_ean("E1")) == ["M001", "M002"]
+    assert source.get_by_ean("unknown") == []
+    assert [contract.ean for contract in source.get_contracts("M002", "E1")] == ["E1", "E1"]
+    assert source.get_contracts("unknown", "E1") is None
+    assert source.get_contracts("M003", "E1") == []
+    assert source.get_contracts("M001", "E2") == [MEMBERS[1].addresses[0].contracts[1]]
+
+
+def test_get_many(source):
+    assert _ids(source.get_many(["M003", "unknown", "M003"], ["E1"])) == ["M003", "M001", "M002"]
+    assert _ids(source.get_many(["M002"], ["E1", "E2"])) == ["M002", "M001"]
+    assert json.loads(source.get_many_json([])) == []
+
+
+def test_replaces_database(tmp_path):
+    database_path = tmp_path / "members.sqlite"
+    write_members_database(database_path, MEMBERS)
+    write_members_database(database_path, [Member(id="M004")])
+
+    assert _ids(MembersSQLiteSource(database_path).list()) == ["M004"]
+    assert [path.name for path in tmp_path.iterdir()] == ["members.sqlite"]
+
+
+def test_reopens_connections_after_the_database_is_replaced(source):
+    version = source.version
+    assert source.get("M001") == MEMBERS[1]
+
+    write_members_database(source.database_path, [Member(id="M004")])
+
+    assert source.version != version
+    assert source.get("M001") is None
+    assert _ids(source.list()) == ["M004"]
+    assert source._opened == 1
+
+
+@pytest.mark.asyncio
+async def test_closes_the_pool_on_shutdown(source):
+    assert source.lifespan_tasks == {source: source.close_on_shutdown}
+    source.get("M001")
+    assert source._opened == 1
+
+    task = asyncio.create_task(source.close_on_shutdown())
+    await asyncio.sleep(0)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert source._opened == 0
+
+
+def test_closes_connections_in_use_when_handed_back(source):
+    with source._connection() as connection:
+        source.close()
+        assert connection.execute("SELECT count(*) FROM members").fetchone() == (3,)
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        connection.execute("SELECT 1")
+    assert source._opened == 1
+    source.close()
+    assert source._opened == 0
+
+
+def test_closes_connections_on_a_replaced_database_when_handed_back(source):
+    with source._connection() as stale:
+        write_members_database(source.database_path, [Member(id="M004")])
+        assert _ids(source.list()) == ["M004"]
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        stale.execute("SELECT 1")
+    assert _ids(source.list()) == ["M004"]
+    assert source._opened == 2
+
+
+def test_pools_connections(source):
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(source.get, ["M001", "M002", "M003"] * 20))
+
+    assert _ids(results) == ["M001", "M002", "M003"] * 20
+    assert source._opened <= 2
+    source.close()
+    assert source._opened == 0
+    assert source.get("M001") == MEMBERS[1]
+
+
+def test_connections_are_read_only(source):
+    with source._connection() as connection, pytest.raises(sqlite3.OperationalError):
+        connection.execute("DELETE FROM members")
+
+
+def test_missing_database_raises(tmp_path):
+    source = MembersSQLiteSource(tmp_path / "missing.sqlite")
+    assert source.version is None
+
+    with pytest.raises(sqlite3.OperationalError):
+        source.get("M001")
+    assert source._opened == 0
+
+
+def test_waits_for_a_free_connection(source):
+    with ThreadPoolExecutor(1) as executor, source._connection(), source._connection():
+        result = executor.submit(source.get, "M001")
+        with pytest.raises(TimeoutError):
+            result.result(timeout=0.1)
+    assert result.result() == MEMBERS[1]
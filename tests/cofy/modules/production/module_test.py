@@ -0,0 +1,41 @@
+import datetime as dt
+from zoneinfo import ZoneInfo
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from cofy.modules.production import EnergyIDClient, EnergyIDFleetProduction, EnergyIDProduction, ProductionModule
+from cofy.modules.timeseries import DefaultDataType, JSONFormat
+from tests.cofy.modules.production.sources.energyID_stub import EnergyIDStub, generated_body
+
+START = dt.datetime(2026, 2, 9, 10, 0, tzinfo=dt.UTC)
+END = dt.datetime(2026, 2, 9, 12, 0, tzinfo=dt.UTC)
+
+
+def _client() -> EnergyIDClient:
+    stub = EnergyIDStub(body=generated_body(ZoneInfo("Europe/Brussels")))
+    return EnergyIDClient("dummy_key", transport=stub.transport, backoff=0)
+
+
+def test_fleet_breakdown_is_in_the_json_response():
+    source = EnergyIDFleetProduction("dummy_key", ["a", "b"], client=_client(), breakdown=True)
+    module = ProductionModule(source=source, name="fleet")
+    assert module.formats[0].DT is source.record_model
+    app = FastAPI()
+    app.include_router(module)
+
+    response = TestClient(app).get(
+        module.prefix, params={"start": START.isoformat(), "end": END.isoformat(), "resolution": "PT1H"}
+    )
+
+    assert response.status_code == 200
+    rows = response.json()["data"]
+    assert len(rows) == 2
+    assert set(rows[0]) == {"timestamp", "value", "a", "b"}
+    assert rows[0]["value"] == rows[0]["a"] + rows[0]["b"]
+
+
+def test_single_record_keeps_the_default_formats():
+    module = ProductionModule(source=EnergyIDProduction("dummy_key", "a"))
+    assert type(module.formats[0]) is JSONFormat
+    assert module.formats[0].DT is DefaultDataType
@@ -0,0 +1,179 @@
+import asyncio
+
+import httpx
+import pytest
+
+from cofy.modules.production import EnergyIDClient
+from tests.cofy.modules.production.sources.energyID_stub import EnergyIDStub
+
+PATH = "/records/dummy_record/data/energyProduction"
+PARAMS = {"start": "2026-02-09", "end": "2026-02-10", "interval": "PT1H"}
+
+
+def test_api_key_is_required():
+    with pytest.raises(ValueError, match="API key must be provided"):
+        EnergyIDClient("")
+
+
+@pytest.mark.asyncio
+async def test_get_json_returns_body():
+    stub = EnergyIDStub()
+    client = EnergyIDClient("dummy_key", transport=stub.transport)
+
+    body = await client.get_json(PATH, PARAMS)
+
+    assert body["value"][0]["unit"] == "kWh"
+    assert stub.requests[0]["interval"] == "PT1H"
+
+
+@pytest.mark.asyncio
+async def test_retries_server_errors_with_backoff(monkeypatch):
+    delays: list[float] = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    stub = EnergyIDStub()
+    stub.failures = [503, 429]
+    client = EnergyIDClient("dummy_key", transport=stub.transport, backoff=0.5)
+
+    await client.get_json(PATH, PARAMS)
+
+    assert len(stub.requests) == 3
+    assert delays == [0.5, 1.0]
+
+
+@pytest.mark.asyncio
+async def test_gives_up_after_max_retries():
+    stub = EnergyIDStub()
+    stub.failures = [503, 503, 503]
+    client = EnergyIDClient("dummy_key", transport=stub.transport, max_retries=2, backoff=0)
+
+    with pytest.raises(ValueError, match="Failed to fetch data from EnergyID API: 503"):
+        await client.get_json(PATH, PARAMS)
+    assert len(stub.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_retries_transport_errors():
+    attempts = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise httpx.ConnectTimeout("timed out", request=request)
+        return httpx.Response(200, json={"ok": True})
+
+    client = EnergyIDClient("dummy_key", transport=httpx.MockTransport(handler), backoff=0)
+
+    assert await client.get_json(PATH) == {"ok": True}
+    assert attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_transport_errors_raise_value_error_after_max_retries():
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("connection refused", request=request)
+
+    client = EnergyIDClient("dummy_key", transport=httpx.MockTransport(handler), max_retries=1, backoff=0)
+
+    with pytest.raises(ValueError, match="Failed to fetch data from EnergyID API: ConnectError"):
+        await client.get_json(PATH)
+
+
+@pytest.mark.asyncio
+async def test_connection_pool_is_reused_and_closed():
+    stub = EnergyIDStub()
+    client = EnergyIDClient("dummy_key", transport=stub.transport, max_connections=2)
+
+    await client.get_json(PATH, PARAMS)
+    pooled = client._client
+    await client.get_json(PATH, PARAMS)
+
+    assert pooled is not None
+    assert client._client is pooled
+    await client.aclose()
+    assert client._client is None
+    assert pooled.is_closed
+    # closing twice is a no-op
+    await client.aclose()
+
+
+def test_new_event_loop_gets_a_new_pool():
+    stub = EnergyIDStub()
+    client = EnergyIDClient("dummy_key", transport=stub.transport)
+
+    async def pool():
+        await client.get_json(PATH, PARAMS)
+        return client._client
+
+    first = asyncio.run(pool())
+    second = asyncio.run(pool())
+
+    assert first is not second
+    # the pool of the finished loop is closed when it is replaced
+    assert first.is_closed
+    assert not second.is_closed
+
+
+@pytest.mark.asyncio
+async def test_stale_pool_is_closed_on_its_running_loop():
+    stub = EnergyIDStub()
+    client = EnergyIDClient("dummy_key", transport=stub.transport)
+    await client.get_json(PATH, PARAMS)
+    pooled = client._client
+
+    def in_other_loop():
+        asyncio.run(client.get_json(PATH, PARAMS))
+
+    await asyncio.to_thread(in_other_loop)
+    # the close was handed to this loop, let it run
+    for _ in range(100):
+        if pooled.is_closed:
+            break
+        await asyncio.sleep(0)
+
+    assert pooled.is_closed
+    assert client._client is not pooled
+
+
+@pytest.mark.asyncio
+async def test_failing_close_of_stale_pool_is_ignored(monkeypatch):
+    stub = EnergyIDStub()
+    client = EnergyIDClient("dummy_key", transport=stub.transport)
+
+    async def broken_close():
+        raise RuntimeError("Event loop is closed")
+
+    client._client = httpx.AsyncClient(transport=stub.transport)
+    client._loop = asyncio.new_event_loop()
+    client._loop.close()
+    monkeypatch.setattr(client._client, "aclose", broken_close)
+
+    assert await client.get_json(PATH, PARAMS)
+
+
+@pytest.mark.asyncio
+async def test_close_on_shutdown_closes_pool():
+    stub = EnergyIDStub()
+    client = EnergyIDClient("dummy_key", transport=stub.transport)
+    await client.get_json(PATH, PARAMS)
+    pooled = client._client
+
+    task = asyncio.create_task(client.close_on_shutdown())
+    await asyncio.sleep(0)
+    assert not pooled.is_closed
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    assert pooled.is_closed
+    assert client._client is None
+
+
+@pytest.mark.asyncio
+async def test_get_bytes_returns_raw_body():
+    stub = EnergyIDStub(body={"ok": True})
+    client = EnergyIDClient("dummy_key", transport=stub.transport, backoff=0)
+    assert await client.get_bytes(PATH, PARAMS) == b'{"ok": true}'
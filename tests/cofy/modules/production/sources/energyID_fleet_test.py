@@ -0,0 +1,126 @@
+import asyncio
+import datetime as dt
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from cofy.modules.production import EnergyIDClient, EnergyIDFleetProduction, EnergyIDProduction
+from tests.cofy.modules.production.sources.energyID_stub import EnergyIDStub, generated_body
+
+BRUSSELS = ZoneInfo("Europe/Brussels")
+START = dt.datetime(2026, 2, 9, 10, 0, tzinfo=dt.UTC)
+END = dt.datetime(2026, 2, 9, 12, 0, tzinfo=dt.UTC)
+
+
+def test_record_ids_are_validated():
+    with pytest.raises(ValueError, match="At least one record ID"):
+        EnergyIDFleetProduction("dummy_key", [])
+    with pytest.raises(ValueError, match="unique"):
+        EnergyIDFleetProduction("dummy_key", ["a", "a"])
+    with pytest.raises(ValueError, match="concurrency"):
+        EnergyIDFleetProduction("dummy_key", ["a"], max_concurrency=0)
+
+
+def test_records_share_one_client():
+    source = EnergyIDFleetProduction("dummy_key", ["a", "b"])
+    assert all(record.client is source.client for record in source.records.values())
+    assert source.supported_resolutions == EnergyIDProduction.SUPPORTED_RESOLUTIONS
+    assert source.lifespan_tasks == {source.client: source.client.close_on_shutdown}
+
+
+@pytest.fixture
+def stub():
+    generated = generated_body(BRUSSELS)
+
+    def body(record_id, start, end, interval):
+        # record "b" produces twice as much as "a", "c" has no data
+        response = generated(record_id, start, end, interval)
+        data = response["value"][0]["data"]
+        factor = {"a": 1, "b": 2, "c": 0}[record_id]
+        response["value"][0]["data"] = [{**point, "total": point["total"] * factor} for point in data if factor]
+        return response
+
+    return EnergyIDStub(body=body)
+
+
+@pytest.fixture
+def client(stub):
+    return EnergyIDClient("dummy_key", transport=stub.transport, backoff=0)
+
+
+def _hours():
+    return [START.timestamp() / 3600, START.timestamp() / 3600 + 1]
+
+
+@pytest.mark.asyncio
+async def test_fetch_timeseries_sums_records(stub, client):
+    source = EnergyIDFleetProduction("dummy_key", ["a", "b", "c"], client=client)
+    ts = await source.fetch_timeseries(START, END, dt.timedelta(hours=1))
+
+    assert ts.frame.columns == ["timestamp", "value"]
+    assert ts.frame["value"].to_list() == [3 * hour for hour in _hours()]
+    assert ts.metadata == {"unit": "kWh"}
+    assert sorted(request["record_id"] for request in stub.requests) == ["a", "b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_fetch_timeseries_breakdown(client):
+    source = EnergyIDFleetProduction("dummy_key", ["a", "b", "c"], client=client, breakdown=True)
+    ts = await source.fetch_timeseries(START, END, dt.timedelta(hours=1))
+
+    assert ts.frame.columns == ["timestamp", "value", "a", "b", "c"]
+    assert ts.frame["a"].to_list() == _hours()
+    assert ts.frame["b"].to_list() == [2 * hour for hour in _hours()]
+    assert ts.frame["c"].to_list() == [None, None]
+    assert set(source.record_model.model_fields) == {"timestamp", "value", "a", "b", "c"}
+    assert source.record_model is source.record_model
+
+
+@pytest.mark.asyncio
+async def test_fetch_timeseries_aligns_timestamps(stub, client):
+    def body(record_id, start, end, interval):
+        points = {
+            "a": [("2026-02-09T11:00:00+01:00", 1.0), ("2026-02-09T12:00:00+01:00", 2.0)],
+            "b": [("2026-02-09T12:00:00+01:00", 3.0), ("2026-02-09T13:00:00+01:00", 4.0)],
+        }[record_id]
+        return {"value": [{"unit": "kWh", "data": [{"timestamp": t, "total": v} for t, v in points]}]}
+
+    stub.body = body
+    source = EnergyIDFleetProduction("dummy_key", ["a", "b"], client=client)
+    ts = await source.fetch_timeseries(START, START + dt.timedelta(hours=3), dt.timedelta(hours=1))
+
+    assert ts.frame["timestamp"].to_list() == [START + dt.timedelta(hours=h) for h in range(3)]
+    assert ts.frame["value"].to_list() == [1.0, 5.0, 4.0]
+    assert source.record_model.model_fields.keys() == {"timestamp", "value"}
+
+
+@pytest.mark.asyncio
+async def test_fetch_timeseries_caps_concurrency(client):
+    source = EnergyIDFleetProduction("dummy_key", [f"a{i}" for i in range(6)], client=client, max_concurrency=2)
+    in_flight = 0
+    peak = 0
+
+    async def get_bytes(path, params=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return b'{"value": [{"unit": "kWh", "data": []}]}'
+
+    client.get_bytes = get_bytes
+    ts = await source.fetch_timeseries(START, END, dt.timedelta(hours=1))
+
+    assert peak == 2
+    assert len(ts.frame) == 0
+
+
+@pytest.mark.asyncio
+async def test_fetch_timeseries_rejects_mixed_units(stub, client):
+    def body(record_id, start, end, interval):
+        return {"value": [{"unit": "kWh" if record_id == "a" else "Wh", "data": []}]}
+
+    stub.body = body
+    source = EnergyIDFleetProduction("dummy_key", ["a", "b"], client=client)
+    with pytest.raises(ValueError, match="different units: Wh, kWh"):
+        await source.fetch_timeseries(START, END, dt.timedelta(hours=1))
@@ -1,18 +1,16 @@
+import asyncio
 import datetime as dt
-import json
-from importlib import resources
-from unittest.mock import MagicMock, patch
+from zoneinfo import ZoneInfo
 
 import narwhals as nw
 import pytest
+from isodate import Duration
 
-from cofy.modules.production import EnergyIDProduction
+from cofy.modules.production import EnergyIDClient, EnergyIDProduction, EnergyIDStore
+from tests.cofy.modules.production.sources.energyID_stub import EnergyIDStub, generated_body
 
-EXAMPLE_JSON_NAME = "energyID_production_example.json"
-EXAMPLE_JSON_PATH = resources.files("tests.cofy.modules.production.sources").joinpath(EXAMPLE_JSON_NAME)
-# Load the example JSON response
-with open(str(EXAMPLE_JSON_PATH)) as f:
-    EXAMPLE_JSON = json.load(f)
+BRUSSELS = ZoneInfo("Europe/Brussels")
+DAY = dt.timedelta(days=1)
 
 
 def test_api_key_is_required():
@@ -25,41 +23,26 @@ def test_record_id_is_required():
         EnergyIDProduction(api_key="dummy_key", record_id="")
 
 
-def test_supported_resolutions(mock_requests_get):
+def test_supported_resolutions():
     source = EnergyIDProduction("dummy_key", "dummy_record")
     assert source.supported_resolutions == EnergyIDProduction.SUPPORTED_RESOLUTIONS
 
 
 @pytest.fixture
-def mock_requests_get():
-    """Fixture to mock requests.get for both API key check and data fetch."""
-
-    def _mocked_requests_get(url, headers=None, *args, **kwargs):
-        # API key check endpoint
-        if url.startswith("https://api.energyid.eu/api/v1/members/me"):
-            mock_resp = MagicMock()
-            mock_resp.status_code = 200
-            return mock_resp
-        # Data fetch endpoint
-        elif url.startswith("https://api.energyid.eu/api/v1/records/"):
-            mock_resp = MagicMock()
-            mock_resp.status_code = 200
-            mock_resp.json.return_value = EXAMPLE_JSON
-            return mock_resp
-        else:
-            raise ValueError(f"Unexpected URL: {url}")
-
-    with patch("requests.get", side_effect=_mocked_requests_get):
-        yield
-
-
-@pytest.mark.asyncio
-async def test_fetch_timeseries_success(mock_requests_get):
-    api_key = "dummy_key"
-    record_id = "dummy_record"
-    source = EnergyIDProduction(api_key, record_id)
-    start = dt.datetime(2026, 2, 9, 0, 0)
-    end = dt.datetime(2026, 2, 10, 0, 0)
+def stub():
+    return EnergyIDStub()
+
+
+@pytest.fixture
+def source(stub):
+    client = EnergyIDClient("dummy_key", transport=stub.transport, backoff=0)
+    return EnergyIDProduction("dummy_key", "dummy_record", client=client)
+
+
+@pytest.mark.asyncio
+async def test_fetch_timeseries_success(stub, source):
+    start = dt.datetime(2026, 2, 9, 0, 0, tzinfo=BRUSSELS)
+    end = dt.datetime(2026, 2, 10, 0, 0, tzinfo=BRUSSELS)
     resolution = dt.timedelta(hours=1)
     ts = await source.fetch_timeseries(start, end, resolution)
 
@@ -73,39 +56,304 @@ async def test_fetch_timeseries_success(mock_requests_get):
     row = ts.frame.row(0)
     assert row[1] == 0.000655
     assert row[0] == dt.datetime.fromisoformat("2026-02-09T00:00:00+01:00")
+    # Check the request that reached the API: the local days overlapping the UTC day blocks of the window
+    assert stub.requests == [
+        {"record_id": "dummy_record", "start": "2026-02-08", "end": "2026-02-11", "interval": "PT1H"}
+    ]
 
 
 @pytest.mark.asyncio
-async def test_fetch_timeseries_api_error(mock_requests_get):
-    api_key = "dummy_key"
-    record_id = "dummy_record"
-    source = EnergyIDProduction(api_key, record_id)
+async def test_fetch_timeseries_api_error(stub, source):
+    stub.api_key = "other_key"
     start = dt.datetime(2026, 2, 9, 0, 0)
     end = dt.datetime(2026, 2, 10, 0, 0)
     resolution = dt.timedelta(hours=1)
 
-    # Mock the data fetch to return an error
-    def _mocked_requests_get(url, headers=None, *args, **kwargs):
-        if url.startswith("https://api.energyid.eu/api/v1/records/"):
-            mock_resp = MagicMock()
-            mock_resp.status_code = 500
-            mock_resp.text = "Internal Server Error"
-            return mock_resp
-
-    with (
-        patch("requests.get", side_effect=_mocked_requests_get),
-        pytest.raises(ValueError, match="Failed to fetch data from EnergyID API"),
-    ):
+    with pytest.raises(ValueError, match="Failed to fetch data from EnergyID API: 401"):
         await source.fetch_timeseries(start, end, resolution)
+    # client errors are not retried
+    assert len(stub.requests) == 1
 
 
 @pytest.mark.asyncio
-async def test_fetch_timeseries_invalid_resolution(mock_requests_get):
-    api_key = "dummy_key"
-    record_id = "dummy_record"
-    source = EnergyIDProduction(api_key, record_id)
+async def test_fetch_timeseries_invalid_resolution(source):
     start = dt.datetime(2026, 2, 9, 0, 0)
     end = dt.datetime(2026, 2, 10, 0, 0)
     bad_resolution = dt.timedelta(hours=2)
     with pytest.raises(ValueError, match="Resolution PT2H is not supported"):
         await source.fetch_timeseries(start, end, bad_resolution)
+
+
+@pytest.fixture
+def generated_source(stub):
+    stub.body = generated_body(BRUSSELS)
+    client = EnergyIDClient("dummy_key", transport=stub.transport, backoff=0)
+    return EnergyIDProduction("dummy_key", "dummy_record", client=client)
+
+
+def _values(ts):
+    return ts.frame["value"].to_list()
+
+
+def _hours(start, end, step=dt.timedelta(minutes=15)):
+    values = []
+    while start < end:
+        values.append(start.timestamp() / 3600)
+        start += step
+    return values
+
+
+@pytest.mark.asyncio
+async def test_fetch_timeseries_trims_to_window(stub, generated_source):
+    start = dt.datetime(2026, 2, 9, 10, 5, tzinfo=dt.UTC)
+    end = dt.datetime(2026, 2, 9, 11, 0, tzinfo=dt.UTC)
+    ts = await generated_source.fetch_timeseries(start, end, dt.timedelta(minutes=15))
+
+    assert _values(ts) == _hours(dt.datetime(2026, 2, 9, 10, 15, tzinfo=dt.UTC), end)
+    assert ts.frame["timestamp"].to_list()[0] == dt.datetime(2026, 2, 9, 10, 15, tzinfo=dt.UTC)
+
+
+@pytest.mark.asyncio
+async def test_intraday_polls_hit_upstream_once_per_day_block(stub, generated_source):
+    resolution = dt.timedelta(minutes=15)
+    start = dt.datetime(2026, 2, 9, 10, 0, tzinfo=dt.UTC)
+    for minutes in range(0, 120, 15):
+        poll = start + dt.timedelta(minutes=minutes)
+        ts = await generated_source.fetch_timeseries(poll, poll + dt.timedelta(hours=1), resolution)
+        assert _values(ts) == _hours(poll, poll + dt.timedelta(hours=1))
+    assert stub.requests == [
+        {"record_id": "dummy_record", "start": "2026-02-09", "end": "2026-02-11", "interval": "PT15M"}
+    ]
+
+    # only the days that are not cached yet are fetched, in a single call
+    end = dt.datetime(2026, 2, 12, tzinfo=dt.UTC)
+    ts = await generated_source.fetch_timeseries(start, end, resolution)
+    assert _values(ts) == _hours(start, end)
+    assert stub.requests[1:] == [
+        {"record_id": "dummy_record", "start": "2026-02-10", "end": "2026-02-13", "interval": "PT15M"}
+    ]
+
+    # every interval has its own blocks
+    await generated_source.fetch_timeseries(start, start + dt.timedelta(hours=1), dt.timedelta(hours=1))
+    assert len(stub.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_day_blocks_are_fetched_as_the_local_days_of_the_record(stub):
+    new_york = ZoneInfo("America/New_York")
+    stub.body = generated_body(new_york)
+    client = EnergyIDClient("dummy_key", transport=stub.transport, backoff=0)
+    source = EnergyIDProduction("dummy_key", "dummy_record", client=client, timezone=new_york)
+    start = dt.datetime(2026, 2, 9, 10, 0, tzinfo=dt.UTC)
+
+    ts = await source.fetch_timeseries(start, start + dt.timedelta(hours=1), dt.timedelta(minutes=15))
+
+    assert _values(ts) == _hours(start, start + dt.timedelta(hours=1))
+    # the UTC day of the 9th starts on the local evening of the 8th
+    assert stub.requests == [
+        {"record_id": "dummy_record", "start": "2026-02-08", "end": "2026-02-10", "interval": "PT15M"}
+    ]
+
+
+@pytest.mark.asyncio
+async def test_expired_blocks_are_refetched(stub, generated_source):
+    generated_source.cache.ttl = dt.timedelta(0)
+    start = dt.datetime(2026, 2, 9, 10, 0, tzinfo=dt.UTC)
+    end = dt.datetime(2026, 2, 9, 11, 0, tzinfo=dt.UTC)
+    await generated_source.fetch_timeseries(start, end, dt.timedelta(minutes=15))
+    await generated_source.fetch_timeseries(start, end, dt.timedelta(minutes=15))
+    assert len(stub.requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_clear_and_eviction(stub, generated_source):
+    generated_source.cache.max_blocks = 1
+    start = dt.datetime(2026, 2, 9, 10, 0, tzinfo=dt.UTC)
+    end = dt.datetime(2026, 2, 9, 11, 0, tzinfo=dt.UTC)
+    await generated_source.fetch_timeseries(start, end, dt.timedelta(minutes=15))
+    await generated_source.fetch_timeseries(start + DAY, end + DAY, dt.timedelta(minutes=15))
+    assert len(generated_source.cache._blocks) == 1
+
+    await generated_source.fetch_timeseries(start, end, dt.timedelta(minutes=15))
+    assert len(stub.requests) == 3
+
+    generated_source.clear()
+    assert len(generated_source.cache._blocks) == 0
+
+
+@pytest.mark.asyncio
+async def test_fetch_timeseries_across_dst(stub, generated_source):
+    start = dt.datetime(2026, 3, 29, tzinfo=BRUSSELS)
+    end = dt.datetime(2026, 3, 30, tzinfo=BRUSSELS)
+    ts = await generated_source.fetch_timeseries(start, end, dt.timedelta(hours=1))
+    assert _values(ts) == _hours(start.astimezone(dt.UTC), end.astimezone(dt.UTC), dt.timedelta(hours=1))
+    assert len(ts.frame) == 23
+
+
+@pytest.mark.asyncio
+async def test_fetch_timeseries_empty_window(stub, generated_source):
+    start = dt.datetime(2026, 2, 9, 10, 0, tzinfo=dt.UTC)
+    ts = await generated_source.fetch_timeseries(start, start - dt.timedelta(hours=1), dt.timedelta(minutes=15))
+    assert len(ts.frame) == 0
+    assert set(ts.frame.columns) == {"timestamp", "value"}
+
+
+@pytest.mark.asyncio
+async def test_coarse_resolutions_bypass_the_cache(stub, source):
+    start = dt.datetime(2026, 1, 15, tzinfo=dt.UTC)
+    end = dt.datetime(2026, 3, 1, tzinfo=dt.UTC)
+    ts = await source.fetch_timeseries(start, end, Duration(months=1))
+    await source.fetch_timeseries(start, end, Duration(months=1))
+
+    # the whole response is returned, even the points before start
+    assert len(ts.frame) == 24
+    assert (
+        stub.requests
+        == [{"record_id": "dummy_record", "start": "2026-01-15", "end": "2026-03-01", "interval": "P1M"}] * 2
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("body", "message"),
+    [
+        ({"value": []}, "no data entry"),
+        ({"value": [{"unit": "kWh"}]}, "no data entry"),
+        ({"value": [{"unit": "kWh", "data": [{"timestamp": "yesterday", "total": 1.0}]}]}, "appropriate format"),
+    ],
+)
+async def test_fetch_timeseries_invalid_response(stub, source, body, message):
+    stub.body = body
+    start = dt.datetime(2026, 2, 9, 0, 0, tzinfo=dt.UTC)
+    with pytest.raises(ValueError, match=message):
+        await source.fetch_timeseries(start, start + dt.timedelta(hours=1), dt.timedelta(hours=1))
+
+
+@pytest.mark.asyncio
+async def test_fetch_timeseries_without_unit(stub, source):
+    stub.body = {"value": [{"data": [{"timestamp": "2026-02-09T00:00:00+00:00", "total": 1.5}]}]}
+    start = dt.datetime(2026, 2, 9, 0, 0, tzinfo=dt.UTC)
+    ts = await source.fetch_timeseries(start, start + dt.timedelta(hours=1), dt.timedelta(hours=1))
+    assert ts.metadata["unit"] == "unknown"
+    assert ts.frame.rows() == [(start, 1.5)]
+
+
+@pytest.mark.asyncio
+async def test_fetch_timeseries_parses_iso_timestamps(stub, source):
+    # any ISO 8601 timestamp is accepted, also in UTC designated by Z and with fractional seconds
+    stub.body = {
+        "value": [
+            {
+                "unit": "kWh",
+                "data": [
+                    {"timestamp": "2026-02-09T00:00:00Z", "total": 1.5},
+                    {"timestamp": "2026-02-09T00:15:00.000Z", "total": 2.5},
+                ],
+            }
+        ]
+    }
+    start = dt.datetime(2026, 2, 9, 0, 0, tzinfo=dt.UTC)
+    ts = await source.fetch_timeseries(start, start + dt.timedelta(hours=1), dt.timedelta(minutes=15))
+    assert ts.frame.rows() == [(start, 1.5), (start + dt.timedelta(minutes=15), 2.5)]
+
+
+@pytest.fixture
+def synced_source(stub):
+    stub.body = generated_body(BRUSSELS)
+    client = EnergyIDClient("dummy_key", transport=stub.transport, backoff=0)
+    since = dt.datetime.now(dt.UTC).replace(minute=0, second=0, microsecond=0) - dt.timedelta(days=2)
+    return EnergyIDProduction("dummy_key", "dummy_record", client=client, store=EnergyIDStore(since))
+
+
+@pytest.mark.asyncio
+async def test_sync_fetches_only_new_data(stub, synced_source):
+    store = synced_source.store
+    await synced_source.sync()
+
+    assert len(stub.requests) == 1
+    assert store.frame["timestamp"][0] == store.since
+    assert store.last_timestamp > dt.datetime.now(dt.UTC) - dt.timedelta(minutes=15)
+    assert store.last_date == store.last_timestamp.astimezone(BRUSSELS).date()
+
+    # only the local day of the last stored point is fetched again
+    stored = store.frame
+    await synced_source.sync()
+    assert stub.requests[1]["start"] == stored["timestamp"][-1].astimezone(BRUSSELS).date().isoformat()
+    assert stub.requests[1]["interval"] == "PT15M"
+    assert store.frame.slice(0, len(stored) - 1).equals(stored.slice(0, len(stored) - 1))
+
+
+@pytest.mark.asyncio
+async def test_sync_catches_up_in_chunks(stub, synced_source):
+    synced_source.store.chunk = dt.timedelta(days=1)
+    await synced_source.sync()
+    # since lies two days and some minutes before now
+    assert len(stub.requests) == 3
+    assert synced_source.store.frame["timestamp"].is_sorted()
+    assert synced_source.store.frame["timestamp"].is_unique().all()
+
+
+@pytest.mark.asyncio
+async def test_requests_are_served_from_store(stub, synced_source):
+    since = synced_source.store.since
+    # nothing is stored yet, so the API is used
+    ts = await synced_source.fetch_timeseries(since, since + dt.timedelta(hours=1), dt.timedelta(minutes=15))
+    assert len(ts.frame) == 4
+    assert len(stub.requests) == 1
+
+    await synced_source.sync()
+    requests = len(stub.requests)
+
+    ts = await synced_source.fetch_timeseries(since, since + dt.timedelta(hours=1), dt.timedelta(minutes=15))
+    assert ts.frame["value"].to_list() == _hours(since, since + dt.timedelta(hours=1))
+    assert ts.metadata == {"unit": "kWh"}
+    ts = await synced_source.fetch_timeseries(since, since + dt.timedelta(hours=2), dt.timedelta(hours=1))
+    assert ts.frame["value"].to_list() == [
+        sum(_hours(since + dt.timedelta(hours=h), since + dt.timedelta(hours=h + 1))) for h in range(2)
+    ]
+    assert len(stub.requests) == requests
+
+    # a window ending after the last synced point is served from the store up to that point
+    last = synced_source.store.last_timestamp
+    ts = await synced_source.fetch_timeseries(last - dt.timedelta(hours=1), last + DAY, dt.timedelta(minutes=15))
+    assert ts.frame["timestamp"].to_list()[-1] == last
+    assert len(ts.frame) == 5
+    assert len(stub.requests) == requests
+
+    # windows starting before the stored data come from the API
+    synced_source.clear()
+    await synced_source.fetch_timeseries(since - dt.timedelta(hours=1), since, dt.timedelta(minutes=15))
+    assert len(stub.requests) == requests + 1
+
+    # daily values follow the local days of the record, so they still come from the API
+    await synced_source.fetch_timeseries(since, since + dt.timedelta(days=1), dt.timedelta(days=1))
+    assert len(stub.requests) == requests + 2
+
+
+@pytest.mark.asyncio
+async def test_sync_requires_store(source):
+    assert source.lifespan_tasks == {source.client: source.client.close_on_shutdown}
+    with pytest.raises(ValueError, match="A store must be provided"):
+        await source.sync()
+
+
+@pytest.mark.asyncio
+async def test_run_sync_keeps_going_after_failures(stub, synced_source, monkeypatch, caplog):
+    assert synced_source.lifespan_tasks == {
+        synced_source.client: synced_source.client.close_on_shutdown,
+        synced_source.store: synced_source.run_sync,
+    }
+    stub.api_key = "other_key"
+    delays = []
+
+    async def sleep(delay):
+        delays.append(delay)
+        if len(delays) == 2:
+            raise asyncio.CancelledError
+
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+    with pytest.raises(asyncio.CancelledError):
+        await synced_source.run_sync()
+
+    assert delays == [900.0, 900.0]
+    assert "Failed to sync EnergyID record dummy_record" in caplog.text
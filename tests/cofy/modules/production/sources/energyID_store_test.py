@@ -0,0 +1,86 @@
+import datetime as dt
+
+import polars as pl
+import pytest
+
+from cofy.modules.production import EnergyIDStore
+
+SINCE = dt.datetime(2026, 2, 9, tzinfo=dt.UTC)
+QUARTER = dt.timedelta(minutes=15)
+
+
+def _frame(start: dt.datetime, count: int, value: float = 1.0) -> pl.DataFrame:
+    return pl.DataFrame(
+        {
+            "timestamp": [start + i * QUARTER for i in range(count)],
+            "value": [value] * count,
+        },
+        schema={"timestamp": pl.Datetime("us", "UTC"), "value": pl.Float64},
+    )
+
+
+def test_resolution_is_validated():
+    with pytest.raises(ValueError, match="Resolution P1D can not be stored"):
+        EnergyIDStore(SINCE, resolution="P1D")
+
+
+def test_naive_since_is_utc():
+    assert EnergyIDStore(dt.datetime(2026, 2, 9)).since == SINCE
+
+
+def test_append_replaces_from_first_new_timestamp():
+    store = EnergyIDStore(SINCE)
+    assert store.last_timestamp is None
+
+    store.append(_frame(SINCE, 8, value=1.0), "kWh")
+    store.append(_frame(SINCE + 4 * QUARTER, 8, value=2.0), "kWh")
+    store.append(_frame(SINCE, 0), "Wh")
+
+    assert store.frame["value"].to_list() == [1.0] * 4 + [2.0] * 8
+    assert store.last_timestamp == SINCE + 11 * QUARTER
+    assert store.unit == "kWh"
+
+
+def test_read_slices_and_aggregates():
+    store = EnergyIDStore(SINCE)
+    store.append(_frame(SINCE, 12), "kWh")
+
+    quarters = store.read(SINCE + QUARTER, SINCE + 3 * QUARTER, QUARTER)
+    assert quarters["timestamp"].to_list() == [SINCE + QUARTER, SINCE + 2 * QUARTER]
+
+    hours = store.read(SINCE, SINCE + dt.timedelta(hours=3), dt.timedelta(hours=1))
+    assert hours.rows() == [(SINCE + dt.timedelta(hours=h), 4.0) for h in range(3)]
+
+    assert len(store.read(SINCE + QUARTER, SINCE, QUARTER)) == 0
+    # the window must start within the stored data
+    assert len(store.read(SINCE, SINCE + 12 * QUARTER, QUARTER)) == 12
+    assert store.read(SINCE - QUARTER, SINCE + QUARTER, QUARTER) is None
+    assert EnergyIDStore(SINCE).read(SINCE, SINCE, QUARTER) is None
+    assert store.read(SINCE, SINCE + dt.timedelta(days=1), dt.timedelta(days=1)) is None
+    assert store.read(SINCE, SINCE + dt.timedelta(hours=1), dt.timedelta(minutes=5)) is None
+
+
+def test_read_past_last_timestamp_returns_stored_rows():
+    store = EnergyIDStore(SINCE)
+    store.append(_frame(SINCE, 12), "kWh")
+
+    # nothing is synced after the last timestamp yet, so the window is served up to it
+    quarters = store.read(SINCE + 10 * QUARTER, SINCE + dt.timedelta(days=1), QUARTER)
+    assert quarters["timestamp"].to_list() == [SINCE + 10 * QUARTER, SINCE + 11 * QUARTER]
+
+    hours = store.read(SINCE + dt.timedelta(hours=2), SINCE + dt.timedelta(hours=6), dt.timedelta(hours=1))
+    assert hours.rows() == [(SINCE + dt.timedelta(hours=2), 4.0)]
+
+
+def test_store_is_persisted(tmp_path):
+    path = tmp_path / "record.parquet"
+    store = EnergyIDStore(SINCE, path=path)
+    store.append(_frame(SINCE, 4), "kWh")
+    assert EnergyIDStore(SINCE, path=path).last_date is None
+
+    store.append(_frame(SINCE, 4), "kWh", dt.date(2026, 2, 9))
+    reloaded = EnergyIDStore(SINCE, path=path)
+    assert reloaded.frame.equals(store.frame)
+    assert reloaded.unit == "kWh"
+    assert reloaded.last_date == dt.date(2026, 2, 9)
+    assert [p.name for p in tmp_path.iterdir()] == ["record.parquet"]
@@ -0,0 +1,64 @@
+"""A local stand-in for the EnergyID API, served in-process through httpx.ASGITransport."""
+
+import datetime as dt
+import json
+from collections.abc import Callable
+from importlib import resources
+
+import httpx
+from fastapi import FastAPI, Header, Response
+
+EXAMPLE_JSON_NAME = "energyID_production_example.json"
+EXAMPLE_JSON_PATH = resources.files("tests.cofy.modules.production.sources").joinpath(EXAMPLE_JSON_NAME)
+with open(str(EXAMPLE_JSON_PATH)) as f:
+    EXAMPLE_JSON = json.load(f)
+
+
+class EnergyIDStub:
+    def __init__(self, api_key: str = "dummy_key", body: dict | Callable[[str, str, str, str], dict] | None = None):
+        self.api_key = api_key
+        self.body = body if body is not None else EXAMPLE_JSON
+        # status codes to answer with before serving the data, e.g. [503, 503]
+        self.failures: list[int] = []
+        self.requests: list[dict] = []
+        self.app = FastAPI()
+        self.app.add_api_route("/api/v1/records/{record_id}/data/energyProduction", self.energy_production)
+
+    def energy_production(
+        self, record_id: str, start: str, end: str, interval: str, authorization: str = Header()
+    ) -> Response:
+        self.requests.append({"record_id": record_id, "start": start, "end": end, "interval": interval})
+        if authorization != f"apikey {self.api_key}":
+            return Response(status_code=401, content="Unauthorized")
+        if self.failures:
+            return Response(status_code=self.failures.pop(0), content="Service Unavailable")
+        body = self.body(record_id, start, end, interval) if callable(self.body) else self.body
+        return Response(content=json.dumps(body), media_type="application/json")
+
+    @property
+    def transport(self) -> httpx.AsyncBaseTransport:
+        return httpx.ASGITransport(app=self.app)
+
+
+def generated_body(timezone: dt.tzinfo) -> Callable[[str, str, str, str], dict]:
+    """A body that answers with a point per interval for the requested local days up to now, valued by its UTC epoch hours."""
+
+    def body(record_id: str, start: str, end: str, interval: str) -> dict:
+        step = {
+            "PT5M": dt.timedelta(minutes=5),
+            "PT15M": dt.timedelta(minutes=15),
+            "PT1H": dt.timedelta(hours=1),
+            "P1D": dt.timedelta(days=1),
+        }
+        current = dt.datetime.combine(dt.date.fromisoformat(start), dt.time(0), tzinfo=timezone)
+        stop = min(
+            dt.datetime.combine(dt.date.fromisoformat(end), dt.time(0), tzinfo=timezone),
+            dt.datetime.now(dt.UTC),
+        )
+        data = []
+        while current < stop:
+            data.append({"timestamp": current.isoformat(), "total": current.timestamp() / 3600})
+            current = (current.astimezone(dt.UTC) + step[interval]).astimezone(timezone)
+        return {"value": [{"unit": "kWh", "data": data}]}
+
+    return body
@@ -1,18 +1,34 @@
 import datetime as dt
+import json
+import time
 from datetime import UTC, timedelta
 from unittest.mock import patch
 
+import narwhals as nw
 import pandas as pd
+import polars as pl
+import pytest
+from fastapi import Response
 
 from cofy.modules.tariff import (
     KiwattFormat,
     PriceRecordModel,
     ResponseModel,
     to_utc_timestring,
+    to_utc_timestrings,
 )
 from cofy.modules.timeseries import Timeseries
 
 
+@pytest.fixture
+def new_york_local_time(monkeypatch):
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
 def _make_timeseries(start: dt.datetime, end: dt.datetime, resolution: timedelta = timedelta(hours=1)) -> Timeseries:
     steps = int((end - start) / resolution)
     data = [{"timestamp": start + resolution * i, "value": 10.0 + i} for i in range(steps)]
@@ -49,6 +65,38 @@ class TestToUtcTimestring:
         result = to_utc_timestring("2026-01-01T13:00:00+01:00")
         assert result == "2026-01-01T12:00:00+00:00"
 
+    @pytest.mark.parametrize(
+        "naive", [dt.datetime(2026, 7, 1, 12, 0), pd.Timestamp("2026-07-01T12:00"), "2026-07-01T12:00"]
+    )
+    def test_naive_input_is_local_time(self, naive, new_york_local_time):
+        assert to_utc_timestring(naive) == "2026-07-01T16:00:00+00:00"
+
+
+class TestToUtcTimestrings:
+    @pytest.mark.parametrize("native", [pd.DataFrame, pl.DataFrame])
+    def test_matches_to_utc_timestring(self, native):
+        cet = dt.timezone(timedelta(hours=1))
+        timestamps = [
+            dt.datetime(2026, 1, 1, 13, 0, 0, tzinfo=cet),
+            dt.datetime(2026, 1, 1, 13, 15, 0, 123456, tzinfo=cet),
+        ]
+        frame = nw.from_native(native({"timestamp": timestamps, "value": [1.0, 2.0]}))
+
+        result = to_utc_timestrings(frame)
+
+        assert result is not None
+        assert result.to_list() == [to_utc_timestring(t) for t in timestamps]
+
+    def test_returns_none_for_naive_timestamps(self):
+        frame = nw.from_native(pd.DataFrame({"timestamp": [dt.datetime(2026, 1, 1, 12, 0)], "value": [1.0]}))
+
+        assert to_utc_timestrings(frame) is None
+
+    def test_returns_none_for_non_datetime_column(self):
+        frame = nw.from_native(pd.DataFrame({"timestamp": ["2026-01-01T12:00:00+00:00"], "value": [1.0]}))
+
+        assert to_utc_timestrings(frame) is None
+
 
 class TestKiwattFormat:
     def setup_method(self):
@@ -56,6 +104,7 @@ class TestKiwattFormat:
         self.mock_datetime = self.patcher.start()
         self.mock_datetime.now.return_value = dt.datetime(2026, 1, 1, 11, 15, 0, tzinfo=UTC)
         self.mock_datetime.fromisoformat = dt.datetime.fromisoformat
+        self.mock_datetime.combine = dt.datetime.combine
         self.mock_datetime.side_effect = lambda *args, **kw: dt.datetime(*args, **kw)
 
     def teardown_method(self):
@@ -115,3 +164,56 @@ class TestKiwattFormat:
 
         result = KiwattFormat(source="MySource").format(ts)
         assert result.source == "MySource"
+
+    def test_vectorized_format_matches_model_format(self):
+        start = dt.datetime(2026, 1, 1, 0, 0, tzinfo=UTC)
+        end = dt.datetime(2026, 1, 1, 3, 0, tzinfo=UTC)
+        ts = _make_timeseries(start, end)
+
+        expected = KiwattFormat().format(ts)
+        result = KiwattFormat(vectorized=True).format(ts)
+
+        assert isinstance(result, Response)
+        assert result.media_type == "application/json"
+        assert json.loads(bytes(result.body)) == expected.model_dump(mode="json")
+
+    def test_vectorized_format_emits_null_for_nan(self):
+        start = dt.datetime(2026, 1, 1, 0, 0, tzinfo=UTC)
+        ts = _make_timeseries(start, start + timedelta(hours=2))
+        ts.frame = nw.from_native(
+            pd.DataFrame({"timestamp": [start, start + timedelta(hours=1)], "value": [1.0, None]})
+        )
+
+        result = KiwattFormat(vectorized=True).format(ts)
+
+        assert [p["value"] for p in json.loads(bytes(result.body))["prices"]] == [1.0, None]
+
+    def test_vectorized_format_matches_model_format_for_naive_timestamps(self, new_york_local_time):
+        start = dt.datetime(2026, 1, 1, 0, 0)
+        ts = _make_timeseries(start, start + timedelta(hours=2))
+
+        expected = KiwattFormat().format(ts)
+        result = KiwattFormat(vectorized=True).format(ts)
+
+        # naive timestamps are local time on both paths
+        assert [p.startUTC for p in expected.prices] == [
+            to_utc_timestring(start + timedelta(hours=h)) for h in range(2)
+        ]
+        assert expected.prices[0].startUTC == "2026-01-01T05:00:00+00:00"
+        assert result == expected
+
+    def test_vectorized_format_falls_back_for_string_timestamps(self):
+        ts = Timeseries(
+            frame=pd.DataFrame({"timestamp": ["2026-01-01T01:00:00+01:00"], "value": [1.0]}),
+            metadata={
+                "start": "2026-01-01T00:00:00+00:00",
+                "end": "2026-01-01T01:00:00+00:00",
+                "unit": "EUR/MWh",
+                "resolution": timedelta(hours=1),
+            },
+        )
+
+        result = KiwattFormat(vectorized=True).format(ts)
+
+        assert isinstance(result, ResponseModel)
+        assert result.prices[0].startUTC == "2026-01-01T00:00:00+00:00"
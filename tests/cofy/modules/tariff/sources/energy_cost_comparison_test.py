@@ -0,0 +1,144 @@
+import datetime as dt
+import threading
+
+import pytest
+from energy_cost import CostGroup, Supplier, Tariff
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from isodate import Duration
+
+from cofy.modules.tariff import EnergyCostComparisonTariffSource, TariffComparisonModule
+
+
+def _constant_tariff(consumption: float, injection: float) -> Tariff:
+    return Tariff.model_validate(
+        [
+            {
+                "start": "2024-01-01T00:00:00+00:00",
+                "consumption": {"constant_cost": consumption},
+                "injection": {"constant_cost": injection},
+            }
+        ]
+    )
+
+
+_SUPPLIER_KEY = "comparison_supplier"
+Supplier.register(
+    _SUPPLIER_KEY,
+    Supplier(products={"cheap": _constant_tariff(50.0, -5.0), "expensive": _constant_tariff(150.0, -15.0)}),
+)
+
+START = dt.datetime(2026, 1, 1, tzinfo=dt.UTC)
+END = dt.datetime(2026, 1, 1, 3, tzinfo=dt.UTC)
+
+
+def test_requires_at_least_one_tariff():
+    with pytest.raises(ValueError, match="At least one tariff"):
+        EnergyCostComparisonTariffSource({})
+
+
+def test_from_supplier_uses_all_products():
+    source = EnergyCostComparisonTariffSource.from_supplier(_SUPPLIER_KEY)
+    assert list(source.tariffs) == ["cheap", "expensive"]
+
+
+def test_from_supplier_restricts_to_product_keys():
+    source = EnergyCostComparisonTariffSource.from_supplier(_SUPPLIER_KEY, product_keys=["expensive"])
+    assert list(source.tariffs) == ["expensive"]
+
+
+def test_from_supplier_raises_for_unknown_product():
+    with pytest.raises(ValueError, match="has no products: unknown"):
+        EnergyCostComparisonTariffSource.from_supplier(_SUPPLIER_KEY, product_keys=["cheap", "unknown"])
+
+
+@pytest.mark.asyncio
+async def test_fetch_timeseries_returns_wide_frame():
+    source = EnergyCostComparisonTariffSource.from_supplier(_SUPPLIER_KEY)
+    result = await source.fetch_timeseries(START, END, dt.timedelta(hours=1), cost_group=CostGroup.CONSUMPTION)
+
+    assert result.metadata["unit"] == "EUR/MWh"
+    assert result.frame.columns == ["timestamp", "cheap", "expensive"]
+    rows = result.to_arr()
+    assert [row["timestamp"] for row in rows] == [START + dt.timedelta(hours=i) for i in range(3)]
+    assert all(row["cheap"] == 50.0 and row["expensive"] == 150.0 for row in rows)
+
+
+@pytest.mark.asyncio
+async def test_fetch_timeseries_uses_default_cost_group():
+    source = EnergyCostComparisonTariffSource.from_supplier(_SUPPLIER_KEY, cost_group=CostGroup.INJECTION)
+    result = await source.fetch_timeseries(START, END, dt.timedelta(hours=1))
+
+    assert [row["expensive"] for row in result.to_arr()] == [-15.0, -15.0, -15.0]
+
+
+@pytest.mark.asyncio
+async def test_fetch_timeseries_raises_for_duration():
+    source = EnergyCostComparisonTariffSource.from_supplier(_SUPPLIER_KEY)
+    with pytest.raises(ValueError, match="Resolution only support time components"):
+        await source.fetch_timeseries(START, END, Duration(months=1), cost_group=CostGroup.CONSUMPTION)
+
+
+@pytest.mark.asyncio
+async def test_fetch_timeseries_raises_for_missing_cost_group():
+    source = EnergyCostComparisonTariffSource.from_supplier(_SUPPLIER_KEY)
+    with pytest.raises(ValueError, match="Cost group must be provided."):
+        await source.fetch_timeseries(START, END, dt.timedelta(hours=1))
+
+
+@pytest.mark.asyncio
+async def test_fetch_timeseries_raises_when_no_tariff_has_data():
+    source = EnergyCostComparisonTariffSource({"empty": Tariff(root=[])}, cost_group=CostGroup.CONSUMPTION)
+    with pytest.raises(ValueError, match="No tariff data available"):
+        await source.fetch_timeseries(START, END, dt.timedelta(hours=1))
+
+
+def test_extra_args_only_expose_cost_group_when_not_fixed():
+    assert "cost_group" in EnergyCostComparisonTariffSource.from_supplier(_SUPPLIER_KEY).extra_args
+    fixed = EnergyCostComparisonTariffSource.from_supplier(_SUPPLIER_KEY, cost_group=CostGroup.CONSUMPTION)
+    assert fixed.extra_args == {}
+
+
+def test_comparison_module_api_endpoints():
+    module = TariffComparisonModule(source=EnergyCostComparisonTariffSource.from_supplier(_SUPPLIER_KEY), name="eb")
+    app = FastAPI()
+    app.include_router(module)
+    client = TestClient(app)
+    params = {"start": START.isoformat(), "end": END.isoformat(), "resolution": "PT1H"}
+
+    response = client.get(module.prefix, params=params)
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert len(data) == 3
+    assert data[0]["cheap"] == 50.0
+    assert data[0]["expensive"] == 150.0
+
+    response = client.get(module.prefix + ".csv", params=params)
+    assert response.status_code == 200
+    assert response.text.splitlines()[0] == "timestamp,cheap,expensive"
+
+
+class _BarrierTariff:
+    def __init__(self, barrier: threading.Barrier):
+        self.barrier = barrier
+
+    def get_values(self, **kwargs):
+        # only passes when every tariff is evaluated at the same time
+        self.barrier.wait()
+        return None
+
+
+@pytest.mark.asyncio
+async def test_fetch_timeseries_evaluates_tariffs_concurrently():
+    barrier = threading.Barrier(2, timeout=5)
+    source = EnergyCostComparisonTariffSource(
+        {"a": _BarrierTariff(barrier), "b": _BarrierTariff(barrier)}, cost_group=CostGroup.CONSUMPTION
+    )
+    with pytest.raises(ValueError, match="No tariff data available"):
+        await source.fetch_timeseries(START, END, dt.timedelta(hours=1))
+
+
+def test_record_model_is_built_once():
+    source = EnergyCostComparisonTariffSource.from_supplier(_SUPPLIER_KEY)
+    assert source.record_model is source.record_model
+    assert list(source.record_model.model_fields) == ["timestamp", "cheap", "expensive"]
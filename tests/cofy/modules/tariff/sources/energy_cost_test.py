@@ -1,12 +1,17 @@
 import datetime as dt
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from unittest.mock import MagicMock, patch
 
 import pandas as pd
 import pytest
 from energy_cost import CostGroup
+from energy_cost.index import CachedIndex, Index
 from isodate import Duration
 
-from cofy.modules.tariff.sources.energy_cost import EnergyCostTariffSource
+from cofy.modules.tariff.sources.energy_cost import EnergyCostTariffSource, guard_cached_indexes
+from cofy.modules.timeseries import RefreshSchedule
 
 
 @pytest.fixture
@@ -92,3 +97,73 @@ def test_extra_args(mock_tariff):
     src = EnergyCostTariffSource("some_yaml_config")
     args = src.extra_args
     assert "cost_group" in args
+
+
+@pytest.mark.asyncio
+async def test_prefetch_without_refresh_schedule_returns_none(mock_tariff):
+    src = EnergyCostTariffSource("some_yaml_config")
+    assert src.refresh_schedule is None
+    result = await src.prefetch(dt.datetime(2026, 1, 1, tzinfo=dt.UTC), dt.datetime(2026, 1, 2, tzinfo=dt.UTC))
+    assert result is None
+    mock_tariff.get_values.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_prefetch_with_refresh_schedule_computes_tariff(mock_tariff):
+    schedule = RefreshSchedule(dt.time(13), dt.UTC, dt.timedelta(minutes=15))
+    src = EnergyCostTariffSource("some_yaml_config", cost_group=CostGroup.CONSUMPTION, refresh_schedule=schedule)
+    start = dt.datetime(2026, 1, 1, tzinfo=dt.UTC)
+    mock_tariff.get_values.return_value = pd.DataFrame({"timestamp": [start], "total": [10.0]})
+
+    result = await src.prefetch(start, start + dt.timedelta(minutes=15))
+
+    assert src.refresh_schedule is schedule
+    assert result is not None
+    assert len(result.frame) == 1
+
+
+class _CountingIndex(Index):
+    def __init__(self, barrier: threading.Barrier | None = None):
+        super().__init__(resolution=dt.timedelta(hours=1))
+        self.barrier = barrier
+        self.calls = 0
+
+    def _get_values(self, start: pd.Timestamp, end: pd.Timestamp, timezone: dt.tzinfo) -> pd.DataFrame:
+        self.calls += 1
+        if self.barrier is None:
+            time.sleep(0.1)
+        else:
+            self.barrier.wait()
+        return pd.DataFrame({"timestamp": pd.date_range(start, end, freq="h", inclusive="left"), "value": 1.0})
+
+
+def _read_concurrently(*indexes: CachedIndex) -> list[pd.DataFrame]:
+    start = pd.Timestamp("2026-01-01", tz="UTC")
+    with ThreadPoolExecutor(len(indexes)) as pool:
+        return list(pool.map(lambda index: index._get_values(start, start + pd.Timedelta(hours=3), dt.UTC), indexes))
+
+
+def test_cached_index_is_fetched_once_under_its_lock(tmp_path):
+    guard_cached_indexes()
+    guard_cached_indexes()
+    source = _CountingIndex()
+    index = CachedIndex(source, file_name="shared", cache_dir=tmp_path)
+
+    frames = _read_concurrently(index, index)
+
+    assert source.calls == 1
+    assert [len(frame) for frame in frames] == [3, 3]
+
+
+def test_different_cached_indexes_are_fetched_in_parallel(tmp_path):
+    guard_cached_indexes()
+    # the barrier only passes when both indexes are fetched at the same time
+    barrier = threading.Barrier(2, timeout=5)
+    first, second = _CountingIndex(barrier), _CountingIndex(barrier)
+
+    _read_concurrently(
+        CachedIndex(first, file_name="first", cache_dir=tmp_path),
+        CachedIndex(second, file_name="second", cache_dir=tmp_path),
+    )
+
+    assert (first.calls, second.calls) == (1, 1)
@@ -106,3 +106,15 @@ async def test_returns_empty_when_no_data():
     result = await src.fetch_timeseries(start, end)
     assert isinstance(result, Timeseries)
     assert result.frame.is_empty
+
+
+def test_refresh_schedule_follows_day_ahead_publication():
+    schedule = EntsoeDayAheadTariffSource("key", "DE").refresh_schedule
+    assert schedule.publish_time == dt.time(13, 0)
+    assert str(schedule.timezone) == "Europe/Brussels"
+    assert schedule.resolution == dt.timedelta(minutes=15)
+    assert schedule.kwargs == {}
+
+
+def test_refresh_schedule_uses_default_country_code_when_not_set():
+    assert EntsoeDayAheadTariffSource("key").refresh_schedule.kwargs == {"country_code": "BE"}
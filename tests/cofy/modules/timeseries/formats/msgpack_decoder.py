@@ -0,0 +1,38 @@
+import struct
+
+FIXED = {0xCA: ">f", 0xCB: ">d", 0xCE: ">I", 0xD1: ">h", 0xD3: ">q"}
+
+
+def unpack(data: bytes):
+    """Decode the subset of MessagePack written by MessagePackFormat."""
+    value, offset = _unpack(data, 0)
+    assert offset == len(data)
+    return value
+
+
+def _unpack(data: bytes, offset: int):
+    tag = data[offset]
+    offset += 1
+    if tag <= 0x7F or tag >= 0xE0:
+        return struct.unpack_from(">b", data, offset - 1)[0], offset
+    if tag in FIXED:
+        code = FIXED[tag]
+        return struct.unpack_from(code, data, offset)[0], offset + struct.calcsize(code)
+    if tag & 0xE0 == 0xA0 or tag == 0xDB:
+        size, offset = (tag & 0x1F, offset) if tag != 0xDB else (struct.unpack_from(">I", data, offset)[0], offset + 4)
+        return data[offset : offset + size].decode(), offset + size
+    if tag & 0xF0 == 0x90 or tag == 0xDD:
+        size, offset = (tag & 0x0F, offset) if tag != 0xDD else (struct.unpack_from(">I", data, offset)[0], offset + 4)
+        items = []
+        for _ in range(size):
+            item, offset = _unpack(data, offset)
+            items.append(item)
+        return items, offset
+    if tag & 0xF0 == 0x80 or tag == 0xDF:
+        size, offset = (tag & 0x0F, offset) if tag != 0xDF else (struct.unpack_from(">I", data, offset)[0], offset + 4)
+        result = {}
+        for _ in range(size):
+            key, offset = _unpack(data, offset)
+            result[key], offset = _unpack(data, offset)
+        return result, offset
+    raise ValueError(f"Unexpected tag {tag:#x}")
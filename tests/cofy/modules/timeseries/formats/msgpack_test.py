@@ -0,0 +1,133 @@
+import datetime as dt
+import math
+
+import narwhals as nw
+import pandas as pd
+import polars as pl
+import pytest
+from fastapi.responses import Response
+
+from cofy.modules.timeseries import MessagePackFormat, Timeseries
+
+from .msgpack_decoder import unpack
+
+START = dt.datetime(2026, 1, 1, tzinfo=dt.UTC)
+EPOCH = int(START.timestamp())
+
+
+def frame(backend, **columns):
+    rows = len(next(iter(columns.values())))
+    timestamps = [START + dt.timedelta(hours=i) for i in range(rows)]
+    return nw.from_native(backend({"timestamp": timestamps, **columns}))
+
+
+def test_return_type():
+    format = MessagePackFormat()
+    assert format.ReturnType == Response
+
+
+@pytest.mark.parametrize("backend", [pl.DataFrame, pd.DataFrame])
+def test_encode_numeric_values(backend):
+    result = unpack(MessagePackFormat().encode(frame(backend, value=[1.5, None, 3.0])))
+
+    assert result["timestamp"] == [EPOCH, EPOCH + 3600, EPOCH + 7200]
+    assert result["value"][0] == 1.5
+    assert math.isnan(result["value"][1])
+    assert result["value"][2] == 3.0
+
+
+@pytest.mark.parametrize("backend", [pl.DataFrame, pd.DataFrame])
+def test_encode_string_values_as_enum(backend):
+    result = unpack(MessagePackFormat().encode(frame(backend, value=["high", None, "low", "high"])))
+
+    assert result["value"] == {"labels": ["high", "low"], "codes": [0, -1, 1, 0]}
+
+
+def test_encode_is_compact():
+    encoded = MessagePackFormat().encode(frame(pl.DataFrame, value=["low"] * 96))
+    # one tag and four bytes per timestamp, a single byte per code
+    assert len(encoded) < 96 * 6 + 64
+
+
+def test_single_precision():
+    encoded = MessagePackFormat(single_precision=True).encode(frame(pl.DataFrame, value=[0.5, 0.25]))
+    assert b"\xca" in encoded
+    assert unpack(encoded)["value"] == [0.5, 0.25]
+
+
+def test_encode_wide_values():
+    labels = [f"label_{i:03}_with_a_long_enough_name" for i in range(200)]
+    columns = {f"column_{i}": [float(i)] * 200 for i in range(15)}
+    encoded = MessagePackFormat().encode(frame(pl.DataFrame, value=labels, **columns))
+    result = unpack(encoded)
+
+    assert len(result) == 17
+    assert result["value"]["labels"] == labels
+    assert result["value"]["codes"] == list(range(200))
+    assert result["column_14"] == [14.0] * 200
+
+
+# byte vectors written out by hand from the format specification: https://github.com/msgpack/msgpack/blob/master/spec.md
+TIMESTAMP_KEY = "a9 74696d657374616d70"  # fixstr "timestamp"
+VALUE_KEY = "a5 76616c7565"  # fixstr "value"
+
+
+@pytest.mark.parametrize(
+    ("columns", "single_precision", "expected"),
+    [
+        (
+            {"timestamp": [START, START + dt.timedelta(hours=1)], "value": [1.5, None]},
+            False,
+            # fixmap of 2, fixarray of 2 uint32 seconds, fixarray of 2 float64 with NaN for the missing value
+            f"82 {TIMESTAMP_KEY} 92 ce6955b900 ce6955c710 {VALUE_KEY} 92 cb3ff8000000000000 cb7ff8000000000000",
+        ),
+        (
+            {"timestamp": [START], "value": [0.5]},
+            True,
+            # a single float32
+            f"82 {TIMESTAMP_KEY} 91 ce6955b900 {VALUE_KEY} 91 ca3f000000",
+        ),
+        (
+            {"timestamp": [START, START], "value": ["high", None]},
+            False,
+            # a fixmap with the fixstr labels and the codes as positive and negative fixints
+            f"82 {TIMESTAMP_KEY} 92 ce6955b900 ce6955b900 {VALUE_KEY} "
+            "82 a6 6c6162656c73 91 a4 68696768 a5 636f646573 92 00 ff",
+        ),
+        (
+            {"timestamp": [dt.datetime(1960, 1, 1, tzinfo=dt.UTC)], "value": [1.0]},
+            False,
+            # timestamps before the epoch are int64
+            f"82 {TIMESTAMP_KEY} 91 d3ffffffffed300880 {VALUE_KEY} 91 cb3ff0000000000000",
+        ),
+    ],
+)
+def test_encode_matches_spec_byte_vectors(columns, single_precision, expected):
+    encoded = MessagePackFormat(single_precision=single_precision).encode(nw.from_native(pl.DataFrame(columns)))
+    assert encoded == bytes.fromhex(expected)
+
+
+def test_encode_wide_values_use_32_bit_headers():
+    labels = [f"label_{i:03}_with_a_long_enough_name" for i in range(200)]
+    columns = {f"column_{i}": [float(i)] * 200 for i in range(15)}
+    encoded = MessagePackFormat().encode(frame(pl.DataFrame, value=labels, **columns))
+
+    # map32 of 17 columns, array32 of 200 timestamps
+    assert encoded.startswith(bytes.fromhex(f"df00000011 {TIMESTAMP_KEY} dd000000c8 ce6955b900"))
+    # str32 labels of 33 bytes, and codes as int16 once there are more labels than positive fixints
+    assert bytes.fromhex("db00000021") + labels[0].encode() in encoded
+    assert bytes.fromhex("a5 636f646573 dd000000c8 d10000 d10001") in encoded
+
+
+def test_encode_timestamps_before_epoch():
+    before = nw.from_native(pl.DataFrame({"timestamp": [dt.datetime(1960, 1, 1, tzinfo=dt.UTC)], "value": [1.0]}))
+    assert unpack(MessagePackFormat().encode(before))["timestamp"] == [-315619200]
+
+
+def test_format_sets_metadata_header():
+    timeseries = Timeseries(frame=frame(pl.DataFrame, value=[1.0]), metadata={"unit": "kWh"})
+    response = MessagePackFormat().format(timeseries)
+
+    assert response.media_type == "application/msgpack"
+    assert '"unit":"kWh"' in response.headers["x-metadata"]
+    assert unpack(response.body) == {"timestamp": [EPOCH], "value": [1.0]}
@@ -6,8 +6,18 @@ from fastapi import FastAPI, Query
 from fastapi.testclient import TestClient
 from pydantic import BaseModel
 
-from cofy.modules.timeseries import CSVFormat, DefaultDataType, JSONFormat, TimeseriesModule
+from cofy import CofyAPI
+from cofy.modules.timeseries import (
+    CSVFormat,
+    DefaultDataType,
+    JSONFormat,
+    MessagePackFormat,
+    PrefetchScheduler,
+    RefreshSchedule,
+    TimeseriesModule,
+)
 from tests.cofy.modules.timeseries.dummy_source import DummyTimeseriesSource
+from tests.cofy.modules.timeseries.formats.msgpack_decoder import unpack
 
 
 @pytest.mark.parametrize(
@@ -30,6 +40,7 @@ def test_formats_default():
     module = TimeseriesModule(source=DummyTimeseriesSource())
     assert any(isinstance(fmt, JSONFormat) for fmt in module.formats)
     assert any(isinstance(fmt, CSVFormat) for fmt in module.formats)
+    assert any(isinstance(fmt, MessagePackFormat) for fmt in module.formats)
 
 
 def test_source_must_be_provided():
@@ -247,6 +258,21 @@ class TestTimeseriesModule:
         assert lines[0] == "timestamp,value"
         assert len(lines) == 4
 
+    def test_msgpack_format(self):
+        response = self.client.get(
+            f"{self.module.prefix}.msgpack",
+            params={
+                "start": self.start.isoformat(),
+                "end": self.end.isoformat(),
+            },
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/msgpack"
+        result = unpack(response.content)
+        epoch = int(self.start.timestamp())
+        assert result["timestamp"] == [epoch, epoch + 3600, epoch + 7200]
+        assert len(result["value"]) == 3
+
     def test_multiple_resolutions(self):
         response = self.client.get(
             self.module.prefix,
@@ -406,3 +432,55 @@ class TestTimeseriesModule:
         assert "data" in result
         data = result.get("data")
         assert len(data) == 10  # 3 hours before end date, but limit is 10, so we return 10 entries
+
+
+def test_lifespan_tasks_empty_without_refresh_schedule():
+    assert TimeseriesModule(source=DummyTimeseriesSource()).lifespan_tasks == {}
+
+
+def test_lifespan_tasks_prefetch_sources_with_refresh_schedule():
+    schedule = RefreshSchedule(dt.time(13), dt.UTC, dt.timedelta(hours=1))
+
+    class ScheduledSource(DummyTimeseriesSource):
+        @property
+        def refresh_schedule(self):
+            return schedule
+
+        async def prefetch(self, start, end, resolution, **kwargs):
+            return None
+
+    source = ScheduledSource()
+    tasks = TimeseriesModule(source=source).lifespan_tasks
+
+    assert list(tasks) == [(source, schedule)]
+    assert isinstance(tasks[source, schedule].__self__, PrefetchScheduler)
+
+    # sources sharing a schedule are each prefetched, the same source wrapped twice only once
+    other = ScheduledSource()
+    cofy = CofyAPI()
+    for name, wrapped in [("a", source), ("b", source), ("c", other)]:
+        cofy.register_module(TimeseriesModule(source=wrapped, name=name))
+    assert list(cofy.lifespan_tasks) == [(source, schedule), (other, schedule)]
+
+
+def test_lifespan_tasks_skip_sources_without_prefetch():
+    class ScheduledSource(DummyTimeseriesSource):
+        @property
+        def refresh_schedule(self):
+            return RefreshSchedule(dt.time(13), dt.UTC, dt.timedelta(hours=1))
+
+    assert TimeseriesModule(source=ScheduledSource()).lifespan_tasks == {}
+
+
+def test_lifespan_tasks_include_source_tasks():
+    class SyncingSource(DummyTimeseriesSource):
+        @property
+        def lifespan_tasks(self):
+            return {"sync": self.sync}
+
+        async def sync(self):
+            pass
+
+    source = SyncingSource()
+
+    assert TimeseriesModule(source=source).lifespan_tasks == {"sync": source.sync}
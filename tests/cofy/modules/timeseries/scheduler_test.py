@@ -0,0 +1,118 @@
+import asyncio
+import contextlib
+import datetime as dt
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+import pytest
+
+from cofy.modules.timeseries import PrefetchScheduler, RefreshSchedule, Timeseries, TimeseriesSource
+
+BRUSSELS = ZoneInfo("Europe/Brussels")
+QUARTER = dt.timedelta(minutes=15)
+SCHEDULE = RefreshSchedule(
+    publish_time=dt.time(13, 0),
+    timezone=BRUSSELS,
+    resolution=QUARTER,
+    poll_interval=dt.timedelta(minutes=5),
+    kwargs={"country_code": "BE"},
+)
+
+
+class PrefetchSource(TimeseriesSource):
+    """Prefetch returns quarter-hourly data from start until available_until."""
+
+    def __init__(self, available_until: dt.datetime | None = None, fail: bool = False):
+        self.available_until = available_until
+        self.fail = fail
+        self.calls: list[tuple[dt.datetime, dt.datetime, dict]] = []
+
+    async def fetch_timeseries(self, start, end, resolution, **kwargs):
+        raise NotImplementedError
+
+    async def prefetch(self, start, end, resolution, **kwargs):
+        self.calls.append((start, end, kwargs))
+        if self.fail:
+            raise ValueError("upstream down")
+        until = min(end, self.available_until or end)
+        timestamps = list(pd.date_range(start, until, freq="15min", inclusive="left"))
+        return Timeseries(frame=pd.DataFrame({"timestamp": timestamps, "value": [1.0] * len(timestamps)}))
+
+
+def _at(hour: int, minute: int = 0, day: int = 10) -> dt.datetime:
+    return dt.datetime(2026, 3, day, hour, minute, tzinfo=BRUSSELS)
+
+
+class TestRefreshSchedule:
+    def test_window_before_publication_is_today(self):
+        assert SCHEDULE.window(_at(9)) == (_at(0), _at(0, day=11))
+
+    def test_window_after_publication_includes_tomorrow(self):
+        assert SCHEDULE.window(_at(14)) == (_at(0), _at(0, day=12))
+
+    def test_window_uses_local_days(self):
+        now = dt.datetime(2026, 3, 9, 23, 30, tzinfo=dt.UTC)  # 00:30 in Brussels
+        assert SCHEDULE.window(now) == (_at(0), _at(0, day=11))
+
+    def test_next_publication(self):
+        assert SCHEDULE.next_publication(_at(9)) == _at(13)
+        assert SCHEDULE.next_publication(_at(13)) == _at(13, day=11)
+
+    def test_kwargs_default_to_empty(self):
+        assert RefreshSchedule(dt.time(13), BRUSSELS, QUARTER).kwargs == {}
+
+
+class TestPrefetchScheduler:
+    @pytest.mark.asyncio
+    async def test_before_publication_warms_today_and_sleeps_until_publication(self):
+        source = PrefetchSource()
+        scheduler = PrefetchScheduler(source, SCHEDULE, now=lambda: _at(9))
+
+        delay = await scheduler.tick()
+
+        assert source.calls == [(_at(0), _at(0, day=11), {"country_code": "BE"})]
+        assert delay == dt.timedelta(hours=4)
+
+    @pytest.mark.asyncio
+    async def test_polls_until_next_day_appears(self):
+        source = PrefetchSource(available_until=_at(0, day=11))
+        scheduler = PrefetchScheduler(source, SCHEDULE, now=lambda: _at(13, 5))
+
+        assert await scheduler.tick() == dt.timedelta(minutes=5)
+
+        source.available_until = None
+        assert await scheduler.tick() == _at(13, day=11) - _at(13, 5)
+
+    @pytest.mark.asyncio
+    async def test_empty_prefetch_is_incomplete(self):
+        source = PrefetchSource(available_until=_at(0) - QUARTER)
+        scheduler = PrefetchScheduler(source, SCHEDULE, now=lambda: _at(14))
+
+        assert await scheduler.tick() == dt.timedelta(minutes=5)
+
+    @pytest.mark.asyncio
+    async def test_failures_are_retried_after_poll_interval(self):
+        scheduler = PrefetchScheduler(PrefetchSource(fail=True), SCHEDULE, now=lambda: _at(9))
+
+        assert await scheduler.tick() == dt.timedelta(minutes=5)
+
+    @pytest.mark.asyncio
+    async def test_run_stops_when_source_has_nothing_to_prefetch(self):
+        class UncachedSource(TimeseriesSource):
+            async def fetch_timeseries(self, start, end, resolution, **kwargs):
+                raise NotImplementedError
+
+        await asyncio.wait_for(PrefetchScheduler(UncachedSource(), SCHEDULE).run(), timeout=1)
+
+    @pytest.mark.asyncio
+    async def test_run_sleeps_between_ticks(self):
+        source = PrefetchSource()
+        scheduler = PrefetchScheduler(source, SCHEDULE, now=lambda: _at(13) - dt.timedelta(milliseconds=10))
+
+        task = asyncio.create_task(scheduler.run())
+        await asyncio.sleep(0.1)
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+
+        assert len(source.calls) >= 2
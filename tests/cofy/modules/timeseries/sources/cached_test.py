@@ -0,0 +1,194 @@
+import datetime as dt
+
+import pandas as pd
+import pytest
+from isodate import Duration
+
+from cofy.modules.timeseries import CachedTimeseriesSource, RefreshSchedule, Timeseries
+from tests.cofy.modules.timeseries.dummy_source import DummyTimeseriesSource
+
+DAY = dt.datetime(2026, 1, 1, tzinfo=dt.UTC)
+HOUR = dt.timedelta(hours=1)
+
+
+class CountingSource(DummyTimeseriesSource):
+    """Emits value = hours since DAY and records every upstream call."""
+
+    def __init__(self):
+        self.calls: list[tuple[dt.datetime, dt.datetime]] = []
+
+    async def fetch_timeseries(self, start, end, resolution=HOUR, **kwargs):
+        self.calls.append((start, end))
+        data = []
+        t = start
+        while t < end:
+            data.append({"timestamp": t, "value": (t - DAY) / HOUR})
+            t += resolution
+        return Timeseries(frame=pd.DataFrame(data), metadata={"unit": "kWh", **kwargs})
+
+
+@pytest.mark.asyncio
+async def test_slices_requested_window_from_day_blocks():
+    upstream = CountingSource()
+    source = CachedTimeseriesSource(upstream)
+
+    result = await source.fetch_timeseries(DAY + 2 * HOUR, DAY + 5 * HOUR, HOUR)
+
+    assert [row["value"] for row in result.to_arr()] == [2.0, 3.0, 4.0]
+    assert result.metadata["unit"] == "kWh"
+    assert upstream.calls == [(DAY, DAY + dt.timedelta(days=1))]
+
+
+@pytest.mark.asyncio
+async def test_intraday_requests_hit_the_cache():
+    upstream = CountingSource()
+    source = CachedTimeseriesSource(upstream)
+
+    await source.fetch_timeseries(DAY, DAY + HOUR, HOUR)
+    result = await source.fetch_timeseries(DAY + 10 * HOUR, DAY + 12 * HOUR, HOUR)
+
+    assert [row["value"] for row in result.to_arr()] == [10.0, 11.0]
+    assert len(upstream.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_only_missing_blocks_are_fetched_in_one_call():
+    upstream = CountingSource()
+    source = CachedTimeseriesSource(upstream)
+
+    await source.fetch_timeseries(DAY, DAY + HOUR, HOUR)
+    result = await source.fetch_timeseries(DAY + 23 * HOUR, DAY + dt.timedelta(days=3), HOUR)
+
+    assert len(result.frame) == 49
+    assert upstream.calls[1] == (DAY + dt.timedelta(days=1), DAY + dt.timedelta(days=3))
+
+
+@pytest.mark.asyncio
+async def test_expired_blocks_are_refetched():
+    upstream = CountingSource()
+    source = CachedTimeseriesSource(upstream, ttl=dt.timedelta(0))
+
+    await source.fetch_timeseries(DAY, DAY + HOUR, HOUR)
+    await source.fetch_timeseries(DAY, DAY + HOUR, HOUR)
+
+    assert len(upstream.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_kwargs_and_resolution_are_part_of_the_key():
+    upstream = CountingSource()
+    source = CachedTimeseriesSource(upstream)
+
+    await source.fetch_timeseries(DAY, DAY + HOUR, HOUR, country_code="BE")
+    await source.fetch_timeseries(DAY, DAY + HOUR, HOUR, country_code="NL")
+    await source.fetch_timeseries(DAY, DAY + HOUR, dt.timedelta(minutes=15), country_code="BE")
+    result = await source.fetch_timeseries(DAY, DAY + HOUR, HOUR, country_code="NL")
+
+    assert result.metadata["country_code"] == "NL"
+    assert len(upstream.calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_blocks_are_evicted():
+    upstream = CountingSource()
+    source = CachedTimeseriesSource(upstream, max_blocks=2)
+
+    await source.fetch_timeseries(DAY, DAY + dt.timedelta(days=2), HOUR)
+    await source.fetch_timeseries(DAY + dt.timedelta(days=2), DAY + dt.timedelta(days=3), HOUR)
+    await source.fetch_timeseries(DAY, DAY + HOUR, HOUR)
+
+    assert len(upstream.calls) == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("resolution", [Duration(months=1), dt.timedelta(hours=7)])
+async def test_resolutions_not_dividing_the_block_bypass_the_cache(resolution):
+    upstream = CountingSource()
+    source = CachedTimeseriesSource(upstream)
+
+    await source.fetch_timeseries(DAY, DAY + dt.timedelta(hours=14), resolution)
+    await source.fetch_timeseries(DAY, DAY + dt.timedelta(hours=14), resolution)
+
+    assert upstream.calls == [(DAY, DAY + dt.timedelta(hours=14))] * 2
+    assert await source.prefetch(DAY, DAY + dt.timedelta(hours=14), resolution) is None
+
+
+@pytest.mark.asyncio
+async def test_unhashable_kwargs_bypass_the_cache():
+    upstream = CountingSource()
+    source = CachedTimeseriesSource(upstream)
+
+    await source.fetch_timeseries(DAY, DAY + HOUR, HOUR, ids=["a"])
+
+    assert upstream.calls == [(DAY, DAY + HOUR)]
+
+
+@pytest.mark.asyncio
+async def test_prefetch_refreshes_cached_blocks():
+    upstream = CountingSource()
+    source = CachedTimeseriesSource(upstream)
+
+    await source.fetch_timeseries(DAY, DAY + HOUR, HOUR)
+    result = await source.prefetch(DAY, DAY + 2 * HOUR, HOUR)
+    await source.fetch_timeseries(DAY, DAY + HOUR, HOUR)
+
+    assert result is not None
+    assert len(result.frame) == 2
+    assert len(upstream.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_clear_drops_all_blocks():
+    upstream = CountingSource()
+    source = CachedTimeseriesSource(upstream)
+
+    await source.fetch_timeseries(DAY, DAY + HOUR, HOUR)
+    source.clear()
+    await source.fetch_timeseries(DAY, DAY + HOUR, HOUR)
+
+    assert len(upstream.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_empty_blocks_are_returned_as_empty_frame():
+    class EmptySource(CountingSource):
+        async def fetch_timeseries(self, start, end, resolution=HOUR, **kwargs):
+            self.calls.append((start, end))
+            return Timeseries(frame=pd.DataFrame({"timestamp": [], "value": []}), metadata={})
+
+    source = CachedTimeseriesSource(EmptySource())
+    result = await source.fetch_timeseries(DAY, DAY + dt.timedelta(days=2), HOUR)
+
+    assert len(result.frame) == 0
+
+
+def test_properties_are_forwarded():
+    class ScheduledSource(CountingSource):
+        schedule = RefreshSchedule(dt.time(13), dt.UTC, HOUR)
+
+        @property
+        def refresh_schedule(self):
+            return self.schedule
+
+        @property
+        def lifespan_tasks(self):
+            return {"sync": self.sync}
+
+        async def sync(self):
+            pass
+
+        @property
+        def supported_resolutions(self):
+            return ["PT1H"]
+
+        @property
+        def extra_args(self):
+            return {"country_code": str}
+
+    upstream = ScheduledSource()
+    source = CachedTimeseriesSource(upstream)
+
+    assert source.refresh_schedule is upstream.schedule
+    assert source.lifespan_tasks == {"sync": upstream.sync}
+    assert source.supported_resolutions == ["PT1H"]
+    assert source.extra_args == {"country_code": str}